@@ -0,0 +1,155 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from storage.publication_store import get_publication_store
+
+DATE_FORMAT = "%d/%m/%Y"
+MAX_JOB_WORKERS = 2
+JOB_RESULT_TTL = 600  # segundos que um resultado concluído continua reaproveitável
+
+
+class ScrapeJob:
+    """Estado de uma coleta ao vivo disparada pela API."""
+
+    def __init__(self, key, site):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.site = site
+        self.status = "queued"
+        self.pages_done = 0
+        self.items_collected = 0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.published = []  # publicações das páginas já coletadas, na ordem (acompanhadas por `follow`)
+        self._changed = threading.Condition()
+
+    def add_page(self, publications):
+        with self._changed:
+            self.published.extend(publications)
+            self._changed.notify_all()
+
+    def wake_followers(self):
+        """Chamado quando o job termina (com ou sem erro), para `follow` encerrar."""
+        with self._changed:
+            self._changed.notify_all()
+
+    def follow(self):
+        """
+        Gera as publicações do job desde a primeira página, acompanhando as
+        novas à medida que são coletadas, até o job terminar. Vários clientes
+        podem acompanhar o mesmo job sem disparar outra coleta.
+        """
+        sent = 0
+        while True:
+            with self._changed:
+                while sent == len(self.published) and self.finished_at is None:
+                    self._changed.wait()
+                batch = self.published[sent:]
+                finished = self.finished_at is not None
+            sent += len(batch)
+            yield from batch
+            if finished:
+                return
+
+    def is_expired(self, now, ttl):
+        return self.finished_at is not None and now - self.finished_at > ttl
+
+    def to_dict(self, include_result=True):
+        data = {
+            "job_id": self.id,
+            "site": self.site,
+            "status": self.status,
+            "pages_done": self.pages_done,
+            "items_collected": self.items_collected,
+            "error": self.error,
+        }
+        if include_result and self.status == "done":
+            data["results"] = self.result
+        return data
+
+
+class JobManager:
+    """
+    Executa coletas em um pool limitado de threads.
+
+    Pedidos idênticos (site, data, since, filtro, seek) enquanto uma coleta
+    está em andamento se anexam ao mesmo job (singleflight), e resultados
+    concluídos são reaproveitados por `ttl` segundos.
+    """
+
+    def __init__(self, max_workers=MAX_JOB_WORKERS, ttl=JOB_RESULT_TTL):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape-job")
+        self._jobs = {}
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    def submit(self, site, scraper_func, cutoff_date, since=None, filter_text=None, seek=False):
+        """Retorna (job, criado_agora). Reaproveita o job em andamento/recente com a mesma chave."""
+        key = (
+            site,
+            cutoff_date.strftime(DATE_FORMAT),
+            since.strftime(DATE_FORMAT) if since else None,
+            filter_text or None,
+            bool(seek),
+        )
+
+        with self._lock:
+            self._purge_expired()
+            existing = self._by_key.get(key)
+            if existing and existing.status != "failed":
+                return existing, False
+
+            job = ScrapeJob(key, site)
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+
+        self._executor.submit(self._run, job, scraper_func, cutoff_date, since, filter_text, seek)
+        return job, True
+
+    def get(self, job_id):
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def _run(self, job, scraper_func, cutoff_date, since, filter_text, seek):
+        store = get_publication_store()
+
+        def on_page(publications):
+            store.upsert_many(job.site, publications)
+            with self._lock:
+                job.pages_done += 1
+                job.items_collected += len(publications)
+            job.add_page(publications)
+
+        job.status = "running"
+        try:
+            result = scraper_func(cutoff_date, filter_text=filter_text, seek=seek, since=since, on_page=on_page)
+        except Exception as e:
+            with self._lock:
+                job.status = "failed"
+                job.error = str(e)
+                job.finished_at = time.time()
+            job.wake_followers()
+            return
+
+        with self._lock:
+            job.result = result
+            job.status = "done"
+            job.finished_at = time.time()
+        job.wake_followers()
+
+    def _purge_expired(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.is_expired(now, self.ttl):
+                del self._jobs[job_id]
+                if self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+
+
+job_manager = JobManager()
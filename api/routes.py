@@ -1,20 +1,24 @@
-from flask import Blueprint, request, jsonify, make_response
+from flask import Blueprint, Response, request, jsonify, make_response, url_for, stream_with_context
 from datetime import datetime
-import csv
-from io import StringIO
-from scraper.sites.diariodocomercio.diariodocomercio_integration import scrape_diariodocomercio
-from scraper.sites.diariocomercial.diariocomercial_integration import scrape_diariocomercial
-from scraper.sites.agorarn.agorarn_integration import scrape_agorarn
+import itertools
+import time
+from scraper.registry import SITES, get_scraper
+from scraper.writers import csv_chunks, ndjson_chunks
+from scraper.metrics import REGISTRY, CONTENT_TYPE
+from storage.publication_store import get_publication_store, DEFAULT_PAGE_SIZE
+from .jobs import job_manager
 
 api_blueprint = Blueprint("api", __name__)
 
 DATE_FORMAT = "%d/%m/%Y"
 DEFAULT_OUTPUT_FORMAT = "json"
+MAX_PAGE_SIZE = 1000
+OUTPUT_FORMATS = ["json", "csv", "ndjson"]
+STREAM_CHUNK_SIZE = 16 * 1024
 
-SCRAPER_MAP = {
-    "diariodocomercio": scrape_diariodocomercio,
-    "diariocomercial": scrape_diariocomercial,
-    "agorarn": scrape_agorarn,
+STREAM_MIMETYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
 }
 
 @api_blueprint.route("/", methods=["GET"])
@@ -22,16 +26,64 @@ def index():
     return jsonify({
         "message": "API de Scrapers Online",
         "endpoints": {
-            "run": "/<site>?date=dd/mm/yyyy&format={json|csv}",
-            "sites_disponiveis": list(SCRAPER_MAP.keys())
+            "run": "/<site>?date=dd/mm/yyyy&since=dd/mm/yyyy&q=texto&limit=100&cursor=...&format={json|csv|ndjson}&refresh={0|1}&seek={0|1}",
+            "stream": "/<site>?date=dd/mm/yyyy&format={csv|ndjson}&live={0|1}",
+            "jobs": "POST /jobs {site, date, since, filter, seek} -> GET /jobs/<id>",
+            "search": "/search?q=texto&site=agorarn&since=dd/mm/yyyy&until=dd/mm/yyyy&limit=100",
+            "metrics": "/metrics",
+            "sites_disponiveis": list(SITES)
         }
     })
 
+@api_blueprint.route("/metrics", methods=["GET"])
+def metrics():
+    """Métricas de fetch, parse e coleta no formato texto do Prometheus."""
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+@api_blueprint.route("/search", methods=["GET"])
+def search():
+    """Busca no índice invertido das publicações já coletadas, da mais relevante para a menos relevante."""
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "Parâmetro 'q' é obrigatório"}), 400
+
+    site = (request.args.get("site") or "").lower() or None
+    if site and site not in SITES:
+        return jsonify({"error": f"Site '{site}' não reconhecido"}), 400
+
+    since_str = request.args.get("since")
+    until_str = request.args.get("until")
+    try:
+        since = datetime.strptime(since_str, DATE_FORMAT) if since_str else None
+        until = datetime.strptime(until_str, DATE_FORMAT) if until_str else None
+    except ValueError:
+        return jsonify({"error": "Formato inválido de data. Use dd/mm/yyyy"}), 400
+
+    limit_str = request.args.get("limit")
+    try:
+        limit = int(limit_str) if limit_str else DEFAULT_PAGE_SIZE
+    except ValueError:
+        return jsonify({"error": "Parâmetro 'limit' deve ser um número inteiro"}), 400
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        return jsonify({"error": f"Parâmetro 'limit' deve estar entre 1 e {MAX_PAGE_SIZE}"}), 400
+
+    start = time.perf_counter()
+    results = get_publication_store().search(q, site=site, since=since, until=until, limit=limit)
+    return jsonify({
+        "q": q,
+        "site": site,
+        "since": since_str,
+        "until": until_str,
+        "total": len(results),
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+        "results": results
+    })
+
 @api_blueprint.route("/<site>", methods=["GET"])
 def run_scraper(site):
     site = site.lower()
 
-    if site not in SCRAPER_MAP:
+    if site not in SITES:
         return jsonify({"error": f"Site '{site}' não reconhecido"}), 400
 
     cutoff_str = request.args.get("date")
@@ -39,40 +91,144 @@ def run_scraper(site):
         return jsonify({"error": "Parâmetro 'date' (dd/mm/yyyy) é obrigatório"}), 400
 
     output_format = request.args.get("format", DEFAULT_OUTPUT_FORMAT).lower()
-    if output_format not in ["json", "csv"]:
-        return jsonify({"error": f"Formato de saída '{output_format}' inválido. Use 'json' ou 'csv'"}), 400
+    if output_format not in OUTPUT_FORMATS:
+        return jsonify({"error": f"Formato de saída '{output_format}' inválido. Use 'json', 'csv' ou 'ndjson'"}), 400
 
     try:
         cutoff_date = datetime.strptime(cutoff_str, DATE_FORMAT)
     except ValueError:
         return jsonify({"error": f"Formato inválido da data: {cutoff_str}. Use dd/mm/yyyy"}), 400
 
+    since_str = request.args.get("since")
     try:
-        scraper_func = SCRAPER_MAP[site]
-        results = scraper_func(cutoff_date)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        since = datetime.strptime(since_str, DATE_FORMAT) if since_str else None
+    except ValueError:
+        return jsonify({"error": f"Formato inválido da data: {since_str}. Use dd/mm/yyyy"}), 400
+
+    # JSON é paginado; CSV/NDJSON são transmitidos em streaming e só limitam se pedido.
+    streaming = output_format in STREAM_MIMETYPES
+    limit_str = request.args.get("limit")
+    try:
+        limit = int(limit_str) if limit_str else (None if streaming else DEFAULT_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "Parâmetro 'limit' deve ser um número inteiro"}), 400
+    if limit is not None and (limit < 1 or (not streaming and limit > MAX_PAGE_SIZE)):
+        return jsonify({"error": f"Parâmetro 'limit' deve estar entre 1 e {MAX_PAGE_SIZE}"}), 400
+
+    q = request.args.get("q") or request.args.get("filter")
+    cursor = request.args.get("cursor")
+    seek = request.args.get("seek", "").lower() in ("1", "true")
+    refresh = request.args.get("refresh", "").lower() in ("1", "true")
+
+    # A coleta ao vivo só acontece sob pedido explícito e roda como job em segundo plano;
+    # o resto vem do banco local.
+    if refresh:
+        job, created = job_manager.submit(site, get_scraper(site), cutoff_date, since=since, seek=seek)
+        return job_response(job, created=created)
+
+    live = request.args.get("live", "").lower() in ("1", "true")
+    if streaming:
+        return stream_publications(site, output_format, cutoff_date, since, q, limit, cursor, seek, live)
+
+    try:
+        results, next_cursor = get_publication_store().query_page(
+            site=site, since=since, until=cutoff_date, q=q, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    if output_format == "csv":
-        if not results:
-            return make_response("", 204)
-            
-        output = StringIO()
-        keys = results[0].keys()
-        writer = csv.DictWriter(output, fieldnames=keys)
-        
-        writer.writeheader()
-        writer.writerows(results)
-        csv_data = output.getvalue()
-        
-        response = make_response(csv_data)
-        response.headers["Content-Disposition"] = f"attachment; filename={site}_data.csv"
-        response.headers["Content-type"] = "text/csv; charset=utf-8"
-        return response
-    
     return jsonify({
         "site": site,
         "cutoff_date": cutoff_str,
+        "since": since_str,
+        "q": q,
         "total": len(results),
+        "next_cursor": next_cursor,
         "results": results
-    })
\ No newline at end of file
+    })
+
+def stream_publications(site, output_format, cutoff_date, since, q, limit, cursor, seek, live):
+    """
+    Responde CSV/NDJSON em streaming, sem montar o resultado em memória.
+
+    Lê do banco em lotes ou, com `live=1`, repassa cada página assim que o
+    scraper a termina. A coleta ao vivo roda como job (que grava as páginas
+    no banco): pedidos idênticos simultâneos acompanham a mesma coleta em vez
+    de repetir as requisições ao site. Lido do banco e com `limit`, o cursor
+    da página seguinte vai no cabeçalho X-Next-Cursor, calculado antes de a
+    transmissão começar.
+    """
+    next_cursor = None
+    store = get_publication_store()
+    if live:
+        job, _ = job_manager.submit(site, get_scraper(site), cutoff_date, since=since, filter_text=q, seek=seek)
+        rows = job.follow()
+        if limit:
+            rows = itertools.islice(rows, limit)
+        chunk_size = 0  # cada linha sai assim que a página é coletada
+    else:
+        try:
+            rows = store.iter_query(site=site, since=since, until=cutoff_date, q=q, limit=limit, cursor=cursor)
+            first = next(rows, None)
+            if limit and first is not None:
+                next_cursor = store.next_cursor(site=site, since=since, until=cutoff_date, q=q, limit=limit,
+                                                cursor=cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if first is None:
+            return make_response("", 204)
+        rows = itertools.chain([first], rows)
+        chunk_size = STREAM_CHUNK_SIZE
+
+    chunks = csv_chunks(rows, chunk_size) if output_format == "csv" else ndjson_chunks(rows, chunk_size)
+    response = Response(stream_with_context(chunks), mimetype=STREAM_MIMETYPES[output_format])
+    response.headers["Content-Disposition"] = f"attachment; filename={site}_data.{output_format}"
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+def job_response(job, created=True):
+    body = job.to_dict(include_result=False)
+    body["status_url"] = url_for("api.get_job", job_id=job.id)
+    return jsonify(body), 202 if created else 200
+
+@api_blueprint.route("/jobs", methods=["POST"])
+def create_job():
+    """Dispara (ou reaproveita) uma coleta ao vivo e retorna o id para acompanhamento."""
+    params = request.get_json(silent=True) or request.form.to_dict() or request.args.to_dict()
+    if not isinstance(params, dict):
+        return jsonify({"error": "O corpo JSON deve ser um objeto {site, date, since, filter, seek}"}), 400
+
+    not_text = [name for name in ("site", "date", "since", "filter")
+                if params.get(name) is not None and not isinstance(params[name], str)]
+    if not_text:
+        return jsonify({"error": f"Parâmetros devem ser texto: {', '.join(not_text)}"}), 400
+
+    site = (params.get("site") or "").lower()
+    if site not in SITES:
+        return jsonify({"error": f"Site '{site}' não reconhecido"}), 400
+
+    cutoff_str = params.get("date")
+    if not cutoff_str:
+        return jsonify({"error": "Parâmetro 'date' (dd/mm/yyyy) é obrigatório"}), 400
+
+    since_str = params.get("since")
+    try:
+        cutoff_date = datetime.strptime(cutoff_str, DATE_FORMAT)
+        since = datetime.strptime(since_str, DATE_FORMAT) if since_str else None
+    except ValueError:
+        return jsonify({"error": "Formato inválido de data. Use dd/mm/yyyy"}), 400
+
+    seek = str(params.get("seek", "")).lower() in ("1", "true")
+    job, created = job_manager.submit(
+        site, get_scraper(site), cutoff_date, since=since, filter_text=params.get("filter"), seek=seek
+    )
+    return job_response(job, created=created)
+
+@api_blueprint.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Progresso (páginas, itens) e, quando concluído, o resultado do job."""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({"error": f"Job '{job_id}' não encontrado ou expirado"}), 404
+    return jsonify(job.to_dict())
@@ -0,0 +1,158 @@
+"""
+Servidor HTTP local que faz o papel dos sites reais nos benchmarks.
+
+Fala HTTP/1.1 com keep-alive, conta as conexões TCP abertas (cada uma seria
+um handshake TCP+TLS no site real) e comprime as respostas com gzip quando
+o cliente anuncia suporte. Com `validators=True` envia ETag/Last-Modified e
+responde 304 a GETs condicionais. `handshake_latency` atrasa cada conexão nova para
+simular o custo do handshake, que no loopback é praticamente zero.
+`latency` atrasa cada resposta (tempo de servidor + RTT) e `error_rate`
+devolve 503 em uma fração aleatória (semente fixa) das requisições.
+"""
+import gzip
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def synthetic_page(path, size=20000):
+    """Gera uma página HTML determinística com aproximadamente `size` bytes.
+
+    Funções de render recebem o path e retornam o HTML (ou None para 404).
+    """
+    filler = "<p>Publicação legal de teste para benchmark.</p>\n"
+    body = filler * max(1, size // len(filler))
+    return f"<html><head><title>{path}</title></head><body>{body}</body></html>"
+
+
+LAST_MODIFIED = "Fri, 31 Oct 2025 12:00:00 GMT"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Cabeçalho e corpo saem em writes separados; sem isso o Nagle + ACK
+    # atrasado somam ~40ms por resposta em conexões reaproveitadas.
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connections += 1
+        if self.server.handshake_latency:
+            time.sleep(self.server.handshake_latency)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.stats_lock:
+            self.server.requests += 1
+            failed = self.server.error_rate and self.server.rng.random() < self.server.error_rate
+            if failed:
+                self.server.errors += 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if failed:
+            self.send_error(503)
+            return
+
+        page = self.server.render(self.path)
+        if page is None:
+            self.send_error(404)
+            return
+
+        body = page.encode("utf-8")
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+
+        if self.server.validators:
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+            headers["ETag"] = etag
+            headers["Last-Modified"] = LAST_MODIFIED
+            if self.headers.get("If-None-Match") == etag:
+                with self.server.stats_lock:
+                    self.server.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        if self.server.gzip_enabled and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        self.send_response(200)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer:
+    """Sobe o servidor em uma thread daemon em 127.0.0.1 (porta aleatória)."""
+
+    def __init__(self, render=synthetic_page, gzip_enabled=True, handshake_latency=0.0, validators=False,
+                 latency=0.0, error_rate=0.0, seed=0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.render = render
+        self.httpd.gzip_enabled = gzip_enabled
+        self.httpd.handshake_latency = handshake_latency
+        self.httpd.validators = validators
+        self.httpd.latency = latency
+        self.httpd.error_rate = error_rate
+        self.httpd.rng = random.Random(seed)
+        self.httpd.stats_lock = threading.Lock()
+        self.httpd.connections = 0
+        self.httpd.requests = 0
+        self.httpd.not_modified = 0
+        self.httpd.errors = 0
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self):
+        return self.httpd.connections
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    @property
+    def not_modified(self):
+        return self.httpd.not_modified
+
+    @property
+    def errors(self):
+        return self.httpd.errors
+
+    def reset_stats(self):
+        with self.httpd.stats_lock:
+            self.httpd.connections = 0
+            self.httpd.requests = 0
+            self.httpd.not_modified = 0
+            self.httpd.errors = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
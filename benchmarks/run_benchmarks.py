@@ -0,0 +1,378 @@
+"""
+Suíte de benchmarks offline: roda contra as fixtures gravadas e o servidor
+local (benchmarks/site_server.py), sem acesso aos sites reais.
+
+Mede, por site:
+  - parse: tempo médio por página de cada backend (bs4/lxml);
+  - fetch: vazão do cliente HTTP buscando as páginas de índice;
+  - crawl: tempo de ponta a ponta do iter_<site> (índice + editais);
+  - memory: pico de memória alocada durante o crawl (tracemalloc);
+  - parse_pool: vazão de parse com os três sites em paralelo (uma thread
+    por site, como no scheduler), na própria thread vs. no pool de processos;
+  - search: tamanho do índice invertido (storage/search_index.py) e latência
+    das buscas sobre um banco sintético com os títulos das fixtures.
+
+O limitador de requisições por host fica desligado por padrão para medir
+só rede e CPU; com --rate-limit o servidor local recebe o orçamento padrão
+(scraper.rate_limiter.DEFAULT_BUDGET).
+
+Uso:
+  python -m benchmarks.run_benchmarks [--pages 10] [--latency 0.02] [--error-rate 0.0]
+                                      [--parser lxml] [--prefetch 2] [--parse-workers N] [--rate-limit]
+                                      [--search-docs 20000]
+                                      [--output benchmark_results.json]
+                                      [--compare resultado_anterior.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.site_server import site_server, fixture_paths, read_fixture
+from main import non_negative_int
+from scraper.base_scraper import BaseScraper, DEFAULT_PREFETCH_DEPTH, set_prefetch_depth
+from scraper.html_parsing import PARSER_BACKENDS, DEFAULT_PARSER_BACKEND, set_parser_backend
+from scraper.http_cache import configure_http_cache
+from scraper.http_client import configure_http_client
+from scraper.parse_pool import configure_parse_pool, run_parse
+from scraper.rate_limiter import configure_rate_limiter
+from scraper.sites.agorarn import agorarn_integration
+from scraper.sites.agorarn.agorarn_service import AgoraRNService
+from scraper.sites.diariocomercial import diariocomercial_integration
+from scraper.sites.diariocomercial.diariocomercial_service import DiarioComercialService
+from scraper.sites.diariodocomercio import diariodocomercio_integration
+from scraper.sites.diariodocomercio.diariodocomercio_service import DiarioDoComercioService
+from storage.publication_store import PublicationStore
+from storage.search_index import tokenize
+
+DEFAULT_PAGES = 10
+DEFAULT_LATENCY = 0.02  # segundos por resposta, próximo do RTT até os sites reais
+DEFAULT_REPEAT = 20
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_SEARCH_DOCS = 20000
+SEARCH_BATCH_SIZE = 20  # publicações por upsert, como uma página gravada pelo scheduler
+SEARCH_QUERIES = 200
+CUTOFF_DATE = datetime(2025, 10, 31)
+EDITAL_URL = "https://diariodocomercio.com.br/edital-completo/empresa-exemplo/30-10-2025/"
+
+SITES = {
+    "agorarn": (agorarn_integration, AgoraRNService, agorarn_integration.iter_agorarn),
+    "diariocomercial": (diariocomercial_integration, DiarioComercialService,
+                        diariocomercial_integration.iter_diariocomercial),
+    "diariodocomercio": (diariodocomercio_integration, DiarioDoComercioService,
+                         diariodocomercio_integration.iter_diariodocomercio),
+}
+
+PARSE_CASES = {
+    "agorarn": ("index", AgoraRNService.parse_page_for_publications),
+    "diariocomercial": ("index", DiarioComercialService.parse_page_for_publications),
+    "diariodocomercio": ("index", DiarioDoComercioService.parse_page_for_publications),
+    "diariodocomercio_edital": ("edital", lambda html, backend: DiarioDoComercioService.extract_publication_data(
+        html, EDITAL_URL, backend)),
+}
+
+
+def bench_parse(repeat):
+    """Tempo médio (ms) por página de cada backend sobre as fixtures gravadas."""
+    results = {}
+    for name, (kind, parse) in PARSE_CASES.items():
+        site = name.split("_")[0]
+        pages = [read_fixture(path) for path in fixture_paths(site, kind)]
+        results[name] = {"pages": len(pages)}
+        for backend in PARSER_BACKENDS:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for html in pages:
+                    parse(html, backend)
+            elapsed = time.perf_counter() - start
+            results[name][f"{backend}_ms_per_page"] = round(elapsed / (repeat * len(pages)) * 1000, 3)
+    return results
+
+
+def run_sites_in_parallel(repeat):
+    """Uma thread por site fazendo o parse das suas fixtures com run_parse; retorna (páginas, segundos)."""
+    work = {
+        site: [read_fixture(path) for path in fixture_paths(site)]
+        for site in ("agorarn", "diariocomercial", "diariodocomercio")
+    }
+    parsers = {
+        "agorarn": AgoraRNService.parse_page_for_publications,
+        "diariocomercial": DiarioComercialService.parse_page_for_publications,
+        "diariodocomercio": DiarioDoComercioService.parse_page_for_publications,
+    }
+
+    def parse_site(site):
+        for _ in range(repeat):
+            for html in work[site]:
+                run_parse(parsers[site], html)
+
+    threads = [threading.Thread(target=parse_site, args=(site,)) for site in work]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(len(pages) for pages in work.values()) * repeat, time.perf_counter() - start
+
+
+def bench_parse_pool(workers, repeat):
+    """Parse dos três sites em paralelo: threads (GIL) vs. pool de `workers` processos."""
+    configure_parse_pool(enabled=False)
+    pages, inline = run_sites_in_parallel(repeat)
+
+    configure_parse_pool(workers)
+    try:
+        run_sites_in_parallel(1)  # sobe os processos fora da medição
+        _, pooled = run_sites_in_parallel(repeat)
+    finally:
+        configure_parse_pool(enabled=False)
+
+    return {
+        "cpus": os.cpu_count(),
+        "workers": workers,
+        "pages": pages,
+        "threads_pages_per_sec": round(pages / inline, 1),
+        "pool_pages_per_sec": round(pages / pooled, 1),
+        "speedup": round(inline / pooled, 2),
+    }
+
+
+def synthetic_publications(count, seed=0):
+    """`count` publicações com títulos montados a partir das palavras das fixtures (AgoraRN e Diário Comercial)."""
+    titles = [
+        pub["title"]
+        for site, service in (("agorarn", AgoraRNService), ("diariocomercial", DiarioComercialService))
+        for path in fixture_paths(site)
+        for pub in service.parse_page_for_publications(read_fixture(path))
+    ]
+    words = sorted({word for title in titles for word in title.split()})
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1).toordinal()
+    for i in range(count):
+        title = " ".join([rng.choice(titles)] + rng.sample(words, 3))
+        yield {
+            "date": datetime.fromordinal(start + rng.randrange(365)).strftime("%d/%m/%Y"),
+            "title": title,
+            "pdf_url": f"https://example.com/{i}.pdf",
+            "site": "agorarn.com.br",
+            "original_url": None,
+        }
+
+
+def bench_search(documents, seed=0):
+    """Indexação incremental (em lotes, como o scheduler), tamanho do índice e latência de GET /search."""
+    publications = list(synthetic_publications(documents, seed))
+    vocabulary = sorted({term for pub in publications[:1000] for term in tokenize(pub["title"]) if len(term) > 3})
+    rng = random.Random(seed)
+    queries = [" ".join(rng.sample(vocabulary, rng.choice((1, 2)))) for _ in range(SEARCH_QUERIES)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PublicationStore(os.path.join(tmp, "publicacoes.db"))
+        start = time.perf_counter()
+        for i in range(0, len(publications), SEARCH_BATCH_SIZE):
+            store.upsert_many("agorarn", publications[i:i + SEARCH_BATCH_SIZE])
+        indexing = time.perf_counter() - start
+        stats = store.search_index_stats()
+
+        latencies = []
+        for q in queries:
+            start = time.perf_counter()
+            store.search(q, limit=20)
+            latencies.append((time.perf_counter() - start) * 1000)
+        store.close()
+
+    latencies.sort()
+    return {
+        "documents": stats["documents"],
+        "terms": stats["terms"],
+        "postings": stats["postings"],
+        "index_kb": round(stats["bytes"] / 1024, 1) if stats["bytes"] else None,
+        "index_docs_per_sec": round(documents / indexing, 1),
+        "queries": len(queries),
+        "query_p50_ms": round(statistics.median(latencies), 3),
+        "query_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+    }
+
+
+def bench_fetch(server, site, pages):
+    """Vazão buscando as páginas de índice 1..pages, uma por vez."""
+    integration = SITES[site][0]
+    server.reset_stats()
+    fetched = failed = total_bytes = 0
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for page_num in range(1, pages + 1):
+            html = BaseScraper.get_html_content(integration.SPEC.index_url(page_num))
+            if html:
+                fetched += 1
+                total_bytes += len(html.encode("utf-8"))
+            else:
+                failed += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "pages": fetched,
+        "failed": failed,
+        "seconds": round(elapsed, 4),
+        "pages_per_sec": round(fetched / elapsed, 2),
+        "kb_per_sec": round(total_bytes / 1024 / elapsed, 1),
+        "connections": server.connections,
+    }
+
+
+def run_crawl(site):
+    iterate = SITES[site][2]
+    with contextlib.redirect_stdout(io.StringIO()):
+        return sum(1 for _ in iterate(CUTOFF_DATE))
+
+
+def bench_crawl(server, site):
+    """Crawl completo (tempo) e, numa segunda passada, o pico de memória."""
+    server.reset_stats()
+    start = time.perf_counter()
+    items = run_crawl(site)
+    elapsed = time.perf_counter() - start
+    requests_made, errors = server.requests, server.errors
+
+    tracemalloc.start()
+    try:
+        run_crawl(site)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "items": items,
+        "requests": requests_made,
+        "server_errors": errors,
+        "seconds": round(elapsed, 4),
+        "items_per_sec": round(items / elapsed, 2) if elapsed else None,
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+@contextlib.contextmanager
+def pointed_at(base_url):
+    """Aponta os sites para o servidor local, restaurando as URLs reais ao sair."""
+    saved = [(service, service.BASE_URL) for _, service, _ in SITES.values()]
+    for service, _ in saved:
+        service.BASE_URL = base_url
+    try:
+        yield
+    finally:
+        for service, base in saved:
+            service.BASE_URL = base
+
+
+def flatten(data, prefix=""):
+    values = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{path}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[path] = value
+    return values
+
+
+def compare(previous, current):
+    """Imprime a variação das métricas entre duas execuções salvas."""
+    before = flatten(previous.get("sites", {}))
+    after = flatten(current["sites"])
+    before.update(flatten({"search": previous.get("search", {})}))
+    after.update(flatten({"search": current.get("search", {})}))
+    print("\nComparação com a execução anterior:")
+    for path in sorted(set(before) & set(after)):
+        old, new = before[path], after[path]
+        if old == new or not old:
+            continue
+        print(f"  {path}: {old} -> {new} ({(new - old) / old * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks offline dos scrapers (fixtures + servidor local).")
+    parser.add_argument("--pages", type=int, default=DEFAULT_PAGES, help="Páginas de índice servidas por site")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="Atraso de cada resposta (segundos)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas 503 (0 a 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Semente das falhas simuladas")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Repetições do benchmark de parse")
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default=DEFAULT_PARSER_BACKEND,
+                        help="Backend usado no crawl")
+    parser.add_argument("--prefetch", type=non_negative_int, default=DEFAULT_PREFETCH_DEPTH,
+                        help="Páginas de índice buscadas à frente no crawl (0 desliga)")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count(),
+                        help="Processos do benchmark de parse em pool (0 pula a medição)")
+    parser.add_argument("--search-docs", type=int, default=DEFAULT_SEARCH_DOCS,
+                        help="Publicações do banco sintético do benchmark de busca (0 pula a medição)")
+    parser.add_argument("--sites", nargs="+", choices=list(SITES), default=list(SITES))
+    parser.add_argument("--rate-limit", action="store_true", help="Mantém o limitador de requisições por host")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Arquivo JSON com os resultados")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    configure_http_cache(enabled=False)
+    configure_http_client()
+    configure_rate_limiter(enabled=args.rate_limit)
+    set_parser_backend(args.parser)
+    set_prefetch_depth(args.prefetch)
+
+    parse_results = bench_parse(args.repeat)
+    parse_pool = bench_parse_pool(args.parse_workers, args.repeat) if args.parse_workers else None
+    search = bench_search(args.search_docs, args.seed) if args.search_docs else None
+    sites = {}
+    with site_server(args.pages, args.latency, args.error_rate, args.seed) as server, \
+            pointed_at(server.base_url):
+        for site in args.sites:
+            print(f"Medindo {site}...", file=sys.stderr)
+            sites[site] = {
+                "parse": parse_results[site],
+                "fetch": bench_fetch(server, site, args.pages),
+                "crawl": bench_crawl(server, site),
+            }
+    if "diariodocomercio" in sites:
+        sites["diariodocomercio"]["parse_edital"] = parse_results["diariodocomercio_edital"]
+
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "pages": args.pages,
+            "latency": args.latency,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "parser": args.parser,
+            "prefetch": args.prefetch,
+            "rate_limit": args.rate_limit,
+        },
+        "sites": sites,
+    }
+    if parse_pool:
+        result["parse_pool"] = parse_pool
+    if search:
+        result["search"] = search
+
+    print(json.dumps(result, indent=2))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"Resultados salvos em: {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Servidor local que imita os três sites a partir das páginas gravadas em
+tests/fixtures, para medir coletas completas sem acesso à rede.
+
+As páginas de índice 1..`pages` reaproveitam as fixtures em ciclo; além
+disso o servidor responde 404, como os sites reais depois da última página.
+Links absolutos para os domínios reais são reescritos para o servidor local,
+de modo que as páginas de edital também são buscadas nele.
+
+Com `discovery=<site>`, o servidor também responde aos endpoints
+estruturados daquele site (API de mídia, feed, sitemap) com as amostras
+gravadas em DISCOVERY_FIXTURES; só a primeira página de cada um existe.
+"""
+import glob
+import os
+import re
+import zlib
+
+from benchmarks.local_server import StandInServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures")
+SITE_DOMAINS_PATTERN = re.compile(r"https?://(?:agorarn|diariocomercial|diariodocomercio)\.com\.br")
+
+INDEX_ROUTES = [
+    (re.compile(r"^/publicacoescertificadas/page/(\d+)/?$"), "agorarn"),
+    (re.compile(r"^/publicidade-legal/pagina/(\d+)/?$"), "diariocomercial"),
+    (re.compile(r"^/publicidade-legal-impresso/page/(\d+)/?$"), "diariodocomercio"),
+]
+EDITAL_ROUTE = re.compile(r"^/edital-completo/([^/]+)/[^/]+/?$")
+DISCOVERY_FIXTURES = {
+    "agorarn": {"/wp-json/wp/v2/media": "wp_media.json"},
+    "diariocomercial": {"/feed/": "feed.xml"},
+    "diariodocomercio": {"/sitemap_index.xml": "sitemap_index.xml", "/edital-sitemap.xml": "sitemap_editais.xml"},
+}
+PAGINATION_PARAM = re.compile(r"[?&](?:page|paged)=(\d+)")
+
+
+def read_fixture(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def fixture_paths(site, kind="index"):
+    """Fixtures gravadas de um site, em ordem ("index" ou "edital")."""
+    return sorted(glob.glob(os.path.join(FIXTURES_DIR, site, f"{kind}_*.html")))
+
+
+class FixtureSites:
+    """Função de render do StandInServer que serve as fixtures dos três sites."""
+
+    def __init__(self, pages, discovery=None):
+        self.pages = pages
+        self.base_url = ""
+        self._index = {site: [read_fixture(p) for p in fixture_paths(site)] for _, site in INDEX_ROUTES}
+        self._editais = [read_fixture(p) for p in fixture_paths("diariodocomercio", "edital")]
+        self._discovery = {
+            route: read_fixture(os.path.join(FIXTURES_DIR, discovery, name))
+            for route, name in DISCOVERY_FIXTURES.get(discovery, {}).items()
+        }
+
+    def __call__(self, path):
+        path, _, query = path.partition("?")
+        if path in self._discovery:
+            page = PAGINATION_PARAM.search(f"?{query}")
+            return self._localize(self._discovery[path]) if not page or page.group(1) == "1" else None
+
+        for pattern, site in INDEX_ROUTES:
+            match = pattern.match(path)
+            if match:
+                page_num = int(match.group(1))
+                if not 1 <= page_num <= self.pages:
+                    return None
+                pages = self._index[site]
+                return self._localize(pages[(page_num - 1) % len(pages)])
+
+        match = EDITAL_ROUTE.match(path)
+        if match:
+            # escolha determinística do modelo de edital a partir do slug
+            slug = match.group(1).encode("utf-8")
+            return self._localize(self._editais[zlib.crc32(slug) % len(self._editais)])
+        return None
+
+    def _localize(self, html):
+        return SITE_DOMAINS_PATTERN.sub(self.base_url, html)
+
+
+def site_server(pages, latency=0.0, error_rate=0.0, seed=0, discovery=None):
+    """StandInServer com as fixtures (ainda parado): use como context manager."""
+    sites = FixtureSites(pages, discovery)
+    server = StandInServer(render=sites, latency=latency, error_rate=error_rate, seed=seed)
+    sites.base_url = server.base_url
+    return server
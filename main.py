@@ -1,26 +1,39 @@
+import os
 import sys
 import threading
 import argparse
-import json
-import csv
+import itertools
 from datetime import datetime
-from api import create_app
-from scheduler import start_scheduler, run_all_scrapers
 
-# Scrapers
-from scraper.sites.agorarn.agorarn_integration import scrape_agorarn
-from scraper.sites.diariodocomercio.diariodocomercio_integration import scrape_diariodocomercio
-from scraper.sites.diariocomercial.diariocomercial_integration import scrape_diariocomercial
+# Flask, scheduler e as integrações dos sites são importados só no comando
+# que os usa: uma coleta de um site pela CLI não paga a importação do resto
+# (scraper.registry resolve o módulo do site sob demanda).
+
+# site especial da CLI: todos os sites registrados, em paralelo, num único arquivo
+ALL_SITES = "all"
+
+
+def non_negative_int(value):
+    """Tipo do argparse para contagens: inteiro >= 0, com erro de uso caso contrário."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"esperado um inteiro >= 0, recebido '{value}'")
+    return number
 
 
 def start_api():
     """Inicializa o servidor Flask."""
+    from api import create_app
     app = create_app()
     app.run(host="0.0.0.0", port=5000, debug=True, use_reloader=False)
 
 
 def start_scheduler_thread():
     """Inicia o scheduler em uma thread separada."""
+    from scheduler import start_scheduler, run_all_scrapers
     try:
         run_all_scrapers()
         start_scheduler()
@@ -30,6 +43,11 @@ def start_scheduler_thread():
 
 def run_scraper_cli(args):
     """Executa o scraper via linha de comando."""
+    from scraper import tracing
+    from scraper.base_scraper import FetchError, set_prefetch_depth
+    from scraper.html_parsing import set_parser_backend
+    from scraper.title_filter import parse_filter, terms_filter
+
     site = args.site.lower()
     date_str = args.date
     fmt = args.format.lower()
@@ -37,40 +55,107 @@ def run_scraper_cli(args):
 
     try:
         cutoff_date = datetime.strptime(date_str, "%d/%m/%Y")
+        since = datetime.strptime(args.since, "%d/%m/%Y") if args.since else None
     except ValueError:
         print("Formato de data inválido. Use dd/mm/yyyy.")
         sys.exit(1)
 
-    print(f"Iniciando coleta para o site '{site}' com data limite {date_str}...")
+    # o filtro é compilado uma vez aqui e usado por todas as páginas (e sites, com "all")
+    try:
+        if args.filter:
+            filter_text = parse_filter(args.filter)
+        elif args.filter_file:
+            with open(args.filter_file, encoding="utf-8") as f:
+                filter_text = terms_filter([line.strip() for line in f if line.strip()], source=args.filter_file)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    except OSError as e:
+        print(f"Não foi possível ler o arquivo de filtro: {e}")
+        sys.exit(1)
+
+    set_parser_backend(args.parser)
+    set_prefetch_depth(args.prefetch)
+    if site == ALL_SITES:
+        print(f"Iniciando coleta de todos os sites em paralelo com data limite {date_str}...")
+    else:
+        print(f"Iniciando coleta para o site '{site}' com data limite {date_str}...")
+
+    suffix = f"{site}_{date_str.replace('/', '-')}"
+    if args.profile:
+        tracing.start_trace()
+    profiler = None
+    if args.cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
 
-    if site == "agorarn":
-        results = scrape_agorarn(cutoff_date, filter_text=filter_text)
-    elif site == "diariodocomercio":
-        results = scrape_diariodocomercio(cutoff_date, filter_text=filter_text)
-    elif site == "diariocomercial":
-        results = scrape_diariocomercial(cutoff_date, filter_text=filter_text)
+    try:
+        collect_to_file(site, cutoff_date, since, filter_text, args.seek, fmt, f"resultados_{suffix}.{fmt}",
+                        args.discovery)
+    except FetchError as e:
+        print(f"Coleta interrompida: a página não pôde ser obtida após novas tentativas ({e}).")
+        sys.exit(1)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(f"profile_{suffix}.prof")
+            print(f"Perfil cProfile salvo em: profile_{suffix}.prof")
+        tracer = tracing.stop_trace()
+        if tracer:
+            tracer.save(f"trace_{suffix}.json")
+            print(f"Trace salvo em: trace_{suffix}.json")
+            print(tracer.format_summary())
+
+
+def collect_to_file(site, cutoff_date, since, filter_text, seek, fmt, output_name, discovery=False):
+    """
+    Roda o gerador do site e grava o resultado em streaming no arquivo de
+    saída. Com site "all", coleta todos os sites em paralelo e grava um único
+    arquivo, do mais novo para o mais antigo e sem pdf_url repetido.
+    """
+    from scraper.registry import SITES, get_iterator
+    from scraper.writers import write_json_stream, write_csv_stream, write_ndjson_stream
+
+    stats = {}
+    if site == ALL_SITES:
+        from scraper.multi_site import iter_all_sites
+        results = iter_all_sites(cutoff_date, filter_text=filter_text, seek=seek, since=since, discovery=discovery,
+                                 stats=stats)
+    elif site in SITES:
+        results = get_iterator(site)(cutoff_date, filter_text=filter_text, seek=seek, since=since,
+                                     discovery=discovery)
     else:
         print(f"Site '{site}' não reconhecido.")
         sys.exit(1)
 
-    if not results:
+    # O arquivo só é criado quando a primeira publicação chega; a partir daí
+    # cada página coletada é gravada imediatamente.
+    first = next(results, None)
+    if first is None:
         print("Nenhuma publicação coletada.")
         return
+    results = itertools.chain([first], results)
 
-    output_name = f"resultados_{site}_{date_str.replace('/', '-')}.{fmt}"
-    if fmt == "json":
-        with open(output_name, "w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-    elif fmt == "csv":
-        with open(output_name, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=results[0].keys())
-            writer.writeheader()
-            writer.writerows(results)
-    else:
-        print("Formato inválido. Use 'json' ou 'csv'.")
+    writers = {"json": write_json_stream, "csv": write_csv_stream, "ndjson": write_ndjson_stream}
+    if fmt not in writers:
+        print("Formato inválido. Use 'json', 'csv' ou 'ndjson'.")
         sys.exit(1)
 
-    print(f"Coleta concluída. Resultado salvo em: {output_name}")
+    # Grava num temporário ao lado do destino e só o renomeia no fim: uma
+    # coleta interrompida (FetchError) não deixa um arquivo truncado no lugar.
+    tmp_name = f"{output_name}.tmp"
+    try:
+        with open(tmp_name, "w", newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+            total = writers[fmt](results, f)
+    except BaseException:
+        os.remove(tmp_name)
+        raise
+    os.replace(tmp_name, output_name)
+
+    if stats.get("duplicates"):
+        print(f"{stats['duplicates']} publicações com pdf_url repetido descartadas.")
+    print(f"Coleta concluída. {total} publicações salvas em: {output_name}")
 
 
 def main():
@@ -82,13 +167,15 @@ def main():
       python main.py scheduler
       python main.py both
       python main.py agorarn --date 31/10/2025 --filter-text "balanço" --format csv
+      python main.py diariocomercial --date 31/10/2025 --since 25/10/2025
+      python main.py all --date 31/10/2025 --format ndjson
     """
     if len(sys.argv) < 2:
         print("Uso:")
         print("  python main.py api")
         print("  python main.py scheduler")
         print("  python main.py both")
-        print("  python main.py <site> --date dd/mm/yyyy [--format json|csv] [--filter-text 'palavra']")
+        print("  python main.py <site|all> --date dd/mm/yyyy [--format json|csv|ndjson] [--since dd/mm/yyyy] [--filter-text 'palavra' | --filter 'expressão' | --filter-file termos.txt] [--seek] [--discovery] [--parser bs4|lxml] [--prefetch N] [--profile] [--cprofile]")
         sys.exit(1)
 
     command = sys.argv[1].lower()
@@ -103,11 +190,24 @@ def main():
             api_thread.start()
             start_scheduler_thread()
     else:
+        from scraper.base_scraper import DEFAULT_PREFETCH_DEPTH
+        from scraper.html_parsing import PARSER_BACKENDS, DEFAULT_PARSER_BACKEND
+
         parser = argparse.ArgumentParser(description="Executa o scraper de publicações legais.")
-        parser.add_argument("site", help="Nome do site (agorarn, diariodocomercio, diariocomercial)")
+        parser.add_argument("site", help="Nome do site (agorarn, diariodocomercio, diariocomercial) ou 'all' para todos em paralelo, num único arquivo")
         parser.add_argument("--date", required=True, help="Data limite (dd/mm/yyyy)")
-        parser.add_argument("--format", default="json", choices=["json", "csv"], help="Formato de saída")
-        parser.add_argument("--filter-text", help="Filtra publicações cujo título contenha a palavra informada (case-insensitive).")
+        parser.add_argument("--since", help="Data inicial (dd/mm/yyyy). A coleta para quando uma página inteira for anterior a ela.")
+        parser.add_argument("--format", default="json", choices=["json", "csv", "ndjson"], help="Formato de saída")
+        filters = parser.add_mutually_exclusive_group()
+        filters.add_argument("--filter-text", help="Filtra publicações cujo título contenha a palavra informada (case-insensitive).")
+        filters.add_argument("--filter", help='Expressão sobre o título com AND, OR, NOT, parênteses e frases entre aspas, ex.: \'balanço AND (assembleia OR edital) NOT errata\'.')
+        filters.add_argument("--filter-file", help="Arquivo com um termo por linha (ex.: nomes de empresas); mantém as publicações cujo título contenha qualquer um deles.")
+        parser.add_argument("--parser", default=DEFAULT_PARSER_BACKEND, choices=PARSER_BACKENDS, help="Parser de HTML: bs4 (padrão) ou lxml (XPath, mais rápido).")
+        parser.add_argument("--seek", action="store_true", help="Localiza por busca binária a primeira página com datas <= --date (útil para coletas históricas).")
+        parser.add_argument("--discovery", action="store_true", help="Lista as publicações pela API REST/feed/sitemap do WordPress quando o site os expõe, voltando às páginas HTML se não.")
+        parser.add_argument("--prefetch", type=non_negative_int, default=DEFAULT_PREFETCH_DEPTH, help=f"Páginas de índice buscadas à frente enquanto a atual é processada (padrão: {DEFAULT_PREFETCH_DEPTH}; 0 desliga).")
+        parser.add_argument("--profile", action="store_true", help="Grava trace_<site>_<data>.json (spans de fetch, parse, edital e pausas) e mostra onde o tempo foi gasto.")
+        parser.add_argument("--cprofile", action="store_true", help="Grava também um perfil cProfile em profile_<site>_<data>.prof.")
         args = parser.parse_args()
         run_scraper_cli(args)
 
@@ -1,45 +1,89 @@
 import asyncio
 import schedule
 import time
-import json
 from datetime import datetime
-from scraper.sites.diariodocomercio.diariodocomercio_integration import scrape_diariodocomercio
-from scraper.sites.diariocomercial.diariocomercial_integration import scrape_diariocomercial
-from scraper.sites.agorarn.agorarn_integration import scrape_agorarn
+from scraper.registry import site_names, get_iterator, get_spec
+from scraper.watermark import HighWaterMarkStore
+from scraper.checkpoint import CheckpointStore
+from scraper.metrics import SCRAPER_RETRIES, SCRAPER_RUNS
+from scraper.parse_pool import configure_parse_pool, get_parse_pool
+from storage.publication_store import get_publication_store
 
 DATE_FORMAT = "%d/%m/%Y"
 MAX_RETRIES = 3
+RETRY_DELAY = 5  # segundos entre as tentativas de coleta de um site
+# lista as publicações pelos endpoints estruturados (scraper/discovery.py) quando o site os expõe
+USE_DISCOVERY = False
+# > 0: o parse das páginas vai para um pool com esse número de processos
+# (scraper/parse_pool.py), para os três sites não disputarem o GIL; 0 faz o parse nas threads
+PARSE_WORKERS = 0
 
-def save_to_json(site_name, data):
-    """Salva o resultado do scraper em um arquivo JSON com timestamp."""
-    if not data:
-        print(f"Nenhum dado coletado para {site_name}.")
-        return
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"publicacoes_{site_name}_{timestamp}.json"
-
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-
-    print(f"Arquivo salvo: {filename} ({len(data)} registros)")
+high_water_marks = HighWaterMarkStore()
+checkpoints = CheckpointStore()
 
 async def run_scraper_with_retry(site_name, scraper_func, cutoff_date):
-    """Executa um scraper com até 3 tentativas em caso de falha."""
+    """
+    Executa um scraper com até 3 tentativas em caso de falha.
+
+    Falhas transitórias de rede já são repetidas por requisição, com backoff
+    (BaseScraper.get_html_content); a coleta só falha quando elas persistem.
+    Nesse caso o checkpoint do site (última página concluída e itens até ela)
+    faz a tentativa seguinte, ou a próxima execução com a mesma data,
+    recomeçar da página seguinte em vez da página 1.
+
+    A coleta é incremental: para ao alcançar publicações já vistas em
+    execuções anteriores (marca d'água por site). Cada página coletada é
+    gravada no banco SQLite em uma única transação, que também acrescenta as
+    publicações ao índice de busca (GET /search). Páginas, itens,
+    novas tentativas e o resultado final são contabilizados em scraper.metrics.
+    """
+    publication_store = get_publication_store()
+    checkpoint_key = cutoff_date.strftime(DATE_FORMAT)
+
+    def crawl(checkpoint):
+        """Consome o gerador a partir do checkpoint, salvando o progresso a cada página."""
+        state = checkpoint or {"next_page": 1, "items": 0, "newest": []}
+        next_page, total, newest = state["next_page"], state["items"], list(state["newest"])
+
+        def save_page(publications):
+            nonlocal next_page, total
+            publication_store.upsert_many(site_name, publications)
+            next_page += 1
+            total += len(publications)
+            # só o necessário para a marca d'água: as mais novas vêm primeiro
+            newest.extend(publications[:max(0, high_water_marks.recent_limit - len(newest))])
+            checkpoints.save(site_name, checkpoint_key, next_page, total, newest)
+
+        for _ in scraper_func(cutoff_date, known_urls=known_urls, on_page=save_page, start_page=next_page,
+                              discovery=USE_DISCOVERY):
+            pass
+        return total, newest
+
+    known_urls = high_water_marks.known_urls(site_name)
     for attempt in range(1, MAX_RETRIES + 1):
+        checkpoint = checkpoints.get(site_name, checkpoint_key)
         try:
-            print(f"Iniciando {site_name} (tentativa {attempt}/{MAX_RETRIES})...")
-            data = await asyncio.to_thread(scraper_func, cutoff_date)
-            print(f"{len(data)} publicações coletadas de {site_name}.")
-            save_to_json(site_name, data)
+            if checkpoint:
+                print(f"Retomando {site_name} da página {checkpoint['next_page']} "
+                      f"({checkpoint['items']} publicações já coletadas, tentativa {attempt}/{MAX_RETRIES})...")
+            else:
+                print(f"Iniciando {site_name} (tentativa {attempt}/{MAX_RETRIES}, {len(known_urls)} publicações conhecidas)...")
+            total, newest = await asyncio.to_thread(crawl, checkpoint)
+            print(f"{total} publicações novas coletadas de {site_name} ({publication_store.count(site_name)} no banco).")
+            high_water_marks.update(site_name, newest, detail_urls=get_spec(site_name).detail_parser is not None)
+            checkpoints.clear(site_name)
+            SCRAPER_RUNS.inc(site=site_name, outcome="success")
             return
         except Exception as e:
             print(f"Erro ao executar {site_name} (tentativa {attempt}): {e}")
             if attempt < MAX_RETRIES:
-                print("Tentando novamente em 5 segundos...")
-                await asyncio.sleep(5)
+                SCRAPER_RETRIES.inc(site=site_name)
+                print(f"Retomando do checkpoint em {RETRY_DELAY} segundos...")
+                await asyncio.sleep(RETRY_DELAY)
             else:
-                print(f"Falha definitiva ao coletar {site_name} após {MAX_RETRIES} tentativas.")
+                SCRAPER_RUNS.inc(site=site_name, outcome="failure")
+                print(f"Falha definitiva ao coletar {site_name} após {MAX_RETRIES} tentativas. "
+                      f"O checkpoint fica salvo para a próxima execução com a mesma data.")
 
 async def run_all_scrapers_async():
     """Executa todos os scrapers em paralelo."""
@@ -47,12 +91,10 @@ async def run_all_scrapers_async():
     today = datetime.strptime(today_str, DATE_FORMAT)
 
     print(f"Iniciando execução paralela ({today_str})")
+    if PARSE_WORKERS and get_parse_pool() is None:
+        configure_parse_pool(PARSE_WORKERS)
 
-    scrapers = [
-        ("diariodocomercio", scrape_diariodocomercio),
-        ("diariocomercial", scrape_diariocomercial),
-        ("agorarn", scrape_agorarn)
-    ]
+    scrapers = [(site_name, get_iterator(site_name)) for site_name in site_names()]
 
     tasks = [
         run_scraper_with_retry(site_name, scraper_func, today)
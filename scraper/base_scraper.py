@@ -1,39 +1,293 @@
-import urllib.request
-import urllib.error
+import requests
 from bs4 import BeautifulSoup
 import re
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
+from .http_client import get_http_client
+from .http_cache import get_http_cache
+from .rate_limiter import get_rate_limiter, parse_retry_after, MAX_RETRY_AFTER
+from .html_parsing import resolve_backend, parse_tree, element_string, xpath, has_class
+from .metrics import FETCH_DURATION, FETCH_BYTES, FETCH_RESPONSES, FETCH_RETRIES, CACHE_HITS, host_of
+from . import tracing
+
+EDITAL_LINKS_XPATH = xpath('//a[re:test(@href, "/edital-completo/", "i")]/@href')
+PDF_LINK_XPATH = xpath(r'//a[re:test(@href, "\.pdf$", "i")]')
+TEXT_LINK_PATTERN = re.compile(r'download|visualizar|pdf|edital completo', re.IGNORECASE)
+ALL_LINKS_XPATH = xpath('//a')
+PDFJS_IFRAME_XPATH = xpath(f'//iframe[{has_class("pdfjs-iframe")}]')
+
+MAX_FETCH_ATTEMPTS = 4
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+BACKOFF_BASE = 1.0  # segundos antes da primeira nova tentativa; dobra a cada falha
+BACKOFF_CAP = 30.0
+DEFAULT_PREFETCH_DEPTH = 2  # páginas de índice buscadas à frente da que está sendo processada
+
+_prefetch_depth = DEFAULT_PREFETCH_DEPTH
+
+
+class FetchError(Exception):
+    """Falha ao baixar uma página; `retryable` indica falha transitória (rede, 429, 5xx)."""
+
+    def __init__(self, message, status=None, retryable=False):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+
+
+def backoff_delay(attempt):
+    """Espera antes da nova tentativa `attempt` + 1: metade fixa, metade aleatória (jitter)."""
+    delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def get_prefetch_depth():
+    return _prefetch_depth
+
+
+def set_prefetch_depth(depth):
+    """Quantas páginas de índice buscar à frente (0 desliga: busca uma página por vez)."""
+    global _prefetch_depth
+    if depth < 0:
+        raise ValueError("A profundidade de prefetch não pode ser negativa.")
+    _prefetch_depth = depth
 
-REQUEST_TIMEOUT = 15
 
 class BaseScraper:
-    """Classe base para requisições HTTP e parsing genérico usando urllib/lxml."""
+    """Classe base para requisições HTTP e parsing genérico usando requests/lxml."""
 
     @staticmethod
-    def get_html_content(url):
+    def get_html_content(url, immutable=False, strict=False, cancel=None):
+        """
+        Baixa a página usando o cliente HTTP compartilhado (pool keep-alive).
+
+        Passa pelo cache em disco: entradas com ETag/Last-Modified são
+        revalidadas com GET condicional (304 reaproveita o corpo salvo) e
+        páginas marcadas como `immutable` são servidas sem ir à rede.
+        Só requisições reais passam pelo limitador por host (token bucket),
+        que recebe status e latência de cada resposta para se ajustar.
+        Latência, bytes e status de cada requisição vão para scraper.metrics
+        e, se houver um trace ativo, cada requisição vira um span "fetch".
+
+        Falhas transitórias (conexão, timeout, 429, 5xx) são repetidas com
+        backoff exponencial com jitter. Retorna None se a página não puder
+        ser obtida; com `strict=True`, uma falha transitória que persiste
+        após as novas tentativas levanta FetchError em vez de parecer o fim
+        da paginação. `cancel` (threading.Event) interrompe as novas
+        tentativas de uma busca cujo resultado não interessa mais (prefetch).
+        """
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            req = urllib.request.Request(url, headers=headers)
-            
-            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as response:
-                content = response.read()
-                charset = response.info().get_content_charset() or 'utf-8'
-                return content.decode(charset, errors='replace')
-
-        except urllib.error.HTTPError as e:
-            print(f"ERRO HTTP: {e.code} - {e.reason} ({url})")
-        except urllib.error.URLError as e:
-            print(f"ERRO de Conexão/Timeout: {e.reason} ({url})")
+            return BaseScraper._fetch(url, immutable, cancel)
+        except FetchError as e:
+            print(e)
+            if strict and e.retryable:
+                raise
         except Exception as e:
             print(f"ERRO inesperado: {e} ({url})")
-            
+
         return None
+
+    @staticmethod
+    def _fetch(url, immutable, cancel=None):
+        host = host_of(url)
+        cache = get_http_cache()
+        cached = cache.get(url) if cache else None
+        if cached and cached["immutable"]:
+            cache.record_hit()
+            CACHE_HITS.inc(host=host)
+            return cached["body"]
+
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        for attempt in range(1, MAX_FETCH_ATTEMPTS + 1):
+            retry_after = None
+            try:
+                response = BaseScraper._request(url, headers, host, cancel)
+                if response is None:
+                    return None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = FetchError(f"ERRO de Conexão/Timeout: {e} ({url})", retryable=True)
+            else:
+                if cached and response.status_code == 304:
+                    cache.record_hit(revalidated=True)
+                    return cached["body"]
+
+                if response.status_code < 400:
+                    body = get_http_client().decode_body(response)
+                    if cache:
+                        cache.record_miss()
+                        cache.put(
+                            url,
+                            body,
+                            etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified"),
+                            immutable=immutable,
+                        )
+                    return body
+
+                error = FetchError(
+                    f"ERRO HTTP: {response.status_code} - {response.reason} ({url})",
+                    status=response.status_code,
+                    retryable=response.status_code in RETRY_STATUSES,
+                )
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            if not error.retryable or attempt == MAX_FETCH_ATTEMPTS:
+                raise error
+            if cancel is not None and cancel.is_set():
+                return None
+
+            delay = max(backoff_delay(attempt), min(retry_after or 0.0, MAX_RETRY_AFTER))
+            FETCH_RETRIES.inc(host=host)
+            print(f"{error} - nova tentativa ({attempt + 1}/{MAX_FETCH_ATTEMPTS}) em {delay:.1f}s")
+            if tracing.sleep(delay, reason="retry_backoff", cancel=cancel):
+                return None
+
+    @staticmethod
+    def _request(url, headers, host, cancel=None):
+        """
+        Uma requisição: limitador por host, métricas e span de trace. Retorna
+        None sem ir à rede se `cancel` for disparado durante a espera pelo
+        limitador (prefetch descartado).
+        """
+        limiter = get_rate_limiter()
+        if limiter and not limiter.acquire(url, cancel):
+            return None
+        if cancel is not None and cancel.is_set():
+            if limiter:
+                limiter.bucket(url).refund()
+            return None
+
+        start = time.perf_counter()
+        with tracing.span("fetch", tracing.NETWORK, url=url) as span:
+            try:
+                response = get_http_client().get(url, headers=headers)
+            except (requests.ConnectionError, requests.Timeout):
+                FETCH_RESPONSES.inc(host=host, status="error")
+                span["status"] = "error"
+                raise
+            span["status"] = response.status_code
+
+        latency = time.perf_counter() - start
+        FETCH_DURATION.observe(latency, host=host)
+        if limiter:
+            limiter.observe(url, response.status_code, latency,
+                            parse_retry_after(response.headers.get("Retry-After")))
+        FETCH_RESPONSES.inc(host=host, status=response.status_code)
+        FETCH_BYTES.inc(len(response.content), host=host)
+        return response
     
     @staticmethod
-    def scrape_edital_links(page_html, url_base):
+    def seek_start_page(index_url_for, extract_dates, cutoff_date, max_pages):
+        """
+        Localiza a primeira página de índice com alguma publicação <= cutoff_date.
+
+        As listagens são ordenadas da mais nova para a mais antiga, então basta
+        galopar (1, 2, 4, 8...) até passar do ponto e fazer busca binária no
+        intervalo, em vez de percorrer todas as páginas desde a primeira.
+        Páginas vazias ou que falham contam como "depois do fim".
+
+        Retorna (página inicial, {página: html já baixado}) para que o crawl
+        reaproveite as páginas sondadas.
+        """
+        fetched = {}
+
+        def reached(page_num):
+            if page_num not in fetched:
+                print(f"Sondando página {page_num}...")
+                fetched[page_num] = BaseScraper.get_html_content(index_url_for(page_num))
+            page_html = fetched[page_num]
+            if not page_html:
+                return True
+            dates = extract_dates(page_html)
+            return not dates or min(dates) <= cutoff_date
+
+        if reached(1):
+            return 1, fetched
+
+        low, high = 1, 2
+        while high < max_pages and not reached(high):
+            low, high = high, high * 2
+        high = min(high, max_pages)
+
+        # invariante: reached(low) é falso; a resposta está em (low, high]
+        while high - low > 1:
+            middle = (low + high) // 2
+            if reached(middle):
+                high = middle
+            else:
+                low = middle
+
+        print(f"Página inicial encontrada: {high} ({len(fetched)} páginas sondadas).")
+        return high, fetched
+
+    @staticmethod
+    def iter_index_pages(index_url_for, start_page, max_pages, prefetched=None, depth=None):
+        """
+        Gera (página, url, html) das páginas de índice start_page..max_pages, em
+        ordem, buscando até `depth` páginas à frente (padrão: set_prefetch_depth)
+        enquanto a página atual é processada, de modo que a rede não fica parada
+        durante o parse. As buscas passam pelo limitador por host, então o
+        prefetch não ultrapassa o orçamento do site: só antecipa a fila.
+
+        As páginas são pedidas com `strict=True`; uma FetchError aparece ao
+        chegar na página que falhou. Quando o consumidor para antes do fim
+        (página vazia, data de corte, publicações conhecidas) e o gerador é
+        fechado, os prefetches ainda não iniciados são cancelados, os que
+        esperam pelo limitador desistem sem ir à rede e os que já estão em
+        andamento não fazem novas tentativas e têm o resultado descartado.
+        `prefetched` recebe as páginas já baixadas por seek_start_page.
+        """
+        depth = _prefetch_depth if depth is None else depth
+        prefetched = dict(prefetched or {})
+        cancel = threading.Event()
+
+        def fetch(page_num):
+            if cancel.is_set():
+                return None
+            return prefetched.pop(page_num, None) or BaseScraper.get_html_content(
+                index_url_for(page_num), strict=True, cancel=cancel)
+
+        if depth == 0:
+            for page_num in range(start_page, max_pages + 1):
+                yield page_num, index_url_for(page_num), fetch(page_num)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=depth + 1, thread_name_prefix="prefetch")
+        pending = deque()
+        next_page = start_page
+        try:
+            while True:
+                while next_page <= max_pages and len(pending) <= depth:
+                    pending.append((next_page, executor.submit(fetch, next_page)))
+                    next_page += 1
+                if not pending:
+                    return
+                page_num, future = pending.popleft()
+                yield page_num, index_url_for(page_num), future.result()
+        finally:
+            cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def is_page_older_than(dates, since):
+        """True quando todas as datas da página são anteriores a `since` (fim da janela)."""
+        return bool(since and dates and max(dates) < since)
+
+    @staticmethod
+    def scrape_edital_links(page_html, url_base, backend=None):
         """Extrai todos os links de edital ('/edital-completo/') de uma página de índice."""
+        if resolve_backend(backend) == "lxml":
+            return BaseScraper._scrape_edital_links_lxml(page_html, url_base)
+
         soup = BeautifulSoup(page_html, 'lxml')
         edital_links = []
         
@@ -47,12 +301,76 @@ class BaseScraper:
         return list(set(edital_links))
 
     @staticmethod
-    def scrape_pdf_link_and_title(edital_html, edital_url):
+    def _scrape_edital_links_lxml(page_html, url_base):
+        edital_links = []
+        for href in EDITAL_LINKS_XPATH(parse_tree(page_html)):
+            if href:
+                if href.startswith('/'):
+                    href = f"{url_base}{href}"
+                edital_links.append(str(href))
+
+        return list(set(edital_links))
+
+    @staticmethod
+    def scrape_pdf_link_and_title(edital_html, edital_url, backend=None):
         """
         Extrai Título e URL do PDF da página do edital.
         A data é extraída da URL do edital para montar o título legível.
         """
+        title = BaseScraper._edital_title(edital_url)
+        if resolve_backend(backend) == "lxml":
+            return title, BaseScraper._scrape_pdf_link_lxml(edital_html, edital_url)
+
         soup = BeautifulSoup(edital_html, 'lxml')
+        pdf_url = None
+        pdf_link_tag = soup.find('a', href=re.compile(r'\.pdf$', re.IGNORECASE))
+        
+        if not pdf_link_tag:
+             pdf_link_tag = soup.find('a', text=TEXT_LINK_PATTERN)
+        
+        if not pdf_link_tag:
+            iframe_tag = soup.find('iframe', class_='pdfjs-iframe')
+            if iframe_tag and iframe_tag.get('src'):
+                pdf_url = BaseScraper._pdf_url_from_iframe(iframe_tag['src'])
+                    
+        return title, BaseScraper._absolute_pdf_url(pdf_url, edital_url)
+
+    @staticmethod
+    def _scrape_pdf_link_lxml(edital_html, edital_url):
+        tree = parse_tree(edital_html)
+        pdf_url = None
+        pdf_link_tag = next(iter(PDF_LINK_XPATH(tree)), None)
+
+        if pdf_link_tag is None:
+            pdf_link_tag = next(
+                (a for a in ALL_LINKS_XPATH(tree) if TEXT_LINK_PATTERN.search(element_string(a) or "")),
+                None,
+            )
+
+        if pdf_link_tag is None:
+            iframe_tag = next(iter(PDFJS_IFRAME_XPATH(tree)), None)
+            if iframe_tag is not None and iframe_tag.get('src'):
+                pdf_url = BaseScraper._pdf_url_from_iframe(iframe_tag.get('src'))
+
+        return BaseScraper._absolute_pdf_url(pdf_url, edital_url)
+
+    @staticmethod
+    def _pdf_url_from_iframe(iframe_src):
+        """O visualizador pdf.js recebe o PDF no parâmetro 'file' da URL do iframe."""
+        query_params = parse_qs(urlparse(iframe_src).query)
+        if 'file' in query_params and query_params['file']:
+            return query_params['file'][0] # 'file' retorna uma lista
+        return None
+
+    @staticmethod
+    def _absolute_pdf_url(pdf_url, edital_url):
+        if pdf_url and not pdf_url.startswith('http'):
+            base_site_url = urlparse(edital_url).scheme + '://' + urlparse(edital_url).netloc
+            pdf_url = f"{base_site_url}{pdf_url}"
+        return pdf_url
+
+    @staticmethod
+    def _edital_title(edital_url):
         url_parts = edital_url.strip('/').split('/')
         date_segment = url_parts[-1] if url_parts else None
         
@@ -65,25 +383,5 @@ class BaseScraper:
             title = f"Edição {date_formatted}"
         else:
             title = date_formatted
+        return title
 
-        pdf_url = None
-        pdf_link_tag = soup.find('a', href=re.compile(r'\.pdf$', re.IGNORECASE))
-        
-        if not pdf_link_tag:
-             pdf_link_tag = soup.find('a', text=re.compile(r'download|visualizar|pdf|edital completo', re.IGNORECASE))
-        
-        if not pdf_link_tag:
-            iframe_tag = soup.find('iframe', class_='pdfjs-iframe')
-            if iframe_tag and iframe_tag.get('src'):
-                iframe_src = iframe_tag['src']
-                parsed_url = urlparse(iframe_src)
-                query_params = parse_qs(parsed_url.query)
-                
-                if 'file' in query_params and query_params['file']:
-                    pdf_url = query_params['file'][0] # 'file' retorna uma lista
-                    
-        if pdf_url and not pdf_url.startswith('http'):
-            base_site_url = urlparse(edital_url).scheme + '://' + urlparse(edital_url).netloc
-            pdf_url = f"{base_site_url}{pdf_url}"
-            
-        return title, pdf_url
\ No newline at end of file
@@ -0,0 +1,67 @@
+import threading
+from datetime import datetime
+
+from .state_file import load_state, save_state
+
+DEFAULT_CHECKPOINT_FILE = "crawl_checkpoints.json"
+RECENT_ITEMS_LIMIT = 500
+
+
+class CheckpointStore:
+    """
+    Guarda, por site, até onde a coleta em andamento chegou, para que uma
+    coleta interrompida (erro definitivo de rede, processo derrubado)
+    recomece da página seguinte em vez de voltar à página 1.
+
+    O checkpoint só vale para a mesma coleta (`key`, ex.: a data limite);
+    com outra chave ele é ignorado. É apagado quando a coleta termina bem.
+
+    Formato do arquivo:
+    {
+      "agorarn": {"key": "31/10/2025", "next_page": 151, "items": 2980,
+                  "newest": [{"date": "31/10/2025", "pdf_url": "https://...",
+                              "original_url": "https://..."}, ...],
+                  "updated_at": "2025-10-31T06:12:00"}
+    }
+    """
+
+    def __init__(self, path=DEFAULT_CHECKPOINT_FILE, recent_limit=RECENT_ITEMS_LIMIT):
+        self.path = path
+        self.recent_limit = recent_limit
+        self._lock = threading.Lock()
+
+    def _load(self):
+        return load_state(self.path, "Checkpoint de coleta")
+
+    def _save(self, state):
+        save_state(self.path, state)
+
+    def get(self, site, key):
+        """Checkpoint do site para a coleta `key`, ou None."""
+        with self._lock:
+            checkpoint = self._load().get(site)
+        if checkpoint and checkpoint.get("key") == key:
+            return checkpoint
+        return None
+
+    def save(self, site, key, next_page, items, newest):
+        """Registra a última página concluída (`next_page` - 1) e os itens coletados até ela."""
+        with self._lock:
+            state = self._load()
+            state[site] = {
+                "key": key,
+                "next_page": next_page,
+                "items": items,
+                "newest": [
+                    {"date": pub["date"], "pdf_url": pub["pdf_url"], "original_url": pub.get("original_url")}
+                    for pub in newest[:self.recent_limit]
+                ],
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._save(state)
+
+    def clear(self, site):
+        with self._lock:
+            state = self._load()
+            if state.pop(site, None) is not None:
+                self._save(state)
@@ -0,0 +1,247 @@
+"""
+Descoberta de publicações por endpoints estruturados do WordPress (REST de
+mídia, feed RSS, sitemap), mais baratos que paginar o HTML das listagens.
+
+Cada SiteSpec (scraper/engine.py) declara em `discovery_sources` os
+endpoints que tenta, em ordem, e em `entry_parser` como converter uma
+entrada em item da listagem. A primeira fonte cuja primeira
+página responde com entradas aproveitáveis é usada; se nenhuma responder,
+`open_discovery` retorna None e o motor segue pelas páginas HTML.
+
+As requisições passam por BaseScraper.get_html_content, então herdam o
+cache com GET condicional (If-Modified-Since/ETag), o limitador por host e
+as novas tentativas.
+"""
+import html
+import itertools
+import json
+import re
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode
+
+from lxml import etree
+
+from .base_scraper import BaseScraper
+
+DATE_FORMAT = "%d/%m/%Y"
+WP_MAX_PER_PAGE = 100  # limite do WordPress para per_page
+SITEMAP_CHUNK_SIZE = 50
+
+XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, recover=True)
+
+
+def _entry(url, date=None, title=None, link=None):
+    return {"url": url, "date": date, "title": title, "link": link or url}
+
+
+def _naive(dt):
+    """Remove o fuso mantendo o horário local do site (as datas dos índices HTML também são locais)."""
+    return dt.replace(tzinfo=None) if dt and dt.tzinfo else dt
+
+
+def _parse_xml(body):
+    if not body:
+        return None
+    try:
+        root = etree.fromstring(body.encode("utf-8"), XML_PARSER)
+    except (etree.XMLSyntaxError, ValueError):
+        return None
+    return root
+
+
+def _local(tag):
+    return etree.QName(tag).localname if isinstance(tag, str) else None
+
+
+def _child_text(element, name):
+    for child in element:
+        if _local(child.tag) == name:
+            return (child.text or "").strip()
+    return None
+
+
+class WpMediaSource:
+    """API REST do WordPress para anexos: /wp-json/wp/v2/media, já filtrada por tipo e janela de datas."""
+
+    name = "wp-json"
+
+    def __init__(self, path="/wp-json/wp/v2/media", mime_type="application/pdf", per_page=WP_MAX_PER_PAGE):
+        self.path = path
+        self.mime_type = mime_type
+        self.per_page = per_page
+
+    def page_url(self, base_url, page_num, cutoff_date, since):
+        params = {
+            "mime_type": self.mime_type,
+            "per_page": self.per_page,
+            "page": page_num,
+            "orderby": "date",
+            "order": "desc",
+            "_fields": "date,link,title,source_url",
+            # `before`/`after` são exclusivos: inclui o dia inteiro de cutoff_date e de since
+            "before": (cutoff_date + timedelta(days=1)).strftime("%Y-%m-%dT00:00:00"),
+        }
+        if since:
+            params["after"] = (since - timedelta(seconds=1)).strftime("%Y-%m-%dT%H:%M:%S")
+        return f"{base_url}{self.path}?{urlencode(params)}"
+
+    def pages(self, base_url, cutoff_date, since, start_page=1):
+        page_num = start_page
+        while True:
+            url = self.page_url(base_url, page_num, cutoff_date, since)
+            # além da última página o WordPress responde 400: fim normal da listagem
+            body = BaseScraper.get_html_content(url, strict=page_num > start_page)
+            try:
+                items = json.loads(body) if body else None
+            except ValueError:
+                items = None
+            if not isinstance(items, list) or not items:
+                return
+
+            entries = []
+            for item in items:
+                try:
+                    title = (item.get("title") or {}).get("rendered") or ""
+                    entries.append(_entry(
+                        item["source_url"],
+                        date=datetime.fromisoformat(item["date"]),
+                        title=html.unescape(title).strip() or None,
+                        link=item.get("link"),
+                    ))
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    continue
+            yield url, entries
+
+            if len(items) < self.per_page:
+                return
+            page_num += 1
+
+
+class RssSource:
+    """Feed RSS do WordPress (/feed/?paged=N); usa o enclosure em PDF quando houver, senão o link do item."""
+
+    name = "rss"
+
+    def __init__(self, path="/feed/"):
+        self.path = path
+
+    def pages(self, base_url, cutoff_date, since, start_page=1):
+        page_num = start_page
+        while True:
+            url = f"{base_url}{self.path}" + (f"?paged={page_num}" if page_num > 1 else "")
+            root = _parse_xml(BaseScraper.get_html_content(url, strict=page_num > start_page))
+            if root is None or _local(root.tag) != "rss":
+                return
+
+            entries = []
+            for item in root.iter("item"):
+                link = _child_text(item, "link")
+                enclosure = next((child.get("url") for child in item if _local(child.tag) == "enclosure"), None)
+                pub_date = _child_text(item, "pubDate")
+                try:
+                    date = _naive(parsedate_to_datetime(pub_date)) if pub_date else None
+                except (TypeError, ValueError):
+                    date = None
+                if enclosure or link:
+                    entries.append(_entry(enclosure or link, date=date, title=_child_text(item, "title"), link=link))
+            if not entries:
+                return
+            yield url, entries
+            page_num += 1
+
+
+class SitemapSource:
+    """
+    Sitemap do site (/sitemap_index.xml ou um urlset direto). Sitemaps não têm
+    ordem garantida: as URLs dos sitemaps filhos que casam com `include` são
+    reunidas, ordenadas da mais nova para a mais antiga e entregues em blocos.
+    """
+
+    name = "sitemap"
+
+    def __init__(self, path="/sitemap_index.xml", include=None, date_from_url=None, chunk_size=SITEMAP_CHUNK_SIZE):
+        self.path = path
+        self.include = re.compile(include) if include else None
+        self.date_from_url = date_from_url
+        self.chunk_size = chunk_size
+
+    def pages(self, base_url, cutoff_date, since, start_page=1):
+        url = f"{base_url}{self.path}"
+        root = _parse_xml(BaseScraper.get_html_content(url))
+        if root is None:
+            return
+
+        if _local(root.tag) == "sitemapindex":
+            entries = []
+            for sitemap in root:
+                loc = _child_text(sitemap, "loc")
+                if loc and (not self.include or self.include.search(loc)):
+                    entries.extend(self._urlset(_parse_xml(BaseScraper.get_html_content(loc, strict=True))))
+        elif _local(root.tag) == "urlset":
+            entries = self._urlset(root)
+        else:
+            return
+
+        window = [
+            entry for entry in entries
+            if entry["date"] is None or (
+                entry["date"].date() <= cutoff_date.date() and (not since or entry["date"].date() >= since.date()))
+        ]
+        window.sort(key=lambda entry: entry["date"] or datetime.min, reverse=True)
+
+        chunks = range((start_page - 1) * self.chunk_size, len(window), self.chunk_size)
+        for page_num, offset in enumerate(chunks, start=start_page):
+            yield f"{url}#{page_num}", window[offset:offset + self.chunk_size]
+
+    def _urlset(self, root):
+        entries = []
+        if root is None or _local(root.tag) != "urlset":
+            return entries
+        for url_element in root:
+            loc = _child_text(url_element, "loc")
+            if not loc:
+                continue
+            date = self.date_from_url(loc) if self.date_from_url else None
+            if date is None:
+                lastmod = _child_text(url_element, "lastmod")
+                try:
+                    date = _naive(datetime.fromisoformat(lastmod)) if lastmod else None
+                except ValueError:
+                    date = None
+            entries.append(_entry(loc, date=date))
+        return entries
+
+
+def open_discovery(sources, base_url, convert, cutoff_date, since=None, start_page=1):
+    """
+    Tenta as fontes em ordem e retorna um iterador de (url da página, itens
+    convertidos) da primeira que responder com itens aproveitáveis, ou None.
+    `convert(entrada)` devolve o item (registro, URL...) ou None para descartá-lo.
+    """
+    for source in sources:
+        pages = (
+            (page_url, [item for item in map(convert, entries) if item])
+            for page_url, entries in source.pages(base_url, cutoff_date, since, start_page)
+        )
+        first = next(pages, None)
+        if first and first[1]:
+            print(f"Descoberta via {source.name}: {first[0]}")
+            return itertools.chain([first], pages)
+        print(f"Endpoint {source.name} indisponível em {base_url}.")
+
+    print("Nenhum endpoint estruturado disponível; usando as páginas HTML.")
+    return None
+
+
+def pdf_publication_from_entry(entry):
+    """Entrada cujo alvo é um PDF datado -> registro {date, title, pdf_url, original_url}."""
+    if not entry["date"] or not entry["url"].lower().split("?")[0].endswith(".pdf"):
+        return None
+    return {
+        "date": entry["date"].strftime(DATE_FORMAT),
+        "title": entry["title"] or "Publicação Legal",
+        "pdf_url": entry["url"],
+        "original_url": entry["link"],
+    }
+
@@ -0,0 +1,234 @@
+"""
+Motor de coleta único para todos os sites.
+
+Cada site é descrito por um SiteSpec (URL das páginas de índice, parser da
+listagem, parser opcional da página de detalhe, ordem das datas, orçamento
+de requisições e endpoints de descoberta); `crawl` faz o resto em um único
+lugar: paginação com prefetch, seek, descoberta, janela de datas, parada
+incremental, filtro por título, detalhes em paralelo e instrumentação
+(métricas e trace vêm de get_html_content e run_parse).
+
+Adicionar um site é declarar um SiteSpec no módulo de integração dele e
+registrá-lo em scraper.registry.
+"""
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from . import tracing
+from .base_scraper import BaseScraper, get_prefetch_depth
+from .discovery import open_discovery
+from .metrics import record_page
+from .parse_pool import run_parse
+from .rate_limiter import get_rate_limiter
+from .title_filter import compile_filter
+
+DATE_FORMAT = "%d/%m/%Y"
+MAX_PAGES = 200  # proteção contra loop infinito
+MAX_DETAIL_WORKERS = 4
+WINDOWED_PREFETCH_DEPTH = 1  # teto do prefetch com since/known_urls, que costumam parar no meio do índice
+
+
+class SiteSpec:
+    """
+    Descrição declarativa de um site.
+
+    - `service`: classe *Service do site (BASE_URL).
+    - `index_path`: caminho da página de índice, com `{page_num}`.
+    - `list_parser(html, backend=None)`: itens da página de índice, cada um
+      com "date" (dd/mm/yyyy) e, conforme o site, "title" + "pdf_url" (item
+      completo) ou "detail_url" (título e PDF vêm da página de detalhe).
+    - `detail_parser(html, url, backend=None)`: (título, pdf_url) da página
+      de detalhe; páginas de detalhe são tratadas como imutáveis no cache.
+    - `newest_first`: listagem do mais novo para o mais antigo, o que permite
+      parar no fim da janela (`since`) e nas publicações já conhecidas.
+    - `budget`: HostBudget do domínio no limitador por host.
+    - `discovery_sources` / `entry_parser`: endpoints estruturados tentados
+      no modo discovery e a conversão de cada entrada em item da listagem.
+    """
+
+    def __init__(self, name, domain, service, index_path, list_parser, detail_parser=None, newest_first=True,
+                 budget=None, discovery_sources=(), entry_parser=None, max_pages=MAX_PAGES,
+                 detail_workers=MAX_DETAIL_WORKERS):
+        self.name = name
+        self.domain = domain
+        self.service = service
+        self.index_path = index_path
+        self.list_parser = list_parser
+        self.detail_parser = detail_parser
+        self.newest_first = newest_first
+        self.budget = budget
+        self.discovery_sources = discovery_sources
+        self.entry_parser = entry_parser
+        self.max_pages = max_pages
+        self.detail_workers = detail_workers
+
+    @property
+    def base_url(self):
+        # lido a cada uso: benchmarks e testes apontam o service para o servidor local
+        return self.service.BASE_URL
+
+    def index_url(self, page_num):
+        return f"{self.base_url}{self.index_path.format(page_num=page_num)}"
+
+    def parse_listing(self, page_html):
+        return run_parse(self.list_parser, page_html)
+
+    def page_dates(self, page_html):
+        """Datas (datetime) dos itens de uma página de índice."""
+        return [pub_date for pub_date, _ in _dated(self.parse_listing(page_html), quiet=True)]
+
+    def fetch_detail(self, detail_url):
+        """Baixa a página de detalhe (o limitador por host cuida do intervalo) e extrai (título, pdf_url)."""
+        with tracing.span("detail", tracing.CRAWL, url=detail_url):
+            # páginas de detalhe não mudam depois de publicadas: cache sem revalidação
+            detail_html = BaseScraper.get_html_content(detail_url, immutable=True)
+            if not detail_html:
+                print(f"Erro ao carregar página de detalhe: {detail_url}")
+                return None
+            return run_parse(self.detail_parser, detail_html, detail_url)
+
+
+def should_filter_title(title, filter_text):
+    """Retorna True se o título NÃO atende ao filtro (texto ou TitleFilter; ignora caixa e acentos)."""
+    title_filter = compile_filter(filter_text)
+    return bool(title_filter) and not title_filter.matches(title)
+
+
+def _dated(listings, quiet=False):
+    dated = []
+    for listing in listings:
+        try:
+            dated.append((datetime.strptime(listing["date"], DATE_FORMAT), listing))
+        except (KeyError, TypeError, ValueError):
+            if not quiet:
+                print(f"Data inválida: {listing.get('date')} ({listing.get('detail_url') or listing.get('pdf_url')})")
+    return dated
+
+
+def _index_pages(spec, cutoff_date, seek, start_page, depth=None):
+    """
+    Gera (url, itens) de cada página de índice HTML, até a primeira vazia ou
+    que falhe. `depth` é o prefetch (padrão: set_prefetch_depth).
+    """
+    page_num = start_page
+    prefetched = {}
+
+    if seek and start_page == 1:
+        page_num, prefetched = BaseScraper.seek_start_page(spec.index_url, spec.page_dates, cutoff_date, spec.max_pages)
+
+    # a página seguinte já vai sendo buscada enquanto esta é processada
+    for page_num, index_url, page_html in BaseScraper.iter_index_pages(
+            spec.index_url, page_num, spec.max_pages, prefetched, depth):
+        print(f"\nPágina: {index_url} - {spec.name}")
+
+        if not page_html:
+            print("Falha ao carregar página. Encerrando.")
+            return
+
+        listings = spec.parse_listing(page_html)
+        if not listings:
+            print("Nenhuma publicação encontrada nesta página. Encerrando.")
+            return
+
+        yield index_url, listings
+
+
+def crawl(spec, cutoff_date, filter_text=None, seek=False, since=None, known_urls=None, on_page=None, start_page=1,
+          discovery=False):
+    """
+    Coleta as publicações do site com data entre `since` (opcional) e
+    `cutoff_date`. Para assim que uma página inteira for anterior a `since`
+    ou, na coleta incremental, ao terminar a página onde aparece um pdf_url
+    (ou, nos sites com página de detalhe, a URL de detalhe) de `known_urls`.
+    `on_page`, se informado, recebe a lista coletada em cada página
+    processada, na ordem das páginas. `start_page` retoma uma coleta
+    interrompida. Com `discovery`, tenta antes os endpoints estruturados do
+    site e só pagina o HTML se nenhum responder. `filter_text` é um texto
+    buscado no título ou um TitleFilter (scraper.title_filter), compilado uma
+    vez para a coleta inteira.
+
+    É um gerador: as publicações de cada página são entregues assim que a
+    página termina, sem acumular a coleta inteira em memória.
+    """
+    title_filter = compile_filter(filter_text)
+    limiter = get_rate_limiter()
+    if limiter and spec.budget:
+        limiter.register_budget(spec.domain, spec.budget)
+
+    workers = ThreadPoolExecutor(max_workers=spec.detail_workers) if spec.detail_parser else contextlib.nullcontext()
+    with workers as executor:
+        pages = None
+        if discovery and spec.discovery_sources:
+            pages = open_discovery(spec.discovery_sources, spec.base_url, spec.entry_parser, cutoff_date, since,
+                                   start_page)
+        if pages is None:
+            # com since/known_urls a coleta costuma parar no meio do índice: o
+            # prefetch raso limita a no máximo uma página pedida além da última
+            # usada (e cancelada no fechamento), sem perder a sobreposição
+            depth = min(get_prefetch_depth(), WINDOWED_PREFETCH_DEPTH) if since or known_urls else None
+            pages = _index_pages(spec, cutoff_date, seek, start_page, depth)
+        yield from _collect(spec, pages, executor, cutoff_date, title_filter, since, known_urls, on_page)
+
+
+def _collect(spec, pages, executor, cutoff_date, title_filter, since, known_urls, on_page):
+    for page_url, listings in pages:
+        print(f"{len(listings)} publicações encontradas.")
+        dated = _dated(listings)
+
+        if spec.newest_first and BaseScraper.is_page_older_than([pub_date for pub_date, _ in dated], since):
+            print(f"Página inteira anterior a {since.strftime(DATE_FORMAT)}. Encerrando.")
+            break
+
+        candidates = [
+            listing for pub_date, listing in dated
+            if pub_date <= cutoff_date and not (since and pub_date < since)
+        ]
+
+        reached_known = False
+        if spec.detail_parser:
+            if known_urls:
+                # a URL de detalhe já identifica a publicação: as conhecidas nem são baixadas
+                fresh = [listing for listing in candidates if listing["detail_url"] not in known_urls]
+                reached_known = len(fresh) < len(candidates)
+                candidates = fresh
+            # executor.map preserva a ordem de entrada, então a saída continua determinística
+            details = executor.map(spec.fetch_detail, [listing["detail_url"] for listing in candidates])
+            publications = [
+                {"date": listing["date"], "title": detail[0], "pdf_url": detail[1],
+                 "original_url": listing["detail_url"]}
+                for listing, detail in zip(candidates, details) if detail
+            ]
+        else:
+            publications = candidates
+
+        page_items = []
+        for pub in publications:
+            if not pub["title"] or not pub["pdf_url"]:
+                continue
+
+            if known_urls and pub["pdf_url"] in known_urls:
+                reached_known = True
+                continue
+
+            if should_filter_title(pub["title"], title_filter):
+                print(f"Pulando '{pub['title']}' (não atende ao filtro '{title_filter}').")
+                continue
+
+            page_items.append({
+                "date": pub["date"],
+                "pdf_url": pub["pdf_url"],
+                "title": pub["title"],
+                "site": spec.domain,
+                "original_url": pub.get("original_url") or page_url,
+            })
+            print(f"Coletado: {pub['date']} - {pub['title']}")
+
+        record_page(spec.name, page_items)
+        if on_page:
+            on_page(page_items)
+        yield from page_items
+
+        if reached_known and spec.newest_first:
+            print("Publicações já conhecidas alcançadas. Encerrando.")
+            break
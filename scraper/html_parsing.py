@@ -0,0 +1,75 @@
+import threading
+
+from lxml import etree
+
+PARSER_BACKENDS = ("bs4", "lxml")
+DEFAULT_PARSER_BACKEND = "bs4"
+
+# EXSLT: re:test() usa o módulo `re` do Python, com a mesma semântica de re.search
+REGEX_NS = {"re": "http://exslt.org/regular-expressions"}
+
+_backend = DEFAULT_PARSER_BACKEND
+_local = threading.local()
+
+# get_text(strip=True) do BeautifulSoup ignora comentários e o conteúdo de script/style
+_TEXT_NODES = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+
+def get_parser_backend():
+    return _backend
+
+
+def set_parser_backend(backend):
+    """
+    Seleciona o parser das páginas: "bs4" (BeautifulSoup, padrão) ou "lxml"
+    (XPath pré-compilado, mesmo resultado com menos CPU por página).
+    """
+    global _backend
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Parser '{backend}' inválido. Use um de: {', '.join(PARSER_BACKENDS)}")
+    _backend = backend
+
+
+def resolve_backend(backend=None):
+    return backend or _backend
+
+
+def xpath(expression):
+    """Compila a expressão uma única vez (com suporte a re:test)."""
+    return etree.XPath(expression, namespaces=REGEX_NS)
+
+
+def has_class(name):
+    """Predicado XPath equivalente a class_="name" do BeautifulSoup (classe exata)."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+def parse_tree(page_html):
+    """Monta a árvore lxml da página (o mesmo parser usado pelo BeautifulSoup 'lxml')."""
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = etree.HTMLParser(encoding="utf-8")
+
+    data = page_html.encode("utf-8", errors="replace") if isinstance(page_html, str) else page_html
+    root = etree.fromstring(data, parser) if data.strip() else None
+    return root if root is not None else etree.Element("html")
+
+
+def element_text(element):
+    """Equivalente a tag.get_text(strip=True)."""
+    return "".join(text.strip() for text in _TEXT_NODES(element))
+
+
+def element_string(element):
+    """
+    Equivalente a tag.string: o texto do único filho (descendo por filhos
+    únicos), ou None quando o elemento tem mais de um filho.
+    """
+    if len(element) == 0:
+        return element.text
+    if len(element) == 1 and element.text is None and element[0].tail is None:
+        child = element[0]
+        if child.tag is etree.Comment:
+            return child.text
+        return element_string(child)
+    return None
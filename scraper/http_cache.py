@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = ".http_cache"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+class HttpCache:
+    """
+    Cache em disco das respostas HTTP, com validadores para GET condicional.
+
+    Cada URL vira um arquivo JSON com o corpo decodificado, ETag e
+    Last-Modified. Entradas marcadas como imutáveis (páginas de edital) são
+    servidas direto do disco, sem revalidação. Quando o tamanho total passa
+    de `max_bytes`, as entradas usadas há mais tempo são removidas (LRU).
+
+    A leitura abre direto o arquivo da URL; o índice de tamanhos usado pela
+    remoção LRU só é montado (uma varredura do diretório) na primeira
+    gravação, então abrir um cache grande não custa nada a quem só lê.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = None  # chave -> tamanho em bytes, do menos para o mais recente (ver _index)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _index(self):
+        """Índice LRU, montado a partir dos arquivos do diretório na primeira vez que é preciso."""
+        if self._entries is None:
+            files = []
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, entry.name[:-len(".json")], stat.st_size))
+            self._entries = OrderedDict((key, size) for _, key, size in sorted(files))
+            self._total_bytes = sum(self._entries.values())
+        return self._entries
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def get(self, url):
+        """Retorna a entrada em cache ({"body", "etag", "last_modified", "immutable"}) ou None."""
+        key = self._key(url)
+        with self._lock:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    entry = json.load(f)
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            self._touch(key)
+            return entry
+
+    def put(self, url, body, etag=None, last_modified=None, immutable=False):
+        """
+        Grava a resposta. Respostas mutáveis sem validadores não são guardadas,
+        e a entrada anterior da URL, se houver, é apagada: ela não vale mais.
+        """
+        key = self._key(url)
+        if not immutable and not (etag or last_modified):
+            with self._lock:
+                self._remove(key)
+            return
+
+        data = json.dumps({
+            "url": url,
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "immutable": immutable,
+        }, ensure_ascii=False).encode("utf-8")
+
+        with self._lock:
+            entries = self._index()
+            tmp_path = f"{self._path(key)}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+
+            self._total_bytes -= entries.pop(key, 0)
+            entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def record_hit(self, revalidated=False):
+        with self._lock:
+            if revalidated:
+                self.revalidated += 1
+            else:
+                self.hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._index()),
+                "bytes": self._total_bytes,
+            }
+
+    def _touch(self, key):
+        if self._entries is not None and key in self._entries:
+            self._entries.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _remove(self, key):
+        if self._entries is not None:
+            self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+
+_cache = None
+_cache_configured = False
+_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Retorna o cache compartilhado (criado no diretório padrão na primeira chamada) ou None se desativado."""
+    global _cache, _cache_configured
+    if not _cache_configured:
+        with _cache_lock:
+            if not _cache_configured:
+                _cache = HttpCache()
+                _cache_configured = True
+    return _cache
+
+
+def configure_http_cache(directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+    """Troca o diretório/limite do cache compartilhado ou o desativa (enabled=False)."""
+    global _cache, _cache_configured
+    with _cache_lock:
+        _cache = HttpCache(directory, max_bytes) if enabled else None
+        _cache_configured = True
+    return _cache
@@ -0,0 +1,85 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+REQUEST_TIMEOUT = 15
+DEFAULT_POOL_SIZE = 10
+MAX_HOST_POOLS = 10
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Anuncia apenas as codificações que o urllib3 consegue decodificar
+# (br só aparece quando o pacote Brotli está instalado).
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+class HttpClient:
+    """
+    Cliente HTTP compartilhado com pool de conexões keep-alive por host.
+
+    Reaproveita conexões TCP/TLS entre as páginas de índice e de edital,
+    evitando um novo handshake a cada requisição.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=REQUEST_TIMEOUT):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+
+        adapter = HTTPAdapter(pool_connections=MAX_HOST_POOLS, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, headers=None):
+        """Executa um GET reaproveitando o pool. Levanta requests.RequestException em falhas."""
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def close(self):
+        self.session.close()
+
+    @staticmethod
+    def decode_body(response):
+        """Decodifica o corpo usando o charset do Content-Type (utf-8 como padrão)."""
+        charset = HttpClient.get_charset(response.headers.get("Content-Type", "")) or "utf-8"
+        try:
+            return response.content.decode(charset, errors="replace")
+        except LookupError:
+            return response.content.decode("utf-8", errors="replace")
+
+    @staticmethod
+    def get_charset(content_type):
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "charset" and value.strip():
+                return value.strip().strip("\"'")
+        return None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Retorna o cliente HTTP compartilhado, criando-o na primeira chamada."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def configure_http_client(pool_size=DEFAULT_POOL_SIZE, timeout=REQUEST_TIMEOUT):
+    """Recria o cliente compartilhado com outro tamanho de pool/timeout."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HttpClient(pool_size=pool_size, timeout=timeout)
+    return _client
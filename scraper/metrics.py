@@ -0,0 +1,205 @@
+"""
+Métricas em memória (contadores e histogramas com labels) expostas pela API
+em /metrics no formato texto do Prometheus.
+
+Implementação mínima e sem dependências: cada métrica guarda seus valores
+por combinação de labels, protegidos por lock, porque fetch e parse rodam
+em várias threads (ThreadPoolExecutor dos editais, jobs e scheduler).
+"""
+import functools
+import inspect
+import threading
+import time
+from urllib.parse import urlparse
+
+from .html_parsing import resolve_backend
+from . import tracing
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} espera os labels {self.labelnames}, recebeu {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key in sorted(self._values):
+                lines.extend(self._render_sample(key, self._values[key]))
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["buckets"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    def count(self, **labels):
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state["count"] if state else 0
+
+    def _render_sample(self, key, state):
+        lines = []
+        cumulative = 0
+        for bound, hits in zip(self.buckets, state["buckets"]):
+            cumulative += hits
+            labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Todas as métricas no formato texto de exposição do Prometheus."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        for metric in self._metrics:
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+FETCH_DURATION = REGISTRY.histogram(
+    "scraper_fetch_duration_seconds", "Latência das requisições HTTP por host.", ["host"], LATENCY_BUCKETS)
+FETCH_BYTES = REGISTRY.counter(
+    "scraper_fetch_bytes_total", "Bytes de corpo baixados por host.", ["host"])
+FETCH_RESPONSES = REGISTRY.counter(
+    "scraper_fetch_responses_total", "Respostas HTTP por host e status ('error' para falhas de conexão).",
+    ["host", "status"])
+FETCH_RETRIES = REGISTRY.counter(
+    "scraper_fetch_retries_total", "Novas tentativas de requisição após falha transitória.", ["host"])
+CACHE_HITS = REGISTRY.counter(
+    "scraper_http_cache_hits_total", "Páginas servidas pelo cache em disco sem requisição.", ["host"])
+PARSE_DURATION = REGISTRY.histogram(
+    "scraper_parse_duration_seconds", "Tempo de parse por página.", ["site", "page", "backend"], PARSE_BUCKETS)
+PAGES_CRAWLED = REGISTRY.counter(
+    "scraper_pages_crawled_total", "Páginas de índice processadas.", ["site"])
+ITEMS_COLLECTED = REGISTRY.counter(
+    "scraper_items_collected_total", "Publicações coletadas.", ["site"])
+SCRAPER_RETRIES = REGISTRY.counter(
+    "scraper_retries_total", "Coletas retomadas do checkpoint após falha.", ["site"])
+SCRAPER_RUNS = REGISTRY.counter(
+    "scraper_runs_total", "Execuções de coleta por resultado (success/failure).", ["site", "outcome"])
+
+
+def host_of(url):
+    return urlparse(url).netloc or "desconhecido"
+
+
+def record_page(site, publications):
+    """Contabiliza uma página processada e as publicações coletadas nela."""
+    PAGES_CRAWLED.inc(site=site)
+    ITEMS_COLLECTED.inc(len(publications), site=site)
+
+
+def observe_parse(site, page):
+    """
+    Decorator para funções de parse com parâmetro `backend`: mede a duração
+    de cada chamada em scraper_parse_duration_seconds{site, page, backend}
+    e a registra como span "parse" no trace ativo.
+    """
+    def decorator(func):
+        backend_position = list(inspect.signature(func).parameters).index("backend")
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            backend = resolve_backend(
+                kwargs.get("backend", args[backend_position] if len(args) > backend_position else None))
+            start = time.perf_counter()
+            try:
+                with tracing.span("parse", tracing.CPU, site=site, page=page, backend=backend):
+                    return func(*args, **kwargs)
+            finally:
+                PARSE_DURATION.observe(time.perf_counter() - start, site=site, page=page, backend=backend)
+        wrapper.parse_labels = (site, page)  # usado por parse_pool.run_parse
+        return wrapper
+    return decorator
@@ -0,0 +1,102 @@
+"""
+Coleta de todos os sites ao mesmo tempo, com uma única saída (`main.py all`).
+
+Cada site roda na sua thread e entrega as publicações numa fila própria, na
+ordem em que o motor as coleta (da mais nova para a mais antiga). A thread
+principal faz o merge das filas por data com heapq.merge, que só guarda a
+publicação da frente de cada fila, e descarta pdf_url repetidos. Assim o
+tempo total é o do site mais lento, e não a soma dos três.
+
+As filas não têm limite: um site rápido nunca espera o merge, e o que fica
+acumulado é só o que ainda não pode sair porque um site mais lento não
+chegou àquela data.
+"""
+import heapq
+import queue
+import threading
+from datetime import datetime
+
+from .registry import site_names, get_iterator
+
+DATE_FORMAT = "%d/%m/%Y"
+
+_DONE = object()
+
+
+class _Failure:
+    """Erro de uma thread de site, repassado pela fila para a thread que faz o merge."""
+
+    def __init__(self, site, error):
+        self.site = site
+        self.error = error
+
+
+def _produce(site, results, out, stop):
+    try:
+        for publication in results:
+            if stop.is_set():
+                break
+            out.put(publication)
+    except Exception as e:
+        out.put(_Failure(site, e))
+    finally:
+        results.close()  # encerra o gerador do site: cancela os prefetches pendentes
+        out.put(_DONE)
+
+
+def _drain(out):
+    while True:
+        item = out.get()
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            print(f"Erro ao coletar {item.site}: {item.error}")
+            raise item.error
+        yield item
+
+
+def _date_key(publication):
+    return datetime.strptime(publication["date"], DATE_FORMAT)
+
+
+def merge_by_date(streams, stats=None):
+    """
+    Junta fluxos já ordenados da publicação mais nova para a mais antiga num
+    único fluxo na mesma ordem, sem repetir pdf_url. `stats`, se informado,
+    recebe o total de publicações e de duplicadas descartadas.
+    """
+    seen = set()
+    total = duplicates = 0
+    for publication in heapq.merge(*streams, key=_date_key, reverse=True):
+        if publication["pdf_url"] in seen:
+            duplicates += 1
+            continue
+        seen.add(publication["pdf_url"])
+        total += 1
+        yield publication
+    if stats is not None:
+        stats.update(total=total, duplicates=duplicates)
+
+
+def iter_all_sites(cutoff_date, filter_text=None, seek=False, since=None, discovery=False, sites=None, stats=None):
+    """
+    Coleta `sites` (padrão: todos os registrados) em paralelo e gera as
+    publicações de todos, da mais nova para a mais antiga, sem pdf_url
+    repetido. Se um site falhar, o erro é repassado a quem consome o gerador
+    e as coletas dos outros são interrompidas.
+    """
+    sites = sites or site_names()
+    stop = threading.Event()
+    queues = []
+    for site in sites:
+        out = queue.Queue()
+        results = get_iterator(site)(cutoff_date, filter_text=filter_text, seek=seek, since=since,
+                                     discovery=discovery)
+        threading.Thread(target=_produce, args=(site, results, out, stop), name=f"crawl-{site}",
+                         daemon=True).start()
+        queues.append(out)
+
+    try:
+        yield from merge_by_date([_drain(out) for out in queues], stats)
+    finally:
+        stop.set()
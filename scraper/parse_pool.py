@@ -0,0 +1,95 @@
+"""
+Parse das páginas em processos separados (ProcessPoolExecutor).
+
+O parse com BeautifulSoup é CPU puro; com os três sites coletando em threads
+(scheduler), o GIL faz as três filas de parse andarem uma de cada vez. Com o
+pool ligado, cada thread continua buscando as páginas e só o parse vai para
+um processo: o HTML segue como bytes UTF-8 e volta uma versão compacta dos
+registros (tuplas em vez de dicts), de modo que pouco é serializado entre
+processos.
+
+Desligado por padrão; `run_parse` chama a função de parse diretamente nesse
+caso, então as integrações usam sempre o mesmo caminho.
+"""
+import threading
+import time
+
+from . import tracing
+from .html_parsing import resolve_backend
+from .metrics import PARSE_DURATION
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _compact(result):
+    """Lista de dicts com as mesmas chaves -> ("rows", chaves, tuplas); o resto segue como está."""
+    if isinstance(result, list) and result and all(isinstance(item, dict) for item in result):
+        keys = tuple(result[0])
+        if all(tuple(item) == keys for item in result):
+            return ("rows", keys, [tuple(item.values()) for item in result])
+    return ("value", result)
+
+
+def _expand(compact):
+    if compact[0] == "rows":
+        _, keys, rows = compact
+        return [dict(zip(keys, row)) for row in rows]
+    return compact[1]
+
+
+def _parse_in_worker(func, page_bytes, args, backend):
+    """Executado no processo do pool: decodifica, faz o parse e devolve (registros compactos, segundos)."""
+    start = time.perf_counter()
+    result = func(page_bytes.decode("utf-8"), *args, backend=backend)
+    return _compact(result), time.perf_counter() - start
+
+
+def get_parse_pool():
+    return _pool
+
+
+def configure_parse_pool(workers=None, enabled=True):
+    """
+    Liga o pool com `workers` processos (padrão: um por núcleo) ou, com
+    enabled=False, desliga e volta ao parse na própria thread. Os processos
+    são criados com "spawn", seguro com as threads de fetch já rodando.
+    """
+    # importados aqui: multiprocessing só pesa no início quando o pool é usado
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+        if enabled:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def run_parse(func, page_html, *args):
+    """
+    Chama `func(page_html, *args)` (uma função de parse decorada com
+    metrics.observe_parse) no pool, se ligado, ou diretamente. A duração
+    do parse no processo do pool vai para as mesmas métricas e o trace
+    ganha um span "parse" com pool=True.
+    """
+    pool = _pool
+    if pool is None:
+        return func(page_html, *args)
+
+    from concurrent.futures.process import BrokenProcessPool
+
+    site, page = func.parse_labels
+    backend = resolve_backend()
+    try:
+        with tracing.span("parse", tracing.CPU, site=site, page=page, backend=backend, pool=True):
+            compact, elapsed = pool.submit(_parse_in_worker, func, page_html.encode("utf-8"), args, backend).result()
+    except BrokenProcessPool as e:
+        print(f"Pool de parse indisponível ({e}); fazendo o parse na thread atual.")
+        return func(page_html, *args)
+
+    PARSE_DURATION.observe(elapsed, site=site, page=page, backend=backend)
+    return _expand(compact)
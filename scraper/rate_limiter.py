@@ -0,0 +1,176 @@
+"""
+Limitador de requisições por host (token bucket) com ajuste AIMD.
+
+Substitui as pausas fixas das integrações: só quem vai de fato à rede
+espera (acertos do cache não consomem tokens), e o intervalo entre
+requisições ao mesmo host é garantido mesmo com várias threads.
+
+Cada host começa na taxa do seu orçamento (SiteSpec.budget de cada site,
+registrado no início da coleta, ou SITE_BUDGETS). Respostas 429/503
+ou uma latência bem acima da média recente cortam a taxa pela metade
+(decréscimo multiplicativo, respeitando Retry-After); cada resposta normal
+devolve um pouco da taxa (acréscimo aditivo), nunca acima do orçamento.
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+from . import tracing
+from .metrics import REGISTRY
+
+THROTTLE_STATUSES = (429, 503)
+DECREASE_FACTOR = 0.5
+INCREASE_STEP = 0.05  # requisições/s devolvidas a cada resposta normal
+LATENCY_FACTOR = 3.0  # latência > 3x a média recente conta como sobrecarga
+LATENCY_FLOOR = 1.0  # abaixo disso (segundos) a latência nunca é considerada alta
+LATENCY_ALPHA = 0.2  # peso da amostra nova na média móvel de latência
+MAX_RETRY_AFTER = 60.0
+
+RATE_DECREASES = REGISTRY.counter(
+    "scraper_rate_limit_decreases_total", "Reduções de taxa do limitador por host e motivo.", ["host", "reason"])
+
+
+class HostBudget:
+    """Orçamento de um site: `rate` requisições/s em regime e até `burst` seguidas."""
+
+    def __init__(self, rate, burst=1, min_rate=None):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate / 8
+
+
+# Orçamentos fixos por host além dos declarados nos SiteSpec (o orçamento de
+# cada site coletado fica no spec, em scraper/sites/<site>/<site>_integration.py).
+SITE_BUDGETS = {}
+DEFAULT_BUDGET = HostBudget(rate=1.0)
+
+
+def budget_key(url):
+    """Host sem porta e sem 'www.', usado para achar o orçamento do site."""
+    host = urlparse(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+class TokenBucket:
+    def __init__(self, budget):
+        self.budget = budget
+        self.rate = budget.rate
+        self.tokens = float(budget.burst)
+        self.latency_avg = None
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Reserva um token e retorna quantos segundos esperar por ele."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.budget.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def refund(self):
+        """Devolve o token de uma reserva desistida antes da requisição."""
+        with self._lock:
+            self.tokens = min(self.budget.burst, self.tokens + 1)
+
+    def observe(self, status, latency, retry_after=None):
+        """Ajusta a taxa a partir de uma resposta. Retorna o motivo da redução ou None."""
+        with self._lock:
+            reason = None
+            if status in THROTTLE_STATUSES:
+                reason = str(status)
+            elif self.latency_avg is not None and latency > max(LATENCY_FLOOR, LATENCY_FACTOR * self.latency_avg):
+                reason = "latency"
+
+            if latency is not None:
+                self.latency_avg = latency if self.latency_avg is None else (
+                    LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency_avg)
+
+            now = time.monotonic()
+            if reason is None:
+                self.rate = min(self.budget.rate, self.rate + INCREASE_STEP)
+                return None
+
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + min(retry_after, MAX_RETRY_AFTER))
+            # várias respostas ruins em sequência (threads em paralelo) contam como um único sinal
+            if now - self._last_decrease >= 1 / self.rate:
+                self.rate = max(self.budget.min_rate, self.rate * DECREASE_FACTOR)
+                self._last_decrease = now
+            return reason
+
+
+class RateLimiter:
+    """Um token bucket por host, com orçamento por site (`budgets` sobrepõe SITE_BUDGETS)."""
+
+    def __init__(self, budgets=None, default=DEFAULT_BUDGET):
+        self.budgets = {**SITE_BUDGETS, **(budgets or {})}
+        self.default = default
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        key = budget_key(url)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.budgets.get(key, self.default))
+            return bucket
+
+    def register_budget(self, key, budget):
+        """Orçamento de um site declarado no SiteSpec; não sobrepõe o que foi passado em `budgets`."""
+        with self._lock:
+            if key not in self.budgets:
+                self.budgets[key] = budget
+                self._buckets.pop(key, None)  # um bucket criado antes usava o orçamento padrão
+
+    def acquire(self, url, cancel=None):
+        """
+        Bloqueia até haver token para o host da URL. Com `cancel`
+        (threading.Event), desiste assim que o evento é disparado, devolve o
+        token e retorna False.
+        """
+        bucket = self.bucket(url)
+        if tracing.sleep(bucket.reserve(), reason="rate_limit", cancel=cancel):
+            bucket.refund()
+            return False
+        return True
+
+    def observe(self, url, status, latency, retry_after=None):
+        reason = self.bucket(url).observe(status, latency, retry_after)
+        if reason:
+            RATE_DECREASES.inc(host=budget_key(url), reason=reason)
+
+    def rates(self):
+        """Taxa atual (requisições/s) de cada host já visto."""
+        with self._lock:
+            return {key: round(bucket.rate, 3) for key, bucket in self._buckets.items()}
+
+
+def parse_retry_after(value):
+    """Retry-After em segundos (a forma com data HTTP é ignorada)."""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+_limiter = RateLimiter()
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Retorna o limitador compartilhado, ou None se desativado."""
+    return _limiter
+
+
+def configure_rate_limiter(budgets=None, default=DEFAULT_BUDGET, enabled=True):
+    """Ajusta orçamentos por site (dict host -> HostBudget) ou desativa o limitador (enabled=False)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = RateLimiter(budgets, default) if enabled else None
+    return _limiter
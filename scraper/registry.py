@@ -0,0 +1,39 @@
+"""
+Registro dos sites: nome -> módulo de integração, importado só quando o
+site é usado. Uma coleta de um único site pela CLI carrega apenas a
+integração (e o service) daquele site, não os outros nem Flask/scheduler.
+
+Cada módulo de integração expõe `iter_<site>` (gerador) e `scrape_<site>`
+(lista), com a mesma assinatura, e o SiteSpec do site em `SPEC`.
+"""
+import importlib
+
+# ordem em que o scheduler dispara as coletas
+SITES = {
+    "diariodocomercio": "scraper.sites.diariodocomercio.diariodocomercio_integration",
+    "diariocomercial": "scraper.sites.diariocomercial.diariocomercial_integration",
+    "agorarn": "scraper.sites.agorarn.agorarn_integration",
+}
+
+
+def site_names():
+    return list(SITES)
+
+
+def get_integration(site):
+    """Importa (na primeira chamada) e retorna o módulo de integração do site."""
+    if site not in SITES:
+        raise KeyError(f"Site '{site}' não reconhecido. Use um de: {', '.join(SITES)}")
+    return importlib.import_module(SITES[site])
+
+
+def get_iterator(site):
+    return getattr(get_integration(site), f"iter_{site}")
+
+
+def get_scraper(site):
+    return getattr(get_integration(site), f"scrape_{site}")
+
+
+def get_spec(site):
+    return get_integration(site).SPEC
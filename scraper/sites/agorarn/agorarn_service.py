@@ -1,21 +1,32 @@
 from datetime import datetime
 from bs4 import BeautifulSoup
 import re
-import unicodedata
+from ...html_parsing import resolve_backend, parse_tree, element_text, xpath, has_class
+from ...metrics import observe_parse
 
 DATE_FORMAT = "%d/%m/%Y"
 
+ROWS_XPATH = xpath(f'//div[@id="certificadas" and {has_class("row")}]')
+PDF_LINK_XPATH = xpath(r'.//a[re:test(@href, "\.pdf$", "i")]')
+COMPANY_XPATH = xpath('.//div[contains(@class, "strong")]')
+DESCRIPTION_XPATH = xpath('.//div[contains(@class, "col-md-5")]')
+DATE_XPATH = xpath('.//div[contains(@class, "text-center")]')
+
 class AgoraRNService:
     BASE_URL = "https://agorarn.com.br"
 
     @staticmethod
-    def parse_page_for_publications(page_html):
+    @observe_parse("agorarn", "index")
+    def parse_page_for_publications(page_html, backend=None):
         """
         Lê o HTML da página e retorna uma lista de publicações:
         [
           {"date": "11/10/2025", "title": "...", "pdf_url": "..."}
         ]
         """
+        if resolve_backend(backend) == "lxml":
+            return AgoraRNService._parse_page_lxml(page_html)
+
         soup = BeautifulSoup(page_html, "lxml")
         items = []
 
@@ -56,6 +67,43 @@ class AgoraRNService:
 
         return items
 
+    @staticmethod
+    def _parse_page_lxml(page_html):
+        """Mesmo resultado de parse_page_for_publications, com XPath pré-compilado."""
+        items = []
+
+        for row in ROWS_XPATH(parse_tree(page_html)):
+            link_tag = next(iter(PDF_LINK_XPATH(row)), None)
+            if link_tag is None:
+                continue
+
+            pdf_url = link_tag.get("href")
+
+            company_div = next(iter(COMPANY_XPATH(link_tag)), None)
+            company = element_text(company_div) if company_div is not None else "Publicação Legal"
+
+            desc_div = DESCRIPTION_XPATH(link_tag)
+            description = element_text(desc_div[0]) if desc_div else ""
+
+            date_div = next(iter(DATE_XPATH(link_tag)), None)
+            raw_date = element_text(date_div) if date_div is not None else None
+            if not raw_date:
+                continue
+
+            pub_date_str = AgoraRNService.normalize_date(raw_date)
+            if not pub_date_str:
+                continue
+
+            title = f"{company} - {description}" if description else company
+
+            items.append({
+                "date": pub_date_str,
+                "title": title,
+                "pdf_url": pdf_url
+            })
+
+        return items
+
     @staticmethod
     def normalize_date(raw_date):
         """Converte datas como '11/10/25' ou '11-10-2025' em DD/MM/YYYY."""
@@ -72,18 +120,3 @@ class AgoraRNService:
     def should_collect(pub_date, cutoff_date):
         """Retorna True se a publicação estiver dentro da data limite."""
         return pub_date <= cutoff_date
-
-    @staticmethod
-    def should_filter_title(title, filter_text):
-        """Retorna True se o título NÃO contém o texto buscado (case-insensitive, ignora acentos)."""
-        if not filter_text:
-            return False
-
-        def normalize(text):
-            nfkd = unicodedata.normalize("NFKD", text)
-            return "".join(c for c in nfkd if not unicodedata.combining(c)).lower()
-
-        title_norm = normalize(title)
-        filter_norm = normalize(filter_text)
-
-        return filter_norm not in title_norm
\ No newline at end of file
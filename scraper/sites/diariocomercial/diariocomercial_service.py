@@ -1,15 +1,25 @@
 from datetime import datetime
 from bs4 import BeautifulSoup
 import re
-import unicodedata
+from ...html_parsing import resolve_backend, parse_tree, element_text, xpath, has_class
+from ...metrics import observe_parse
 
 DATE_FORMAT = "%d/%m/%Y"
 
+BOXES_XPATH = xpath(f'//div[{has_class("publicidade_box_infos")}]')
+DATE_XPATH = xpath(f'.//span[{has_class("publicidade_data")}]')
+TITLE_XPATH = xpath('.//h2')
+PDF_LINK_XPATH = xpath(r'.//a[re:test(@href, "\.pdf$", "i")]')
+
 class DiarioComercialService:
     BASE_URL = "https://diariocomercial.com.br"
 
     @staticmethod
-    def parse_page_for_publications(page_html):
+    @observe_parse("diariocomercial", "index")
+    def parse_page_for_publications(page_html, backend=None):
+        if resolve_backend(backend) == "lxml":
+            return DiarioComercialService._parse_page_lxml(page_html)
+
         soup = BeautifulSoup(page_html, "lxml")
         items = []
         boxes = soup.find_all("div", class_="publicidade_box_infos")
@@ -38,6 +48,35 @@ class DiarioComercialService:
 
         return items
 
+    @staticmethod
+    def _parse_page_lxml(page_html):
+        """Mesmo resultado de parse_page_for_publications, com XPath pré-compilado."""
+        items = []
+
+        for box in BOXES_XPATH(parse_tree(page_html)):
+            date_tag = next(iter(DATE_XPATH(box)), None)
+            title_tag = next(iter(TITLE_XPATH(box)), None)
+            pdf_link_tag = next(iter(PDF_LINK_XPATH(box)), None)
+
+            if date_tag is None or pdf_link_tag is None:
+                continue
+
+            raw_date = element_text(date_tag)
+            pdf_url = pdf_link_tag.get("href")
+            title = element_text(title_tag) if title_tag is not None else "Publicação Legal"
+
+            pub_date_str = DiarioComercialService.normalize_date(raw_date)
+            if not pub_date_str:
+                continue
+
+            items.append({
+                "date": pub_date_str,
+                "title": title,
+                "pdf_url": pdf_url
+            })
+
+        return items
+
     @staticmethod
     def normalize_date(raw_date):
         meses = {
@@ -57,17 +96,3 @@ class DiarioComercialService:
     @staticmethod
     def should_collect(pub_date, cutoff_date):
         return pub_date <= cutoff_date
-
-    @staticmethod
-    def should_filter_title(title, filter_text):
-        if not filter_text:
-            return False
-
-        def normalize(text):
-            nfkd = unicodedata.normalize("NFKD", text)
-            return "".join(c for c in nfkd if not unicodedata.combining(c)).lower()
-
-        title_norm = normalize(title)
-        filter_norm = normalize(filter_text)
-
-        return filter_norm not in title_norm
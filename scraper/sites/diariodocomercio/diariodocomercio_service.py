@@ -1,7 +1,7 @@
 from ...base_scraper import BaseScraper
+from ...metrics import observe_parse
 from datetime import datetime
 import re
-import unicodedata
 
 DATE_FORMAT = "%d/%m/%Y"
 
@@ -12,19 +12,6 @@ class DiarioDoComercioService:
     def should_collect(pub_date, cutoff_date):
         return pub_date <= cutoff_date
 
-    @staticmethod
-    def should_filter_title(title, filter_text):
-        if not filter_text:
-            return False
-
-        def normalize(text):
-            nfkd = unicodedata.normalize("NFKD", text)
-            return "".join(c for c in nfkd if not unicodedata.combining(c)).lower()
-
-        title_norm = normalize(title)
-        filter_norm = normalize(filter_text)
-        return filter_norm not in title_norm
-
     @staticmethod
     def parse_publication_date_from_url(edital_url):
         url_parts = edital_url.strip('/').split('/')
@@ -36,5 +23,41 @@ class DiarioDoComercioService:
         return None, None
 
     @staticmethod
-    def extract_publication_data(edital_html, edital_url):
-        return BaseScraper.scrape_pdf_link_and_title(edital_html, edital_url)
+    def listing_from_edital_url(edital_url):
+        """
+        Item da listagem {date, detail_url} a partir da URL do edital. Sem data
+        na URL, "date" fica None: o motor avisa e descarta o item na coleta,
+        sem poluir a saída das sondagens do seek.
+        """
+        try:
+            _, pub_date_str = DiarioDoComercioService.parse_publication_date_from_url(edital_url)
+        except ValueError:
+            pub_date_str = None
+        return {"date": pub_date_str, "detail_url": edital_url}
+
+    @staticmethod
+    def listing_from_entry(entry):
+        """Entrada de descoberta (sitemap/feed) -> item da listagem, ou None se não for um edital."""
+        if "/edital-completo/" not in entry["url"]:
+            return None
+        return DiarioDoComercioService.listing_from_edital_url(entry["url"])
+
+    @staticmethod
+    @observe_parse("diariodocomercio", "index")
+    def parse_page_for_publications(page_html, backend=None):
+        """
+        Editais de uma página de índice, do mais novo para o mais antigo:
+        [{"date": "30/10/2025", "detail_url": "https://.../edital-completo/<slug>/30-10-2025/"}]
+        Título e PDF ficam na página de cada edital (extract_publication_data).
+        """
+        links = BaseScraper.scrape_edital_links(page_html, DiarioDoComercioService.BASE_URL, backend)
+        listings = list(map(DiarioDoComercioService.listing_from_edital_url, sorted(links, reverse=True)))
+        # itens sem data vão para o fim; o motor os descarta
+        listings.sort(key=lambda listing: datetime.strptime(listing["date"], DATE_FORMAT) if listing["date"]
+                      else datetime.min, reverse=True)
+        return listings
+
+    @staticmethod
+    @observe_parse("diariodocomercio", "edital")
+    def extract_publication_data(edital_html, edital_url, backend=None):
+        return BaseScraper.scrape_pdf_link_and_title(edital_html, edital_url, backend)
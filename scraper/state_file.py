@@ -0,0 +1,26 @@
+"""
+Arquivos JSON de estado da coleta (checkpoint, marca d'água): leitura
+tolerante a arquivo ausente ou corrompido e gravação atômica.
+"""
+import json
+import os
+
+
+def load_state(path, label):
+    """Conteúdo de `path`, ou {} se ele não existe ou está ilegível (avisando com `label`)."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"{label} ilegível ({path}): {e}. Recomeçando do zero.")
+        return {}
+
+
+def save_state(path, state):
+    """Grava `state` num arquivo temporário e o troca pelo original: quem lê nunca vê um arquivo pela metade."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
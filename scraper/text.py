@@ -0,0 +1,7 @@
+import unicodedata
+
+
+def normalize_text(text):
+    """Remove acentos e converte para minúsculas ('Balanço' -> 'balanco')."""
+    nfkd = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in nfkd if not unicodedata.combining(c)).lower()
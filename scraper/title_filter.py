@@ -0,0 +1,211 @@
+"""
+Filtro de títulos compartilhado pelos sites.
+
+O filtro é compilado uma vez por coleta: os termos são normalizados (sem
+acentos, minúsculos, como scraper.text.normalize_text) e reunidos num
+autômato de Aho-Corasick, que encontra todos os termos presentes num título
+em uma única passada, com o mesmo custo para um ou centenas de termos. A
+expressão booleana é avaliada sobre o conjunto de termos encontrados.
+
+Sintaxe de `parse_filter` (palavras-chave em maiúsculas):
+
+    balanço AND (assembleia OR edital) NOT errata
+    "ata da assembleia" OR convocação
+
+Termos ou frases entre aspas casam como substring do título, como o antigo
+`--filter-text`. Termos lado a lado valem AND; NOT tem precedência sobre
+AND, que tem precedência sobre OR.
+"""
+import functools
+import re
+from collections import deque
+
+from .text import normalize_text
+
+KEYWORDS = ("AND", "OR", "NOT")
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+
+
+class _Automaton:
+    """Autômato de Aho-Corasick sobre os termos normalizados."""
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [set()]
+        for index, term in enumerate(terms):
+            state = 0
+            for char in term:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(set())
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].add(index)
+
+        # links de falha em largura: o estado mais longo que é sufixo do atual
+        # (os filhos da raiz falham para a raiz)
+        pending = deque(self.goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, target in self.goto[state].items():
+                pending.append(target)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[target] = self.goto[fallback].get(char, 0)
+                self.output[target] |= self.output[self.fail[target]]
+
+    def find(self, text):
+        """Índices dos termos que aparecem em `text` (já normalizado)."""
+        found = set()
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+
+class _Parser:
+    def __init__(self, expression):
+        self.expression = expression
+        self.tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKEN.match(expression, position)
+            if not match:
+                raise ValueError(f"Filtro inválido: aspas sem fechamento em '{self.expression}'.")
+            open_paren, close_paren, phrase, word = match.groups()
+            if open_paren or close_paren:
+                self.tokens.append((open_paren or close_paren, None))
+            elif phrase is not None:
+                self.tokens.append(("term", phrase))
+            elif word in KEYWORDS:
+                self.tokens.append((word, None))
+            else:
+                self.tokens.append(("term", word))
+            position = match.end()
+        self.position = 0
+        self.terms = []
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self, kind):
+        if self.peek() != kind:
+            found = self.peek() or "fim da expressão"
+            raise ValueError(f"Filtro inválido: esperado '{kind}', encontrado '{found}' em '{self.expression}'.")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Filtro vazio.")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Filtro inválido: '{self.peek()}' inesperado em '{self.expression}'.")
+        return node
+
+    def parse_or(self):
+        nodes = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take("OR")
+            nodes.append(self.parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and(self):
+        nodes = [self.parse_unary()]
+        while self.peek() in ("AND", "NOT", "term", "("):
+            if self.peek() == "AND":
+                self.take("AND")
+            nodes.append(self.parse_unary())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_unary(self):
+        if self.peek() == "NOT":
+            self.take("NOT")
+            return ("not", self.parse_unary())
+        if self.peek() == "(":
+            self.take("(")
+            node = self.parse_or()
+            self.take(")")
+            return node
+        _, text = self.take("term")
+        return self.term(text)
+
+    def term(self, text):
+        term = normalize_text(text).strip()
+        if not term:
+            raise ValueError(f"Filtro inválido: termo vazio em '{self.expression}'.")
+        if term not in self.terms:
+            self.terms.append(term)
+        return ("term", self.terms.index(term))
+
+
+def _evaluate(node, found):
+    kind, value = node
+    if kind == "term":
+        return value in found
+    if kind == "not":
+        return not _evaluate(value, found)
+    if kind == "and":
+        return all(_evaluate(child, found) for child in value)
+    return any(_evaluate(child, found) for child in value)
+
+
+class TitleFilter:
+    """Filtro compilado: `matches(title)` diz se o título atende à expressão."""
+
+    def __init__(self, source, tree, terms):
+        self.source = source
+        self.tree = tree
+        self.terms = terms
+        self._automaton = _Automaton(terms)
+
+    def matches(self, title):
+        return _evaluate(self.tree, self._automaton.find(normalize_text(title or "")))
+
+    def __str__(self):
+        return self.source
+
+
+def parse_filter(expression):
+    """Compila uma expressão com AND/OR/NOT, parênteses e frases entre aspas. ValueError se inválida."""
+    parser = _Parser(expression)
+    tree = parser.parse()
+    return TitleFilter(expression, tree, parser.terms)
+
+
+def terms_filter(terms, source=None):
+    """Filtro que aceita o título que contenha qualquer um dos `terms` (ex.: uma lista de empresas)."""
+    normalized = list(dict.fromkeys(term for term in map(normalize_text, terms) if term))
+    if not normalized:
+        raise ValueError("Filtro vazio.")
+    tree = ("or", [("term", index) for index in range(len(normalized))])
+    return TitleFilter(source or f"{len(normalized)} termos", tree, normalized)
+
+
+@functools.lru_cache(maxsize=128)
+def _literal_filter(text):
+    return terms_filter([text], source=text)
+
+
+def compile_filter(filter_text):
+    """
+    TitleFilter para `filter_text`: um filtro já compilado passa direto; um
+    texto é a substring buscada, como no antigo `--filter-text`. None (ou
+    texto vazio) não filtra nada.
+    """
+    if not filter_text:
+        return None
+    if isinstance(filter_text, TitleFilter):
+        return filter_text
+    return _literal_filter(filter_text)
@@ -0,0 +1,170 @@
+"""
+Trace de uma coleta: linha do tempo com um span por fetch, parse, edital e
+pausa, para entender depois onde foi o tempo de uma execução específica.
+
+Diferente de scraper.metrics (agregados do processo inteiro), o trace só
+existe enquanto uma execução está ativa (`start_trace`/`stop_trace`); fora
+disso `span()` não registra nada e custa praticamente zero. O tracer é
+global, e não por contexto, para que as threads do pool de editais também
+registrem seus spans.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+NETWORK = "network"
+CPU = "cpu"
+SLEEP = "sleep"
+CRAWL = "crawl"  # spans de agrupamento (ex.: edital); não entram no resumo
+
+SUMMARY_CATEGORIES = (NETWORK, CPU, SLEEP)
+SUMMARY_LABELS = {NETWORK: "rede", CPU: "cpu", SLEEP: "sleep"}
+
+
+class Tracer:
+    def __init__(self):
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.duration = None  # definido por stop_trace
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def record(self, name, category, start, end, attrs):
+        span = {
+            "name": name,
+            "category": category,
+            "start": round(start - self.origin, 6),
+            "end": round(end - self.origin, 6),
+            "thread": threading.current_thread().name,
+        }
+        if attrs:
+            span["attrs"] = attrs
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self):
+        """
+        Divide o tempo de parede entre rede, CPU e pausas deliberadas.
+
+        `seconds` soma a duração dos spans (pode passar do tempo de parede
+        quando há threads em paralelo); `wall_seconds` conta o tempo em que
+        havia pelo menos um span da categoria ativo. `other_seconds` é o tempo
+        sem nenhum span de rede/CPU/pausa (escrita do arquivo, overhead).
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        wall = self.duration if self.duration is not None else max((span["end"] for span in spans), default=0.0)
+        categories = {}
+        for category in SUMMARY_CATEGORIES:
+            selected = [(span["start"], span["end"]) for span in spans if span["category"] == category]
+            categories[category] = {
+                "spans": len(selected),
+                "seconds": round(sum(end - start for start, end in selected), 4),
+                "wall_seconds": round(_union_length(selected), 4),
+            }
+
+        covered = _union_length([
+            (span["start"], span["end"]) for span in spans if span["category"] in SUMMARY_CATEGORIES
+        ])
+        return {
+            "wall_seconds": round(wall, 4),
+            "categories": categories,
+            "other_seconds": round(max(wall - covered, 0.0), 4),
+        }
+
+    def to_dict(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start"])
+        return {
+            "started_at": self.started_at,
+            "summary": self.summary(),
+            "spans": spans,
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def format_summary(self):
+        summary = self.summary()
+        wall = summary["wall_seconds"] or 1.0
+        lines = [f"Tempo total: {summary['wall_seconds']:.2f}s"]
+        for category in SUMMARY_CATEGORIES:
+            data = summary["categories"][category]
+            lines.append(
+                f"  {SUMMARY_LABELS[category]:<6} {data['wall_seconds']:8.2f}s "
+                f"({data['wall_seconds'] / wall:6.1%})  {data['spans']} spans, {data['seconds']:.2f}s somados"
+            )
+        lines.append(f"  {'outros':<6} {summary['other_seconds']:8.2f}s ({summary['other_seconds'] / wall:6.1%})")
+        return "\n".join(lines)
+
+
+def _union_length(intervals):
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+_active = None
+
+
+def start_trace():
+    """Ativa um novo trace para a execução corrente e o retorna."""
+    global _active
+    _active = Tracer()
+    return _active
+
+
+def stop_trace():
+    """Desativa o trace corrente e o retorna (None se não havia)."""
+    global _active
+    tracer, _active = _active, None
+    if tracer:
+        tracer.duration = time.perf_counter() - tracer.origin
+    return tracer
+
+
+@contextmanager
+def span(name, category, **attrs):
+    """
+    Registra um span no trace ativo. O dicionário `attrs` é entregue ao bloco,
+    que pode completá-lo (ex.: status da resposta) antes de o span fechar.
+    """
+    tracer = _active
+    if tracer is None:
+        yield attrs
+        return
+
+    start = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        tracer.record(name, category, start, time.perf_counter(), attrs)
+
+
+def sleep(seconds, reason, cancel=None):
+    """
+    time.sleep registrado no trace como pausa deliberada. Com `cancel`
+    (threading.Event), a pausa termina assim que o evento é disparado;
+    retorna True nesse caso.
+    """
+    if cancel is not None and cancel.is_set():
+        return True
+    if seconds <= 0:
+        return False
+    with span("sleep", SLEEP, reason=reason, seconds=seconds):
+        if cancel is not None:
+            return cancel.wait(seconds)
+        time.sleep(seconds)
+    return False
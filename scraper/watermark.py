@@ -0,0 +1,68 @@
+import threading
+
+from .state_file import load_state, save_state
+
+DEFAULT_STATE_FILE = "high_water_marks.json"
+RECENT_URLS_LIMIT = 500
+
+
+class HighWaterMarkStore:
+    """
+    Guarda, por site, os pdf_urls e, nos sites com página de detalhe, as URLs
+    de detalhe (original_url) das publicações recentes, para que a próxima
+    execução pare ao alcançar o que já conhece.
+
+    Formato do arquivo:
+    {
+      "diariodocomercio": {"recent_pdf_urls": ["https://...", ...],
+                           "recent_detail_urls": ["https://.../edital-completo/...", ...]}
+    }
+    """
+
+    def __init__(self, path=DEFAULT_STATE_FILE, recent_limit=RECENT_URLS_LIMIT):
+        self.path = path
+        self.recent_limit = recent_limit
+        self._lock = threading.Lock()
+
+    def _load(self):
+        return load_state(self.path, "Estado de coleta incremental")
+
+    def get(self, site):
+        with self._lock:
+            return self._load().get(site)
+
+    def known_urls(self, site):
+        """
+        pdf_urls e URLs de origem (página de detalhe) recentes do site, vazio
+        na primeira execução. Nos sites com página de detalhe, a URL de origem
+        permite parar antes de baixar o detalhe de uma publicação conhecida.
+        """
+        mark = self.get(site)
+        if not mark:
+            return set()
+        return set(mark.get("recent_pdf_urls", [])) | set(mark.get("recent_detail_urls", []))
+
+    def update(self, site, publications, detail_urls=True):
+        """
+        Incorpora as publicações recém-coletadas à marca do site. Com
+        `detail_urls` False (sites sem página de detalhe, em que original_url
+        é a página de índice e não identifica a publicação), só os pdf_urls
+        entram na marca.
+        """
+        if not publications:
+            return
+
+        with self._lock:
+            state = self._load()
+            mark = state.get(site) or {}
+            state[site] = {
+                "recent_pdf_urls": self._merge([pub["pdf_url"] for pub in publications],
+                                               mark.get("recent_pdf_urls", [])),
+                "recent_detail_urls": self._merge([pub.get("original_url") for pub in publications],
+                                                  mark.get("recent_detail_urls", [])) if detail_urls else [],
+            }
+            save_state(self.path, state)
+
+    def _merge(self, new_urls, old_urls):
+        """Mais recentes primeiro, sem repetição, até recent_limit."""
+        return list(dict.fromkeys(url for url in new_urls + old_urls if url))[:self.recent_limit]
@@ -0,0 +1,76 @@
+import csv
+import json
+from io import StringIO
+
+FIELDNAMES = ["date", "pdf_url", "title", "site", "original_url"]
+
+
+def write_json_stream(publications, f, indent=2):
+    """
+    Escreve uma lista JSON item a item, sem montar a lista em memória.
+    A saída é idêntica à de json.dump(lista, f, ensure_ascii=False, indent=indent).
+    """
+    count = 0
+    pad = " " * indent
+    for publication in publications:
+        item = json.dumps(publication, ensure_ascii=False, indent=indent)
+        f.write("[\n" if count == 0 else ",\n")
+        f.write(pad + item.replace("\n", "\n" + pad))
+        count += 1
+    f.write("\n]" if count else "[]")
+    return count
+
+
+def write_csv_stream(publications, f):
+    """Escreve o CSV linha a linha (cabeçalho fixo FIELDNAMES)."""
+    writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    count = 0
+    for publication in publications:
+        writer.writerow(publication)
+        count += 1
+    return count
+
+
+def write_ndjson_stream(publications, f):
+    """Escreve NDJSON: um objeto JSON por linha, gravado assim que chega."""
+    count = 0
+    for publication in publications:
+        f.write(json.dumps(publication, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def csv_chunks(publications, chunk_size=0):
+    """
+    Gera o CSV em pedaços para respostas em streaming. Com chunk_size=0 cada
+    linha sai imediatamente; caso contrário as linhas são agrupadas até
+    `chunk_size` caracteres.
+    """
+    buffer = StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    for publication in publications:
+        writer.writerow(publication)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(publications, chunk_size=0):
+    """Gera NDJSON (um objeto por linha) em pedaços, como `csv_chunks`."""
+    pending = []
+    pending_size = 0
+    for publication in publications:
+        line = json.dumps(publication, ensure_ascii=False) + "\n"
+        pending.append(line)
+        pending_size += len(line)
+        if pending_size >= chunk_size:
+            yield "".join(pending)
+            pending = []
+            pending_size = 0
+    if pending:
+        yield "".join(pending)
@@ -0,0 +1,278 @@
+import base64
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from scraper.text import normalize_text
+from . import search_index
+
+DATE_FORMAT = "%d/%m/%Y"
+DEFAULT_DB_PATH = "publicacoes.db"
+DEFAULT_PAGE_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publications (
+    id INTEGER PRIMARY KEY,
+    site TEXT NOT NULL,
+    site_domain TEXT NOT NULL,
+    date TEXT NOT NULL,
+    date_iso TEXT NOT NULL,
+    title TEXT NOT NULL,
+    title_norm TEXT NOT NULL,
+    pdf_url TEXT NOT NULL,
+    original_url TEXT,
+    collected_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_publications_pdf_url ON publications (pdf_url);
+CREATE INDEX IF NOT EXISTS idx_publications_site_date ON publications (site, date_iso);
+"""
+
+UPSERT_SQL = """
+INSERT INTO publications (site, site_domain, date, date_iso, title, title_norm, pdf_url, original_url, collected_at)
+VALUES (:site, :site_domain, :date, :date_iso, :title, :title_norm, :pdf_url, :original_url, :collected_at)
+ON CONFLICT (pdf_url) DO UPDATE SET
+    date = excluded.date,
+    date_iso = excluded.date_iso,
+    title = excluded.title,
+    title_norm = excluded.title_norm,
+    original_url = excluded.original_url
+"""
+
+JSON_DUMP_PATTERN = re.compile(r"publicacoes_([a-z]+)_\d{8}_\d{6}\.json$")
+
+
+class PublicationStore:
+    """
+    Armazena as publicações coletadas em SQLite (modo WAL).
+
+    `pdf_url` é único, então coletas repetidas não duplicam registros, e o
+    índice (site, date_iso) atende consultas por site e intervalo de datas.
+    Cada lote gravado também atualiza o índice invertido de `search`
+    (storage/search_index.py). Cada thread usa sua própria conexão.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            conn.executescript(search_index.SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _to_row(site, publication, collected_at):
+        return {
+            "site": site,
+            "site_domain": publication["site"],
+            "date": publication["date"],
+            "date_iso": datetime.strptime(publication["date"], DATE_FORMAT).strftime("%Y-%m-%d"),
+            "title": publication["title"],
+            "title_norm": normalize_text(publication["title"]),
+            "pdf_url": publication["pdf_url"],
+            "original_url": publication.get("original_url"),
+            "collected_at": collected_at,
+        }
+
+    @staticmethod
+    def _to_publication(row):
+        return {
+            "date": row["date"],
+            "pdf_url": row["pdf_url"],
+            "title": row["title"],
+            "site": row["site_domain"],
+            "original_url": row["original_url"],
+        }
+
+    def upsert_many(self, site, publications):
+        """Grava um lote (tipicamente uma página) e indexa seus termos, em uma única transação."""
+        if not publications:
+            return 0
+
+        collected_at = datetime.now().isoformat(timespec="seconds")
+        rows = [self._to_row(site, pub, collected_at) for pub in publications]
+        with self._connection() as conn:
+            conn.executemany(UPSERT_SQL, rows)
+            search_index.index_publications(conn, publications)
+        return len(rows)
+
+    def search(self, q, site=None, since=None, until=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Busca no índice invertido: publicações com algum termo de `q` (sem
+        acentos e sem caixa), da mais relevante para a menos relevante, cada
+        uma com seu `score`.
+        """
+        rows = search_index.search(self._connection(), q, site, since, until, limit)
+        return [{**self._to_publication(row), "score": round(row["score"], 4)} for row in rows]
+
+    def search_index_stats(self):
+        return search_index.index_stats(self._connection())
+
+    def query(self, site=None, since=None, until=None, q=None, limit=None, cursor=None):
+        """
+        Publicações (mais novas primeiro) filtradas por site, intervalo de
+        datas e texto do título (`q`, sem acentos e sem caixa).
+
+        A paginação é por chave (date_iso, id): `cursor` é o valor devolvido
+        como `next_cursor` por `query_page`.
+        """
+        rows = self._query_rows(site, since, until, q, limit, cursor)
+        return [self._to_publication(row) for row in rows]
+
+    def query_page(self, site=None, since=None, until=None, q=None, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """Como `query`, mas retorna (publicações, next_cursor); next_cursor é None na última página."""
+        rows = self._query_rows(site, since, until, q, limit + 1, cursor)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(rows[-1]["date_iso"], rows[-1]["id"])
+        return [self._to_publication(row) for row in rows], next_cursor
+
+    def next_cursor(self, site=None, since=None, until=None, q=None, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """
+        O `next_cursor` que `query_page` devolveria para a mesma página, lendo
+        só a chave das linhas `limit` e `limit` + 1 (None na última página).
+        Permite pôr o cursor no cabeçalho antes de transmitir a página.
+        """
+        sql, params = self._build_query(site, since, until, q, 2, cursor, columns="date_iso, id")
+        rows = self._connection().execute(f"{sql} OFFSET ?", params + [limit - 1]).fetchall()
+        if len(rows) < 2:
+            return None
+        return self.encode_cursor(rows[0]["date_iso"], rows[0]["id"])
+
+    def iter_query(self, site=None, since=None, until=None, q=None, limit=None, cursor=None, batch_size=500):
+        """Como `query`, mas gera as publicações lendo o cursor do SQLite em lotes."""
+        sql, params = self._build_query(site, since, until, q, limit, cursor)
+        result = self._connection().execute(sql, params)
+        while True:
+            rows = result.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield self._to_publication(row)
+
+    def _query_rows(self, site, since, until, q, limit, cursor):
+        sql, params = self._build_query(site, since, until, q, limit, cursor)
+        return self._connection().execute(sql, params).fetchall()
+
+    def _build_query(self, site, since, until, q, limit, cursor, columns="*"):
+        clauses, params = [], []
+        if site:
+            clauses.append("site = ?")
+            params.append(site)
+        if since:
+            clauses.append("date_iso >= ?")
+            params.append(since.strftime("%Y-%m-%d"))
+        if until:
+            clauses.append("date_iso <= ?")
+            params.append(until.strftime("%Y-%m-%d"))
+        if q:
+            clauses.append("title_norm LIKE ? ESCAPE '\\'")
+            params.append(f"%{self._escape_like(normalize_text(q))}%")
+        if cursor:
+            cursor_date, cursor_id = self.decode_cursor(cursor)
+            clauses.append("(date_iso < ? OR (date_iso = ? AND id < ?))")
+            params.extend([cursor_date, cursor_date, cursor_id])
+
+        sql = f"SELECT {columns} FROM publications"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY date_iso DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    @staticmethod
+    def _escape_like(text):
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def encode_cursor(date_iso, row_id):
+        return base64.urlsafe_b64encode(f"{date_iso}|{row_id}".encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Levanta ValueError se o cursor for inválido."""
+        try:
+            date_iso, row_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+            datetime.strptime(date_iso, "%Y-%m-%d")
+            return date_iso, int(row_id)
+        except (UnicodeError, ValueError, TypeError) as e:
+            raise ValueError(f"Cursor inválido: {cursor}") from e
+
+    def count(self, site=None):
+        if site:
+            return self._connection().execute("SELECT COUNT(*) FROM publications WHERE site = ?", (site,)).fetchone()[0]
+        return self._connection().execute("SELECT COUNT(*) FROM publications").fetchone()[0]
+
+    def import_json_dump(self, path):
+        """Importa um arquivo publicacoes_<site>_<timestamp>.json gerado pelo scheduler antigo."""
+        match = JSON_DUMP_PATTERN.search(os.path.basename(path))
+        if not match:
+            raise ValueError(f"Nome de arquivo não reconhecido: {path}")
+
+        with open(path, encoding="utf-8") as f:
+            publications = json.load(f)
+        return self.upsert_many(match.group(1), publications)
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_publication_store():
+    """Retorna o banco compartilhado, abrindo DEFAULT_DB_PATH na primeira chamada."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PublicationStore()
+    return _store
+
+
+def configure_publication_store(path=DEFAULT_DB_PATH):
+    """Aponta o banco compartilhado para outro arquivo."""
+    global _store
+    with _store_lock:
+        _store = PublicationStore(path)
+    return _store
+
+
+def main():
+    """
+    Importa os JSONs antigos do scheduler para o banco.
+
+    Uso:
+      python -m storage.publication_store publicacoes_*.json
+    """
+    if len(sys.argv) < 2:
+        print("Uso: python -m storage.publication_store publicacoes_<site>_<timestamp>.json [...]")
+        sys.exit(1)
+
+    store = get_publication_store()
+    for path in sys.argv[1:]:
+        total = store.import_json_dump(path)
+        print(f"{path}: {total} registros importados")
+    print(f"Total no banco: {store.count()} publicações")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Índice invertido das publicações, no mesmo banco SQLite do PublicationStore.
+
+Os termos de cada publicação (título e, quando o parser a expõe, descrição)
+são normalizados como no filtro de títulos: sem acentos e em minúsculas
+(scraper.text.normalize_text). search_postings guarda, por termo, as
+publicações em que ele aparece e quantas vezes; search_docs, o número de
+termos de cada publicação. O índice é atualizado na mesma transação do
+upsert, então cresce a cada página que o scheduler grava, e a busca ordena
+os resultados por BM25.
+"""
+import math
+import re
+import sqlite3
+from collections import Counter
+
+from scraper.text import normalize_text
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+SQL_CHUNK_SIZE = 500  # abaixo do limite de parâmetros por comando do SQLite
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS search_postings (
+    term_id INTEGER NOT NULL,
+    publication_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term_id, publication_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_search_postings_publication ON search_postings (publication_id);
+CREATE TABLE IF NOT EXISTS search_docs (
+    publication_id INTEGER PRIMARY KEY,
+    length INTEGER NOT NULL
+);
+"""
+
+INDEX_OBJECTS = ("search_terms", "search_postings", "idx_search_postings_publication", "search_docs")
+
+
+def tokenize(text):
+    """'Balanço Patrimonial 2024' -> ['balanco', 'patrimonial', '2024']."""
+    return TOKEN_PATTERN.findall(normalize_text(text or ""))
+
+
+def document_text(publication):
+    return " ".join(filter(None, [publication.get("title"), publication.get("description")]))
+
+
+def _chunks(items):
+    items = list(items)
+    for start in range(0, len(items), SQL_CHUNK_SIZE):
+        yield items[start:start + SQL_CHUNK_SIZE]
+
+
+def _term_ids(conn, terms):
+    ids = {}
+    for chunk in _chunks(terms):
+        placeholders = ", ".join("?" * len(chunk))
+        ids.update(conn.execute(f"SELECT term, id FROM search_terms WHERE term IN ({placeholders})", chunk).fetchall())
+    return ids
+
+
+def index_documents(conn, documents):
+    """
+    (Re)indexa `documents` ([(publication_id, texto)]) dentro da transação
+    aberta em `conn`. Uma publicação já indexada tem os termos antigos
+    substituídos, como no upsert.
+    """
+    documents = [(publication_id, Counter(tokenize(text))) for publication_id, text in documents]
+    if not documents:
+        return
+
+    conn.executemany("DELETE FROM search_postings WHERE publication_id = ?",
+                     [(publication_id,) for publication_id, _ in documents])
+    terms = {term for _, counts in documents for term in counts}
+    conn.executemany("INSERT OR IGNORE INTO search_terms (term) VALUES (?)", [(term,) for term in terms])
+    term_ids = _term_ids(conn, terms)
+
+    conn.executemany(
+        "INSERT INTO search_postings (term_id, publication_id, tf) VALUES (?, ?, ?)",
+        [(term_ids[term], publication_id, tf)
+         for publication_id, counts in documents for term, tf in counts.items()],
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO search_docs (publication_id, length) VALUES (?, ?)",
+        [(publication_id, sum(counts.values())) for publication_id, counts in documents],
+    )
+
+
+def index_publications(conn, publications):
+    """Indexa publicações recém-gravadas em `publications`, localizadas pelo pdf_url."""
+    texts = {publication["pdf_url"]: document_text(publication) for publication in publications}
+    ids = {}
+    for chunk in _chunks(texts):
+        placeholders = ", ".join("?" * len(chunk))
+        ids.update(conn.execute(
+            f"SELECT pdf_url, id FROM publications WHERE pdf_url IN ({placeholders})", chunk).fetchall())
+    index_documents(conn, [(ids[pdf_url], text) for pdf_url, text in texts.items()])
+
+
+def search(conn, q, site=None, since=None, until=None, limit=100):
+    """
+    Linhas de `publications` com algum termo de `q`, da mais relevante para
+    a menos relevante (BM25; empate pela data, mais nova primeiro), cada uma
+    com a coluna extra `score`.
+    """
+    terms = list(dict.fromkeys(tokenize(q)))
+    term_ids = _term_ids(conn, terms)
+    if not term_ids:
+        return []
+
+    total_docs, average_length = conn.execute("SELECT COUNT(*), AVG(length) FROM search_docs").fetchone()
+    ids = list(term_ids.values())
+    placeholders = ", ".join("?" * len(ids))
+    doc_freqs = dict(conn.execute(
+        f"SELECT term_id, COUNT(*) FROM search_postings WHERE term_id IN ({placeholders}) GROUP BY term_id", ids
+    ).fetchall())
+
+    query_params = []
+    for term_id in ids:
+        df = doc_freqs.get(term_id, 0)
+        query_params.extend([term_id, math.log(1 + (total_docs - df + 0.5) / (df + 0.5))])
+
+    clauses, params = [], []
+    if site:
+        clauses.append("p.site = ?")
+        params.append(site)
+    if since:
+        clauses.append("p.date_iso >= ?")
+        params.append(since.strftime("%Y-%m-%d"))
+    if until:
+        clauses.append("p.date_iso <= ?")
+        params.append(until.strftime("%Y-%m-%d"))
+
+    values = ", ".join(["(?, ?)"] * len(ids))
+    where = "WHERE " + " AND ".join(clauses) if clauses else ""
+    sql = f"""
+        WITH query (term_id, idf) AS (VALUES {values})
+        SELECT p.*, SUM(query.idf * sp.tf * ({BM25_K1} + 1)
+                        / (sp.tf + {BM25_K1} * (1 - {BM25_B} + {BM25_B} * d.length / ?))) AS score
+        FROM query
+        JOIN search_postings sp ON sp.term_id = query.term_id
+        JOIN search_docs d ON d.publication_id = sp.publication_id
+        JOIN publications p ON p.id = sp.publication_id
+        {where}
+        GROUP BY p.id
+        ORDER BY score DESC, p.date_iso DESC, p.id DESC
+        LIMIT ?
+    """
+    return conn.execute(sql, query_params + [average_length or 1] + params + [limit]).fetchall()
+
+
+def index_stats(conn):
+    """Documentos, termos, postings e bytes ocupados pelo índice (bytes é None sem a tabela dbstat)."""
+    stats = {
+        "documents": conn.execute("SELECT COUNT(*) FROM search_docs").fetchone()[0],
+        "terms": conn.execute("SELECT COUNT(*) FROM search_terms").fetchone()[0],
+        "postings": conn.execute("SELECT COUNT(*) FROM search_postings").fetchone()[0],
+    }
+    placeholders = ", ".join("?" * len(INDEX_OBJECTS))
+    try:
+        stats["bytes"] = conn.execute(
+            f"SELECT SUM(pgsize) FROM dbstat WHERE name IN ({placeholders})", INDEX_OBJECTS).fetchone()[0]
+    except sqlite3.OperationalError:
+        stats["bytes"] = None
+    return stats
@@ -0,0 +1,47 @@
+"""
+Apoio comum dos scripts de teste offline (python tests/test_<nome>.py).
+
+`check` imprime OK/FALHOU e encerra com código 1 na primeira falha;
+`serving` sobe o servidor local com as fixtures (benchmarks/site_server.py)
+e aponta os services para ele durante o bloco.
+"""
+import contextlib
+import io
+import sys
+
+from benchmarks.site_server import site_server
+from scraper.http_cache import configure_http_cache
+from scraper.rate_limiter import configure_rate_limiter
+
+
+def check(condition, message):
+    if not condition:
+        print(f"FALHOU: {message}")
+        sys.exit(1)
+    print(f"OK: {message}")
+
+
+def quietly(func, *args, **kwargs):
+    """Chama `func` sem as mensagens de progresso da coleta."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def offline():
+    """Sem cache em disco e sem limitador: só o servidor local responde, sem esperas."""
+    configure_http_cache(enabled=False)
+    configure_rate_limiter(enabled=False)
+
+
+@contextlib.contextmanager
+def serving(*services, pages=1, latency=0.0, discovery=None):
+    """Servidor local com as fixtures (e os endpoints de `discovery`), com `services` apontados para ele."""
+    base_urls = [service.BASE_URL for service in services]
+    with site_server(pages=pages, latency=latency, discovery=discovery) as server:
+        for service in services:
+            service.BASE_URL = server.base_url
+        try:
+            yield server
+        finally:
+            for service, base_url in zip(services, base_urls):
+                service.BASE_URL = base_url
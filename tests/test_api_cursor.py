@@ -0,0 +1,50 @@
+import base64
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from api import create_app
+from storage.publication_store import configure_publication_store
+from tests._support import check
+
+NEWEST = datetime(2025, 10, 31)
+COUNT = 25
+LIMIT = 10
+
+def b64(text):
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii")
+
+def main():
+    """Valida a paginação da API: next_cursor leva à página seguinte e cursor inválido responde 400."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = configure_publication_store(os.path.join(tmp, "publicacoes.db"))
+        store.upsert_many("agorarn", [
+            {"date": (NEWEST - timedelta(days=index // 3)).strftime("%d/%m/%Y"),
+             "pdf_url": f"https://agorarn.com.br/{index}.pdf", "title": f"Edital {index}",
+             "site": "agorarn.com.br", "original_url": None}
+            for index in range(COUNT)
+        ])
+        client = create_app().test_client()
+
+        seen, cursor = [], ""
+        while cursor is not None:
+            body = client.get(f"/agorarn?date=31/10/2025&limit={LIMIT}&cursor={cursor}").get_json()
+            seen.extend(pub["pdf_url"] for pub in body["results"])
+            cursor = body["next_cursor"]
+        check(len(seen) == len(set(seen)) == COUNT, "next_cursor percorre todas as publicações sem repetir")
+
+        bad_cursors = ["xyz", "%25%25%25", "%C3%A9", b64("sem-separador"), b64("2025-10-31|x"),
+                       b64("2025-10-31|1|2"), b64("não-é-data|5"), b64("31/10/2025|5")]
+        accepted = []
+        for bad in bad_cursors:
+            for output_format in ("json", "csv", "ndjson"):
+                response = client.get(f"/agorarn?date=31/10/2025&format={output_format}&cursor={bad}")
+                if response.status_code != 400 or "Cursor inválido" not in response.get_json()["error"]:
+                    accepted.append((bad, output_format, response.status_code))
+        check(not accepted, f"cursor inválido responde 400 em JSON, CSV e NDJSON ({accepted})")
+        store.close()
+
+    print("Cursor da API validado.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from scraper.rate_limiter import configure_rate_limiter
+from scraper.sites.agorarn.agorarn_integration import scrape_agorarn
+from scraper.sites.agorarn.agorarn_service import AgoraRNService
+from scraper.sites.diariocomercial.diariocomercial_integration import scrape_diariocomercial
+from scraper.sites.diariocomercial.diariocomercial_service import DiarioComercialService
+from scraper.sites.diariodocomercio.diariodocomercio_integration import scrape_diariodocomercio
+from scraper.sites.diariodocomercio.diariodocomercio_service import DiarioDoComercioService
+from tests._support import check, offline, quietly, serving
+
+CUTOFF_DATE = datetime(2025, 10, 31)
+SINCE = datetime(2025, 10, 25)
+
+def main():
+    """Valida a descoberta por API REST, feed e sitemap, e a volta ao HTML (sem acesso à rede)."""
+    offline()
+
+    with serving(AgoraRNService, discovery="agorarn") as server:
+        results = quietly(scrape_agorarn, CUTOFF_DATE, since=SINCE, discovery=True)
+        requests_made = server.requests
+    check([pub["date"] for pub in results] == ["31/10/2025", "30/10/2025", "29/10/2025"],
+          "API de mídia: PDFs dentro da janela, do mais novo ao mais antigo")
+    check(results[0]["title"] == "Cooperativa Agrícola de Mossoró – Balanço Patrimonial 2024",
+          "título da API com entidades HTML decodificadas")
+    check(results[0]["pdf_url"].startswith(server.base_url) and results[0]["site"] == "agorarn.com.br",
+          "registro no mesmo formato da coleta pelo HTML")
+    check(requests_made == 1, "uma única requisição à API substitui a paginação")
+
+    with serving(DiarioComercialService, discovery="diariocomercial"):
+        results = quietly(scrape_diariocomercial, CUTOFF_DATE, since=SINCE, discovery=True)
+        known = {results[1]["pdf_url"]}
+        incremental = quietly(scrape_diariocomercial, CUTOFF_DATE, known_urls=known, discovery=True)
+    check([pub["title"] for pub in results] == [
+        "Companhia Paulista de Saneamento – Ata da Assembleia Geral Ordinária",
+        "Metalúrgica Bandeirante S.A. – Balanço Patrimonial",
+        "Transportes Araguaia Ltda. – Edital de Convocação",
+    ], "feed RSS: sem API de mídia, usa os enclosures em PDF e ignora itens sem PDF")
+
+    check(incremental == [results[0], results[2]],
+          "coleta incremental por descoberta pula as conhecidas e encerra ao fim da página")
+
+    with serving(DiarioDoComercioService, discovery="diariodocomercio"):
+        results = quietly(scrape_diariodocomercio, CUTOFF_DATE, since=SINCE, discovery=True)
+    check([pub["date"] for pub in results] == ["31/10/2025", "30/10/2025", "29/10/2025"],
+          "sitemap: editais do sitemap filho ordenados pela data da URL")
+    check(all(pub["pdf_url"] and "/edital-completo/" in pub["original_url"] for pub in results),
+          "título e PDF continuam vindo da página de cada edital")
+
+    with serving(AgoraRNService) as server:
+        fallback = quietly(scrape_agorarn, CUTOFF_DATE, discovery=True)
+        html_only = quietly(scrape_agorarn, CUTOFF_DATE)
+    check(fallback and fallback == html_only, "sem endpoints estruturados, volta às páginas HTML")
+
+    configure_rate_limiter()
+    print("Descoberta validada.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import tempfile
+
+from benchmarks.local_server import StandInServer
+from scraper.base_scraper import BaseScraper
+from scraper.http_cache import HttpCache, configure_http_cache
+from scraper.rate_limiter import configure_rate_limiter
+from tests._support import check
+
+PAGE_SIZE = 20000
+
+def main():
+    """Valida o cache em disco contra o servidor local (sem acesso à rede)."""
+    configure_rate_limiter(enabled=False)
+    with tempfile.TemporaryDirectory() as cache_dir, StandInServer(validators=True) as server:
+        cache = configure_http_cache(cache_dir)
+        index_url = f"{server.base_url}/publicidade-legal/pagina/1/"
+        edital_url = f"{server.base_url}/edital-completo/empresa/31-10-2025/"
+
+        first = BaseScraper.get_html_content(index_url)
+        second = BaseScraper.get_html_content(index_url)
+        check(first == second, "corpo revalidado é igual ao original")
+        check(server.not_modified == 1, "segunda busca do índice volta 304")
+        check(cache.stats()["revalidated"] == 1, "contador de revalidações")
+
+        BaseScraper.get_html_content(edital_url, immutable=True)
+        requests_before = server.requests
+        BaseScraper.get_html_content(edital_url, immutable=True)
+        check(server.requests == requests_before, "edital imutável servido sem ir à rede")
+        check(cache.stats()["hits"] == 1, "contador de hits")
+
+        reopened = HttpCache(cache_dir)
+        check(reopened.get(edital_url) is not None and reopened._entries is None,
+              "cache reaberto lê entradas sem varrer o diretório")
+        check(reopened.stats()["entries"] == 2, "índice montado sob demanda com as entradas do disco")
+
+        server.httpd.validators = False
+        BaseScraper.get_html_content(index_url)
+        check(cache.get(index_url) is None, "resposta 200 sem validadores apaga a entrada antiga")
+        check(cache.stats()["entries"] == 1, "índice sem a entrada apagada")
+        server.httpd.validators = True
+
+        small_cache = configure_http_cache(cache_dir, max_bytes=PAGE_SIZE * 3)
+        for page_num in range(1, 6):
+            BaseScraper.get_html_content(f"{server.base_url}/page/{page_num}/")
+        stats = small_cache.stats()
+        check(stats["bytes"] <= PAGE_SIZE * 3, "limite de tamanho respeitado")
+        check(stats["evictions"] > 0, "entradas antigas removidas (LRU)")
+
+    configure_http_cache(enabled=False)
+    print("Cache HTTP validado.")
+
+if __name__ == "__main__":
+    main()
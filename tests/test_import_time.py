@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+from tests._support import check
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# nada disso deveria ser importado por uma coleta de um único site pela CLI
+HEAVY_MODULES = ["flask", "werkzeug", "jinja2", "schedule", "scheduler", "api", "storage.publication_store"]
+OTHER_SITES = ["scraper.sites.diariocomercial.diariocomercial_integration",
+               "scraper.sites.diariodocomercio.diariodocomercio_integration"]
+
+def import_times(code):
+    """
+    Roda `code` com -X importtime e retorna ({módulo: tempo acumulado em ms},
+    tempo total em ms, módulos carregados). importlib.import_module não aparece no relatório do
+    -X importtime, então a presença dos módulos vem de sys.modules.
+    """
+    code += "\nimport sys\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative) / 1000
+        if not module[1:].startswith(" "):  # só as raízes: o acumulado já inclui os filhos
+            total += int(cumulative) / 1000
+    return times, total, set(result.stdout.split())
+
+def main():
+    """Mede o custo de importação da CLI com -X importtime e confere que os imports são preguiçosos."""
+    startup, _, loaded = import_times("import main")
+    check(not [m for m in HEAVY_MODULES if m in loaded], "import main não carrega Flask, scheduler nem banco")
+    check("scraper.base_scraper" not in loaded and "requests" not in loaded,
+          "import main não carrega o cliente HTTP nem os parsers")
+
+    _, single_site_total, loaded = import_times(
+        "import main\n"
+        "from scraper.registry import get_iterator\n"
+        "get_iterator('agorarn')")
+    check("scraper.sites.agorarn.agorarn_integration" in loaded, "o registro importa o site pedido")
+    unexpected = [m for m in HEAVY_MODULES + OTHER_SITES if m in loaded]
+    check(not unexpected, f"coleta de um site não importa os outros sites nem a API ({unexpected})")
+
+    print(f"\nimport main: {startup['main']:.1f} ms")
+    print(f"import main + integração do agorarn (com requests, bs4 e lxml): {single_site_total:.1f} ms")
+    print("Imports validados.")
+
+if __name__ == "__main__":
+    main()
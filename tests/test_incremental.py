@@ -0,0 +1,50 @@
+import os
+import tempfile
+from datetime import datetime
+
+from benchmarks.site_server import fixture_paths, read_fixture
+from scraper.engine import WINDOWED_PREFETCH_DEPTH
+from scraper.sites.diariodocomercio.diariodocomercio_integration import scrape_diariodocomercio
+from scraper.sites.diariodocomercio.diariodocomercio_service import DiarioDoComercioService
+from scraper.watermark import HighWaterMarkStore
+from tests._support import check, offline, quietly, serving
+
+CUTOFF_DATE = datetime(2025, 10, 31)
+NEW_ITEMS = 3
+
+def main():
+    """Valida a coleta incremental: marca d'água por site e parada antes de baixar detalhes já conhecidos."""
+    offline()
+    with tempfile.TemporaryDirectory() as state_dir, serving(DiarioDoComercioService, pages=2) as server:
+        by_page = []
+        quietly(scrape_diariodocomercio, CUTOFF_DATE, on_page=by_page.append)
+        first_page = by_page[0]
+
+        marks = HighWaterMarkStore(os.path.join(state_dir, "marcas.json"))
+        marks.update("diariodocomercio", first_page[NEW_ITEMS:])
+        # as fixtures repetem poucos PDFs entre os editais: a parada aqui vem só das URLs de detalhe
+        known_urls = {pub["original_url"] for pub in first_page[NEW_ITEMS:]}
+        check(known_urls <= HighWaterMarkStore(marks.path).known_urls("diariodocomercio"),
+              "marca d'água guarda as URLs de detalhe, além dos pdf_urls")
+
+        server.reset_stats()
+        incremental = quietly(scrape_diariodocomercio, CUTOFF_DATE, known_urls=known_urls)
+        check(incremental == first_page[:NEW_ITEMS], "só as publicações novas, parando na página da primeira conhecida")
+        # editais sem PDF não entram na marca e continuam sendo conferidos
+        listed = [listing for listing in DiarioDoComercioService.parse_page_for_publications(
+            read_fixture(fixture_paths("diariodocomercio")[0])) if listing["date"]]
+        expected_requests = 1 + len(listed) - len(known_urls)
+        check(expected_requests <= server.requests <= expected_requests + WINDOWED_PREFETCH_DEPTH,
+              f"uma página de índice (mais o prefetch) e nenhum detalhe já conhecido ({server.requests} requisições)")
+
+        marks.update("diariodocomercio", incremental)
+        mark = marks.get("diariodocomercio")
+        check(mark["recent_detail_urls"][:NEW_ITEMS] == [pub["original_url"] for pub in incremental],
+              "publicações recém-coletadas no início da marca")
+        check(len(mark["recent_detail_urls"]) == len(set(mark["recent_detail_urls"])) == len(first_page),
+              "marca sem URLs repetidas")
+
+    print("Coleta incremental validada.")
+
+if __name__ == "__main__":
+    main()
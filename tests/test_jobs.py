@@ -0,0 +1,69 @@
+import os
+import tempfile
+import time
+
+from api import create_app
+from api.jobs import job_manager
+from scraper.base_scraper import DEFAULT_PREFETCH_DEPTH, set_prefetch_depth
+from scraper.sites.agorarn.agorarn_service import AgoraRNService
+from storage.publication_store import configure_publication_store
+from tests._support import check, offline, quietly, serving
+
+PAGES = 3
+LATENCY = 0.1  # a coleta dura o bastante para o segundo pedido chegar com ela em andamento
+TTL = 0.5
+JOB = {"site": "agorarn", "date": "31/10/2025"}
+
+def wait_done(client, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        body = client.get(f"/jobs/{job_id}").get_json()
+        if body["status"] in ("done", "failed"):
+            return body
+        time.sleep(0.05)
+    return body
+
+def main():
+    """Valida POST /jobs: parâmetros inválidos, singleflight e expiração do resultado (JOB_RESULT_TTL)."""
+    offline()
+    set_prefetch_depth(0)  # uma requisição por página: a contagem do servidor mostra quantas coletas houve
+    with tempfile.TemporaryDirectory() as tmp:
+        store = configure_publication_store(os.path.join(tmp, "publicacoes.db"))
+        client = create_app().test_client()
+
+        rejected = [body for body in ([], "x", 123, {"site": "agorarn", "date": 123},
+                                      {"site": "agorarn", "date": "31/10/2025", "since": ["01/10/2025"]},
+                                      {"site": ["agorarn"], "date": "31/10/2025"},
+                                      {"site": "agorarn", "date": "2025-10-31"})
+                    if client.post("/jobs", json=body).status_code != 400]
+        check(not rejected, f"corpo que não é objeto ou campos que não são texto respondem 400 ({rejected})")
+
+        job_manager.ttl = TTL
+        with serving(AgoraRNService, pages=PAGES, latency=LATENCY) as server:
+            first = client.post("/jobs", json=JOB)
+            second = client.post("/jobs", json=JOB)
+            job_id = first.get_json()["job_id"]
+            check(first.status_code == 202 and second.status_code == 200, "202 para o job novo, 200 para o reaproveitado")
+            check(second.get_json()["job_id"] == job_id, "pedido idêntico em andamento se anexa ao mesmo job")
+
+            done = quietly(wait_done, client, job_id)
+            check(done["status"] == "done" and done["results"], "job concluído com o resultado")
+            check(server.requests == PAGES + 1, f"uma única coleta para os dois pedidos ({server.requests} requisições)")
+            check(store.count() == len(done["results"]), "páginas gravadas no banco durante a coleta")
+
+            reused = client.post("/jobs", json=JOB)
+            check(reused.status_code == 200 and reused.get_json()["job_id"] == job_id,
+                  "resultado concluído reaproveitado dentro do TTL")
+
+            time.sleep(TTL * 2)
+            check(client.get(f"/jobs/{job_id}").status_code == 404, "job expirado some depois do TTL")
+            fresh = client.post("/jobs", json=JOB)
+            check(fresh.status_code == 202 and fresh.get_json()["job_id"] != job_id, "depois do TTL, nova coleta")
+            quietly(wait_done, client, fresh.get_json()["job_id"])
+
+        store.close()
+    set_prefetch_depth(DEFAULT_PREFETCH_DEPTH)
+    print("Jobs validados.")
+
+if __name__ == "__main__":
+    main()
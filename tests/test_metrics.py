@@ -0,0 +1,81 @@
+import re
+from datetime import datetime
+
+from api import create_app
+from scraper.metrics import (
+    CONTENT_TYPE, FETCH_DURATION, ITEMS_COLLECTED, PAGES_CRAWLED, REGISTRY, MetricsRegistry, host_of,
+)
+from scraper.sites.diariocomercial.diariocomercial_integration import scrape_diariocomercial
+from scraper.sites.diariocomercial.diariocomercial_service import DiarioComercialService
+from tests._support import check, offline, quietly, serving
+
+CUTOFF_DATE = datetime(2025, 10, 31)
+PAGES = 3
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_][a-zA-Z0-9_]*="(\\.|[^"\\])*"'
+                    r'(,[a-zA-Z_][a-zA-Z0-9_]*="(\\.|[^"\\])*")*\})? \S+$')
+
+def exposition_errors(text):
+    """Linhas que não seguem o formato texto do Prometheus (HELP/TYPE antes das amostras de cada métrica)."""
+    errors, typed = [], set()
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ", 3)
+            if kind not in ("counter", "histogram"):
+                errors.append(line)
+            typed.add(name)
+            continue
+        name = re.split(r"[{ ]", line, 1)[0]
+        family = re.sub(r"_(bucket|sum|count)$", "", name)
+        if not SAMPLE.match(line) or (name not in typed and family not in typed):
+            errors.append(line)
+    return errors
+
+def main():
+    """Valida o /metrics: formato de exposição, histogramas cumulativos e contagem de páginas da coleta."""
+    offline()
+    registry = MetricsRegistry()
+    counter = registry.counter("teste_total", "Contador de teste.", ["site"])
+    histogram = registry.histogram("teste_seconds", "Histograma de teste.", ["site"], buckets=(0.1, 1.0))
+    counter.inc(site='aspas " e \\ barra\nquebra')
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, site="a")
+    text = registry.render()
+    check(exposition_errors(text) == [], "todas as linhas no formato de exposição")
+    check('teste_total{site="aspas \\" e \\\\ barra\\nquebra"} 1' in text, "valores de label escapados")
+    check('teste_seconds_bucket{site="a",le="0.1"} 1' in text and 'teste_seconds_bucket{site="a",le="1"} 3' in text
+          and 'teste_seconds_bucket{site="a",le="+Inf"} 4' in text, "buckets cumulativos, terminando em +Inf")
+    check('teste_seconds_sum{site="a"} 4.05' in text and 'teste_seconds_count{site="a"} 4' in text, "soma e contagem")
+    rejected = False
+    try:
+        counter.inc(host="x")
+    except ValueError:
+        rejected = True
+    check(rejected, "labels diferentes dos declarados rejeitados com ValueError")
+
+    REGISTRY.clear()
+    with serving(DiarioComercialService, pages=PAGES) as server:
+        pages = []
+        publications = quietly(scrape_diariocomercial, CUTOFF_DATE, on_page=pages.append)
+        host = host_of(server.base_url)
+        requests_made = server.requests
+    check(PAGES_CRAWLED.value(site="diariocomercial") == len(pages) == PAGES,
+          f"uma contagem por página de índice ({PAGES_CRAWLED.value(site='diariocomercial')})")
+    check(ITEMS_COLLECTED.value(site="diariocomercial") == len(publications), "publicações coletadas por site")
+    check(FETCH_DURATION.count(host=host) == requests_made, f"uma latência por requisição ({requests_made})")
+
+    response = create_app().test_client().get("/metrics")
+    body = response.get_data(as_text=True)
+    check(response.status_code == 200 and response.headers["Content-Type"] == CONTENT_TYPE,
+          "content type do formato texto do Prometheus")
+    check(exposition_errors(body) == [], "/metrics no formato de exposição")
+    check(f'scraper_pages_crawled_total{{site="diariocomercial"}} {PAGES}' in body
+          and f'scraper_fetch_duration_seconds_count{{host="{host}"}} {requests_made}' in body,
+          "contadores e histogramas da coleta expostos")
+    REGISTRY.clear()
+
+    print("Métricas validadas.")
+
+if __name__ == "__main__":
+    main()
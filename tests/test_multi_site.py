@@ -0,0 +1,51 @@
+import time
+from datetime import datetime
+
+from scraper.multi_site import iter_all_sites, merge_by_date
+from scraper.registry import site_names, get_integration, get_scraper
+from tests._support import check, offline, quietly, serving
+
+CUTOFF_DATE = datetime(2025, 10, 31)
+SINCE = datetime(2025, 10, 20)
+LATENCY = 0.02
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = quietly(func, *args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    """Valida a coleta de todos os sites em paralelo: merge por data, sem duplicadas, no tempo do mais lento."""
+    offline()
+
+    stats = {}
+    merged = list(merge_by_date([
+        iter([{"date": "31/10/2025", "pdf_url": "a"}, {"date": "29/10/2025", "pdf_url": "c"}]),
+        iter([{"date": "30/10/2025", "pdf_url": "b"}, {"date": "29/10/2025", "pdf_url": "c"}]),
+    ], stats))
+    check([pub["pdf_url"] for pub in merged] == ["a", "b", "c"], "merge por data descarta pdf_url repetido")
+    check(stats == {"total": 3, "duplicates": 1}, "contagem de publicações e duplicadas")
+
+    services = [get_integration(site).SPEC.service for site in site_names()]
+    with serving(*services, pages=2, latency=LATENCY):
+        per_site = {}
+        sequential = 0.0
+        for site in site_names():
+            per_site[site], elapsed = timed(get_scraper(site), CUTOFF_DATE, since=SINCE)
+            sequential += elapsed
+        slowest = max(timed(get_scraper(site), CUTOFF_DATE, since=SINCE)[1] for site in site_names())
+        results, concurrent = timed(lambda: list(iter_all_sites(CUTOFF_DATE, since=SINCE)))
+
+    dates = [datetime.strptime(pub["date"], "%d/%m/%Y") for pub in results]
+    expected = {pub["pdf_url"] for publications in per_site.values() for pub in publications}
+    check(all(per_site.values()), "todos os sites coletaram publicações")
+    check(dates == sorted(dates, reverse=True), "saída única da mais nova para a mais antiga")
+    check(len({pub["pdf_url"] for pub in results}) == len(results), "sem pdf_url repetido")
+    check({pub["pdf_url"] for pub in results} == expected, "mesmas publicações das coletas separadas")
+    check(concurrent < sequential, "coleta paralela mais rápida que a soma das coletas separadas")
+
+    print(f"\nseparadas: {sequential:.2f}s | site mais lento: {slowest:.2f}s | todos em paralelo: {concurrent:.2f}s")
+    print("Coleta de todos os sites validada.")
+
+if __name__ == "__main__":
+    main()
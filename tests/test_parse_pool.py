@@ -0,0 +1,39 @@
+
+from benchmarks.site_server import fixture_paths, read_fixture
+from scraper.metrics import PARSE_DURATION
+from scraper.parse_pool import configure_parse_pool, run_parse
+from scraper.sites.agorarn.agorarn_service import AgoraRNService
+from scraper.sites.diariodocomercio.diariodocomercio_service import DiarioDoComercioService
+from tests._support import check
+
+EDITAL_URL = "https://diariodocomercio.com.br/edital-completo/empresa-exemplo/30-10-2025/"
+
+def parse_all():
+    index = [run_parse(AgoraRNService.parse_page_for_publications, read_fixture(path))
+             for path in fixture_paths("agorarn")]
+    links = [run_parse(DiarioDoComercioService.parse_page_for_publications, read_fixture(path))
+             for path in fixture_paths("diariodocomercio")]
+    editais = [run_parse(DiarioDoComercioService.extract_publication_data, read_fixture(path), EDITAL_URL)
+               for path in fixture_paths("diariodocomercio", "edital")]
+    return index, links, editais
+
+def main():
+    """Valida que o parse no pool de processos devolve o mesmo que o parse na thread."""
+    configure_parse_pool(enabled=False)
+    expected = parse_all()
+
+    configure_parse_pool(workers=2)
+    try:
+        observed_before = PARSE_DURATION.count(site="agorarn", page="index", backend="bs4")
+        pooled = parse_all()
+        observed = PARSE_DURATION.count(site="agorarn", page="index", backend="bs4") - observed_before
+    finally:
+        configure_parse_pool(enabled=False)
+
+    check(pooled == expected, "registros, links e editais idênticos ao parse na thread")
+    check(any(expected[0]), "fixtures com publicações")
+    check(observed == len(fixture_paths("agorarn")), "duração do parse no pool registrada no processo principal")
+    print("Pool de parse validado.")
+
+if __name__ == "__main__":
+    main()
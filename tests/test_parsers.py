@@ -0,0 +1,60 @@
+import glob
+import os
+import sys
+import time
+
+from benchmarks.site_server import read_fixture
+from scraper.base_scraper import BaseScraper
+from scraper.sites.agorarn.agorarn_service import AgoraRNService
+from scraper.sites.diariocomercial.diariocomercial_service import DiarioComercialService
+from scraper.sites.diariodocomercio.diariodocomercio_service import DiarioDoComercioService
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+EDITAL_URL = "https://diariodocomercio.com.br/edital-completo/empresa-exemplo/30-10-2025/"
+REPEAT = 20
+
+def fixture_cases():
+    """(nome, função de parse(html, backend)) para cada fixture gravada."""
+    cases = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "agorarn", "index_*.html"))):
+        cases.append((path, AgoraRNService.parse_page_for_publications))
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "diariocomercial", "index_*.html"))):
+        cases.append((path, DiarioComercialService.parse_page_for_publications))
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "diariodocomercio", "index_*.html"))):
+        cases.append((path, lambda html, backend: sorted(
+            BaseScraper.scrape_edital_links(html, DiarioDoComercioService.BASE_URL, backend))))
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "diariodocomercio", "edital_*.html"))):
+        cases.append((path, lambda html, backend: DiarioDoComercioService.extract_publication_data(
+            html, EDITAL_URL, backend)))
+    return cases
+
+def timed(parse, html, backend):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        parse(html, backend)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+def main():
+    """Confere que o parser lxml devolve exatamente os mesmos registros do BeautifulSoup."""
+    failures = 0
+    for path, parse in fixture_cases():
+        html = read_fixture(path)
+        expected = parse(html, "bs4")
+        result = parse(html, "lxml")
+        name = os.path.relpath(path, FIXTURES_DIR)
+
+        if result != expected:
+            failures += 1
+            print(f"FALHOU: {name}\n  bs4:  {expected}\n  lxml: {result}")
+            continue
+
+        count = len(expected) if isinstance(expected, list) else 1
+        print(f"OK: {name} ({count} registros) "
+              f"bs4 {timed(parse, html, 'bs4'):.2f}ms x lxml {timed(parse, html, 'lxml'):.2f}ms")
+
+    if failures:
+        sys.exit(1)
+    print("Parsers equivalentes em todas as fixtures.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import time
+from datetime import datetime
+
+from benchmarks.local_server import StandInServer, synthetic_page
+from scraper.base_scraper import BaseScraper
+from scraper.engine import WINDOWED_PREFETCH_DEPTH
+from scraper.rate_limiter import HostBudget, configure_rate_limiter
+from scraper.sites.agorarn.agorarn_integration import scrape_agorarn
+from scraper.sites.agorarn.agorarn_service import AgoraRNService
+from tests._support import check, offline, quietly, serving
+
+PAGES = 6
+LATENCY = 0.05  # atraso de cada resposta do servidor local
+PARSE_TIME = 0.05  # CPU simulada por página
+RATE = 20.0
+SLOW_RATE = 2.0  # orçamento em que os prefetches ficam esperando pelo limitador
+CUTOFF_DATE = datetime(2025, 10, 31)
+
+def last_pages(path):
+    """Páginas 1..PAGES existem; depois delas, 404 como nos sites reais."""
+    page_num = int(path.strip("/").split("/")[-1])
+    return synthetic_page(path) if page_num <= PAGES else None
+
+def crawl(server, depth, stop_after=None):
+    """Percorre as páginas como as integrações, simulando o parse; retorna (páginas lidas, segundos)."""
+    url_for = lambda page_num: f"{server.base_url}/page/{page_num}/"
+    seen = []
+    start = time.perf_counter()
+    for page_num, _, page_html in BaseScraper.iter_index_pages(url_for, 1, 50, depth=depth):
+        if not page_html:
+            break
+        time.sleep(PARSE_TIME)
+        seen.append(page_num)
+        if page_num == stop_after:
+            break
+    return seen, time.perf_counter() - start
+
+def main():
+    """Valida o prefetch de páginas de índice: sobreposição, cancelamento e orçamento do host."""
+    offline()
+
+    with StandInServer(render=last_pages, latency=LATENCY) as server:
+        serial_pages, serial = crawl(server, depth=0)
+        prefetch_pages, pipelined = crawl(server, depth=2)
+    check(serial_pages == prefetch_pages == list(range(1, PAGES + 1)), "mesmas páginas, na mesma ordem")
+    check(pipelined < serial * 0.75, f"rede sobreposta ao parse ({serial:.2f}s -> {pipelined:.2f}s)")
+
+    with StandInServer(render=last_pages, latency=LATENCY) as server:
+        crawl(server, depth=2, stop_after=1)
+        time.sleep(LATENCY * 4)
+        requests_made = server.requests
+    check(requests_made <= 3, f"parada antecipada cancela os prefetches pendentes ({requests_made} requisições)")
+
+    configure_rate_limiter({"127.0.0.1": HostBudget(rate=RATE)})
+    with StandInServer(render=last_pages) as server:
+        _, elapsed = crawl(server, depth=4)
+    check(elapsed >= PAGES / RATE, f"prefetch respeita o orçamento do host ({elapsed:.2f}s)")
+
+    configure_rate_limiter({"127.0.0.1": HostBudget(rate=SLOW_RATE)})
+    with StandInServer(render=last_pages, latency=LATENCY) as server:
+        crawl(server, depth=3, stop_after=1)
+        at_close = server.requests
+        time.sleep(3 / SLOW_RATE)
+        requests_made = server.requests
+    check(at_close == requests_made == 1,
+          f"prefetches na fila do limitador não vão à rede depois do close ({requests_made} requisições)")
+
+    configure_rate_limiter(enabled=False)  # sem espera, os prefetches vão à rede antes da parada
+    with serving(AgoraRNService, pages=PAGES) as server:
+        by_page = []
+        quietly(scrape_agorarn, CUTOFF_DATE, on_page=by_page.append)
+        known_urls = {by_page[1][0]["pdf_url"]}
+        time.sleep(LATENCY * 4)  # prefetches da coleta completa ainda em voo não entram na contagem
+        server.reset_stats()
+        incremental = quietly(scrape_agorarn, CUTOFF_DATE, known_urls=known_urls)
+        time.sleep(LATENCY * 4)
+        requests_made = server.requests
+    expected = [pub for pub in by_page[0] + by_page[1] if pub["pdf_url"] not in known_urls]
+    check(incremental == expected, "coleta incremental para na página da publicação conhecida")
+    check(2 <= requests_made <= 2 + WINDOWED_PREFETCH_DEPTH,
+          f"parada incremental pede as páginas usadas e no máximo {WINDOWED_PREFETCH_DEPTH} à frente "
+          f"({requests_made} requisições)")
+
+    configure_rate_limiter()
+    print("Prefetch validado.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from storage.publication_store import PublicationStore
+from tests._support import check
+
+DATE_FORMAT = "%d/%m/%Y"
+NEWEST = datetime(2025, 10, 31)
+PAGE_SIZE = 7
+
+def publications(count, prefix="a", per_day=5):
+    """`count` publicações, `per_day` por data: empates de data exercitam o desempate pelo id no cursor."""
+    return [
+        {
+            "date": (NEWEST - timedelta(days=index // per_day)).strftime(DATE_FORMAT),
+            "pdf_url": f"https://agorarn.com.br/{prefix}/{index}.pdf",
+            "title": f"Edital {prefix} {index}",
+            "site": "agorarn.com.br",
+            "original_url": f"https://agorarn.com.br/{prefix}/{index}/",
+        }
+        for index in range(count)
+    ]
+
+def walk(store, **filters):
+    """Percorre query_page seguindo next_cursor; retorna (publicações, número de páginas)."""
+    collected, cursor, pages = [], None, 0
+    while True:
+        page, cursor = store.query_page(limit=PAGE_SIZE, cursor=cursor, **filters)
+        collected.extend(page)
+        pages += 1
+        if cursor is None:
+            return collected, pages
+
+def main():
+    """Valida o banco de publicações: upsert único por pdf_url e paginação por cursor (keyset)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PublicationStore(os.path.join(tmp, "publicacoes.db"))
+        batch = publications(40)
+        store.upsert_many("agorarn", batch)
+        store.upsert_many("agorarn", batch[:10])
+        check(store.count() == 40, "regravar o mesmo lote não duplica publicações")
+
+        retitled = {**batch[0], "title": "Edital retificado", "date": "01/11/2025"}
+        store.upsert_many("agorarn", [retitled])
+        first = store.query(limit=1)[0]
+        check(store.count() == 40 and first["title"] == "Edital retificado" and first["date"] == "01/11/2025",
+              "pdf_url repetido atualiza título e data no mesmo registro")
+        store.upsert_many("agorarn", [batch[0]])
+
+        everything = store.query()
+        walked, pages = walk(store)
+        check(walked == everything, "páginas do cursor = consulta inteira, na mesma ordem, sem repetições")
+        check(pages == -(-len(everything) // PAGE_SIZE), f"{pages} páginas de {PAGE_SIZE}")
+        dates = [datetime.strptime(pub["date"], DATE_FORMAT) for pub in walked]
+        check(dates == sorted(dates, reverse=True), "da mais nova para a mais antiga")
+
+        page, cursor = store.query_page(limit=PAGE_SIZE)
+        newer = [{**pub, "date": (NEWEST + timedelta(days=1)).strftime(DATE_FORMAT)}
+                 for pub in publications(3, prefix="novo")]
+        store.upsert_many("agorarn", newer)
+        rest, next_cursor = store.query_page(limit=1000, cursor=cursor)
+        check(page + rest == everything and next_cursor is None,
+              "publicações novas gravadas no meio da paginação não deslocam as páginas seguintes")
+
+        since, until = datetime(2025, 10, 28), datetime(2025, 10, 30)
+        window, _ = walk(store, site="agorarn", since=since, until=until)
+        expected = [pub for pub in store.query(site="agorarn")
+                    if since <= datetime.strptime(pub["date"], DATE_FORMAT) <= until]
+        check(window == expected and window, "cursor combinado com filtros de site e datas")
+        titled, _ = walk(store, q="EDITAL A 1")
+        check(titled == store.query(q="edital a 1") and len(titled) == 11, "cursor combinado com busca no título")
+        check(store.query_page(site="diariocomercial")[0] == [], "outro site não vê as publicações")
+        store.close()
+
+    print("Banco de publicações validado.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import time
+
+from benchmarks.local_server import StandInServer
+from scraper.base_scraper import BaseScraper
+from scraper.http_cache import configure_http_cache
+from scraper.rate_limiter import HostBudget, TokenBucket, configure_rate_limiter
+from tests._support import check
+
+RATE = 20.0  # requisições/s no servidor local
+
+def main():
+    """Valida o ritmo e o ajuste AIMD do limitador por host (sem acesso à rede)."""
+    bucket = TokenBucket(HostBudget(rate=RATE))
+    waits = [bucket.reserve() for _ in range(5)]
+    check(waits[0] == 0, "primeira requisição não espera")
+    check(abs(waits[4] - 4 / RATE) < 0.01, "reservas seguintes respeitam 1/rate")
+
+    bucket = TokenBucket(HostBudget(rate=RATE))
+    check(bucket.observe(503, 0.01) == "503", "503 reduz a taxa")
+    check(bucket.rate == RATE / 2, "redução multiplicativa pela metade")
+    for _ in range(5):
+        bucket.observe(200, 0.01)
+    check(RATE / 2 < bucket.rate <= RATE, "respostas normais devolvem a taxa aos poucos")
+    check(bucket.observe(200, 5.0) == "latency", "latência muito acima da média reduz a taxa")
+
+    configure_http_cache(enabled=False)
+    configure_rate_limiter({"127.0.0.1": HostBudget(rate=RATE)})
+    with StandInServer() as server:
+        start = time.perf_counter()
+        for page_num in range(1, 11):
+            BaseScraper.get_html_content(f"{server.base_url}/page/{page_num}/")
+        elapsed = time.perf_counter() - start
+    check(elapsed >= 9 / RATE, f"10 páginas respeitam o orçamento do host ({elapsed:.2f}s)")
+
+    limiter = configure_rate_limiter({"127.0.0.1": HostBudget(rate=RATE)})
+    with StandInServer(error_rate=1.0) as server:
+        BaseScraper.get_html_content(f"{server.base_url}/page/1/")
+    check(limiter.rates()["127.0.0.1"] < RATE, "503 do servidor reduz a taxa do host")
+
+    configure_rate_limiter()
+    print("Limitador validado.")
+
+if __name__ == "__main__":
+    main()
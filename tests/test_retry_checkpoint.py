@@ -0,0 +1,143 @@
+import asyncio
+import os
+import re
+import tempfile
+from datetime import datetime
+
+import scheduler
+from main import collect_to_file
+from benchmarks.local_server import StandInServer, synthetic_page
+from benchmarks.site_server import FixtureSites
+from scraper import base_scraper
+from scraper.base_scraper import DEFAULT_PREFETCH_DEPTH, BaseScraper, FetchError, set_prefetch_depth
+from scraper.checkpoint import CheckpointStore
+from scraper.rate_limiter import configure_rate_limiter
+from scraper.sites.agorarn.agorarn_integration import iter_agorarn, scrape_agorarn
+from scraper.sites.agorarn.agorarn_service import AgoraRNService
+from scraper.watermark import HighWaterMarkStore
+from storage.publication_store import configure_publication_store
+from tests._support import check, offline, quietly
+
+CUTOFF_DATE = datetime(2025, 10, 31)
+PAGES = 5
+FAILING_PAGE = 3
+INDEX_PAGE = re.compile(r"/publicacoescertificadas/page/(\d+)/")
+
+def flaky(failures):
+    """Render que derruba a conexão (falha de rede) nas primeiras `failures` chamadas."""
+    calls = {"count": 0}
+
+    def render(path):
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise ConnectionAbortedError("falha simulada")
+        return synthetic_page(path)
+    return render, calls
+
+def failing_page(sites, page_num, failures):
+    """Render das fixtures em que `page_num` derruba a conexão nas primeiras `failures` buscas; anota as páginas pedidas."""
+    requested = []
+
+    def render(path):
+        match = INDEX_PAGE.match(path)
+        if match:
+            requested.append(int(match.group(1)))
+            if int(match.group(1)) == page_num and requested.count(page_num) <= failures:
+                raise ConnectionAbortedError("falha simulada")
+        return sites(path)
+    return render, requested
+
+def main():
+    """Valida as novas tentativas por requisição, o checkpoint e a retomada da coleta (sem acesso à rede)."""
+    offline()
+    base_scraper.BACKOFF_BASE = 0.01
+
+    render, calls = flaky(2)
+    with StandInServer(render=render) as server:
+        server.httpd.handle_error = lambda request, client_address: None  # sem traceback no console
+        html = BaseScraper.get_html_content(f"{server.base_url}/page/1/")
+    check(html is not None and calls["count"] == 3, "falhas transitórias são repetidas até dar certo")
+
+    with StandInServer(error_rate=1.0) as server:
+        url = f"{server.base_url}/page/1/"
+        check(BaseScraper.get_html_content(url) is None, "sem strict, falha persistente retorna None")
+        try:
+            BaseScraper.get_html_content(url, strict=True)
+            raised = False
+        except FetchError as e:
+            raised = e.retryable and e.status == 503
+        check(raised, "com strict, falha persistente levanta FetchError")
+        check(server.requests == 2 * base_scraper.MAX_FETCH_ATTEMPTS, "número de tentativas por requisição")
+
+    with StandInServer(render=lambda path: None) as server:
+        check(BaseScraper.get_html_content(f"{server.base_url}/page/9/", strict=True) is None,
+              "404 (fim da paginação) não é repetido nem levanta erro")
+        check(server.requests == 1, "404 feito uma única vez")
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        store = CheckpointStore(os.path.join(state_dir, "checkpoints.json"))
+        newest = [{"date": "31/10/2025", "pdf_url": "https://a/1.pdf", "title": "x"}]
+        store.save("agorarn", "31/10/2025", next_page=151, items=2980, newest=newest)
+        checkpoint = store.get("agorarn", "31/10/2025")
+        check(checkpoint["next_page"] == 151 and checkpoint["items"] == 2980, "checkpoint salvo e lido")
+        check(store.get("agorarn", "01/11/2025") is None, "checkpoint de outra data é ignorado")
+        store.clear("agorarn")
+        check(store.get("agorarn", "31/10/2025") is None, "checkpoint apagado ao concluir")
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        store = configure_publication_store(os.path.join(state_dir, "publicacoes.db"))
+        scheduler.checkpoints = CheckpointStore(os.path.join(state_dir, "checkpoints.json"))
+        scheduler.high_water_marks = HighWaterMarkStore(os.path.join(state_dir, "marcas.json"))
+        scheduler.RETRY_DELAY = 0
+        set_prefetch_depth(0)  # uma requisição por página: a ordem no servidor é a ordem da coleta
+
+        sites = FixtureSites(PAGES)
+        render, requested = failing_page(sites, FAILING_PAGE, base_scraper.MAX_FETCH_ATTEMPTS)
+        base_url = AgoraRNService.BASE_URL
+        with StandInServer(render=render) as server:
+            server.httpd.handle_error = lambda request, client_address: None
+            sites.base_url = AgoraRNService.BASE_URL = server.base_url
+            try:
+                quietly(asyncio.run, scheduler.run_scraper_with_retry("agorarn", iter_agorarn, CUTOFF_DATE))
+                retry = requested[requested.index(FAILING_PAGE) + base_scraper.MAX_FETCH_ATTEMPTS:]
+                expected = quietly(scrape_agorarn, CUTOFF_DATE)
+            finally:
+                AgoraRNService.BASE_URL = base_url
+
+        check(retry[0] == FAILING_PAGE, f"nova tentativa recomeça na página {FAILING_PAGE}, não na 1 ({retry})")
+        check(requested[:FAILING_PAGE - 1] == list(range(1, FAILING_PAGE)) and 1 not in retry,
+              "páginas anteriores à falha buscadas uma única vez")
+        rows = store.query(site="agorarn")
+        expected_urls = {pub["pdf_url"] for pub in expected}
+        check(len(rows) == len(expected_urls) and {pub["pdf_url"] for pub in rows} == expected_urls,
+              "banco com as mesmas publicações de uma coleta sem falhas, sem linhas repetidas")
+        mark = scheduler.high_water_marks.get("agorarn")
+        check(set(mark["recent_pdf_urls"]) == expected_urls, "marca d'água reúne as páginas das duas tentativas")
+        check(mark["recent_detail_urls"] == [], "site sem página de detalhe não guarda URLs de página de índice na marca")
+        check(scheduler.checkpoints.get("agorarn", CUTOFF_DATE.strftime("%d/%m/%Y")) is None,
+              "checkpoint da coleta retomada apagado ao concluir")
+        store.close()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        sites = FixtureSites(PAGES)
+        render, _ = failing_page(sites, 2, PAGES * base_scraper.MAX_FETCH_ATTEMPTS)
+        output_name = os.path.join(out_dir, "resultados.json")
+        with StandInServer(render=render) as server:
+            server.httpd.handle_error = lambda request, client_address: None
+            sites.base_url = AgoraRNService.BASE_URL = server.base_url
+            try:
+                quietly(collect_to_file, "agorarn", CUTOFF_DATE, None, None, False, "json", output_name)
+                raised = False
+            except FetchError:
+                raised = True
+            finally:
+                AgoraRNService.BASE_URL = base_url
+        check(raised and os.listdir(out_dir) == [],
+              "coleta interrompida pela CLI não deixa arquivo de saída truncado nem temporário")
+    set_prefetch_depth(DEFAULT_PREFETCH_DEPTH)
+
+    configure_rate_limiter()
+    print("Novas tentativas e checkpoint validados.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+from datetime import datetime
+
+from api import create_app
+from benchmarks.site_server import fixture_paths, read_fixture
+from scraper.sites.agorarn.agorarn_service import AgoraRNService
+from scraper.sites.diariocomercial.diariocomercial_service import DiarioComercialService
+from storage.publication_store import PublicationStore, configure_publication_store
+from storage.search_index import tokenize
+from tests._support import check
+
+def fixture_publications(service, site_domain):
+    publications = []
+    for path in fixture_paths(site_domain.split(".")[0]):
+        for pub in service.parse_page_for_publications(read_fixture(path)):
+            publications.append({**pub, "site": site_domain, "original_url": None})
+    return publications
+
+def main():
+    """Valida o índice invertido: normalização, ranking, filtros, atualização incremental e GET /search."""
+    check(tokenize("Balanço Patrimonial – ASSEMBLÉIA 2024") == ["balanco", "patrimonial", "assembleia", "2024"],
+          "termos sem acentos e em minúsculas, como o filtro de títulos")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PublicationStore(os.path.join(tmp, "publicacoes.db"))
+        agorarn = fixture_publications(AgoraRNService, "agorarn.com.br")
+        diariocomercial = fixture_publications(DiarioComercialService, "diariocomercial.com.br")
+        store.upsert_many("agorarn", agorarn)
+        store.upsert_many("diariocomercial", diariocomercial)
+
+        word = tokenize(agorarn[0]["title"])[0]
+        expected = {pub["pdf_url"] for pub in agorarn + diariocomercial if word in tokenize(pub["title"])}
+        results = store.search(word.upper(), limit=1000)
+        check({pub["pdf_url"] for pub in results} == expected, f"busca por '{word}' acha todas as publicações com o termo")
+        check([pub["score"] for pub in results] == sorted((pub["score"] for pub in results), reverse=True),
+              "resultados do mais relevante para o menos relevante")
+
+        target = agorarn[0]
+        ranked = store.search(target["title"], limit=5)
+        check(ranked and ranked[0]["pdf_url"] == target["pdf_url"], "o título inteiro traz a própria publicação primeiro")
+
+        only_site = store.search(word, site="diariocomercial", limit=1000)
+        check(all(pub["site"] == "diariocomercial.com.br" for pub in only_site), "filtro por site")
+        day = datetime.strptime(target["date"], "%d/%m/%Y")
+        in_window = store.search(word, since=day, until=day, limit=1000)
+        check(all(pub["date"] == target["date"] for pub in in_window), "filtro por intervalo de datas")
+
+        store.upsert_many("agorarn", [{**target, "title": "Xyzzy Mineração – Errata"}])
+        check([pub["pdf_url"] for pub in store.search("mineracao xyzzy")] == [target["pdf_url"]],
+              "regravar uma publicação atualiza os termos no índice")
+        check(target["pdf_url"] not in {pub["pdf_url"] for pub in store.search(target["title"], limit=1000)},
+              "termos antigos saem do índice")
+        stats = store.search_index_stats()
+        check(stats["documents"] == store.count(), "uma entrada no índice por publicação")
+        store.close()
+
+        api_store = configure_publication_store(os.path.join(tmp, "publicacoes.db"))
+        client = create_app().test_client()
+        response = client.get(f"/search?q={word}&site=agorarn&limit=3")
+        body = response.get_json()
+        check(response.status_code == 200 and 0 < body["total"] <= 3, "GET /search responde com os resultados")
+        check(all("score" in pub for pub in body["results"]) and body["took_ms"] < 100, "resultados com score, em ms")
+        check(client.get("/search").status_code == 400, "GET /search sem 'q' é rejeitado")
+        check(client.get("/search?q=x&since=2025-10-01").status_code == 400, "data inválida é rejeitada")
+        api_store.close()
+
+    print("Índice de busca validado.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import math
+from datetime import datetime, timedelta
+
+from benchmarks.local_server import StandInServer
+from scraper.base_scraper import BaseScraper
+from tests._support import check, offline, quietly
+
+DATE_FORMAT = "%d/%m/%Y"
+PAGES = 60
+PER_PAGE = 10
+NEWEST = datetime(2025, 10, 31)
+STICKY_PAGE = 5  # página com um item antigo fora de ordem (publicação fixada no topo)
+
+def listing(days_per_page, sticky=None):
+    """{página: [datas]} do mais novo para o mais antigo; `days_per_page` = 0 faz platôs de mesma data."""
+    pages = {}
+    for page_num in range(1, PAGES + 1):
+        first = NEWEST - timedelta(days=(page_num - 1) * days_per_page)
+        pages[page_num] = [first] * PER_PAGE
+    if sticky:
+        pages[STICKY_PAGE] = [sticky] + pages[STICKY_PAGE][1:]
+    return pages
+
+def render_from(pages):
+    """Render do StandInServer: cada página é uma lista de datas dd/mm/yyyy; depois da última, 404."""
+    def render(path):
+        page_num = int(path.strip("/").split("/")[-1])
+        if page_num not in pages:
+            return None
+        return " ".join(date.strftime(DATE_FORMAT) for date in pages[page_num])
+    return render
+
+def extract_dates(page_html):
+    return [datetime.strptime(token, DATE_FORMAT) for token in page_html.split()]
+
+def first_reached(pages, cutoff_date):
+    """Resposta da busca linear: primeira página com alguma data <= cutoff_date."""
+    return next(page_num for page_num, dates in pages.items() if min(dates) <= cutoff_date)
+
+def seek(pages, cutoff_date):
+    with StandInServer(render=render_from(pages)) as server:
+        url_for = lambda page_num: f"{server.base_url}/page/{page_num}/"
+        start, fetched = quietly(BaseScraper.seek_start_page, url_for, extract_dates, cutoff_date, PAGES)
+        probes = server.requests
+        crawled = [page_num for page_num, _, _ in BaseScraper.iter_index_pages(
+            url_for, start, min(start + 2, PAGES), prefetched=fetched, depth=0)]
+        reused = server.requests - probes == len(set(crawled) - set(fetched))
+    return start, probes, reused
+
+def main():
+    """Valida o --seek: galope + busca binária, número de sondagens, reaproveitamento e páginas fora de ordem."""
+    offline()
+    max_probes = 2 * math.ceil(math.log2(PAGES)) + 1
+
+    pages = listing(days_per_page=1)
+    for target in (1, 2, 23, 37, PAGES):
+        cutoff_date = pages[target][0]
+        start, probes, reused = seek(pages, cutoff_date)
+        check(start == first_reached(pages, cutoff_date) and probes <= max_probes,
+              f"data na página {target}: começa em {start} com {probes} sondagens (máx. {max_probes})")
+        check(reused, f"páginas sondadas não são baixadas de novo no crawl (página {target})")
+
+    plateau = listing(days_per_page=0)
+    plateau.update({page_num: [NEWEST + timedelta(days=1)] * PER_PAGE for page_num in range(1, 30)})
+    start, _, _ = seek(plateau, NEWEST)
+    check(start == 30, f"platô de datas iguais: começa na primeira página do platô ({start})")
+
+    start, _, _ = seek(listing(days_per_page=1), NEWEST - timedelta(days=PAGES + 10))
+    check(start == PAGES, f"data anterior a todas as páginas: última página ({start})")
+
+    old = NEWEST - timedelta(days=365)
+    for target in (3, STICKY_PAGE + 1, 23, 44):
+        pages = listing(days_per_page=1, sticky=old)
+        cutoff_date = pages[target][0]
+        boundary = next(page_num for page_num, dates in pages.items()
+                        if page_num != STICKY_PAGE and min(dates) <= cutoff_date)
+        start, probes, _ = seek(pages, cutoff_date)
+        check(start <= boundary and min(pages[start]) <= cutoff_date and probes <= max_probes,
+              f"item fora de ordem na página {STICKY_PAGE}, data na página {target}: "
+              f"começa em {start}, nunca depois da {boundary}")
+
+    print("Seek validado.")
+
+if __name__ == "__main__":
+    main()
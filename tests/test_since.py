@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from benchmarks.site_server import fixture_paths, read_fixture
+from scraper.engine import WINDOWED_PREFETCH_DEPTH
+from scraper.sites.diariocomercial.diariocomercial_integration import scrape_diariocomercial
+from scraper.sites.diariocomercial.diariocomercial_service import DiarioComercialService
+from scraper.sites.diariodocomercio.diariodocomercio_integration import scrape_diariodocomercio
+from scraper.sites.diariodocomercio.diariodocomercio_service import DiarioDoComercioService
+from tests._support import check, offline, quietly, serving
+
+DATE_FORMAT = "%d/%m/%Y"
+CUTOFF_DATE = datetime(2025, 10, 31)
+PAGES = 6  # as fixtures se repetem em ciclo: sem a parada, a coleta iria até a página 6
+SINCE = datetime(2025, 10, 15)  # cai na página 2; a página 3 é toda anterior
+
+def in_window(publications, since):
+    return [pub for pub in publications if datetime.strptime(pub["date"], DATE_FORMAT) >= since]
+
+def main():
+    """Valida o --since: só publicações da janela e parada na primeira página inteira anterior a ela."""
+    offline()
+    with serving(DiarioComercialService, pages=PAGES) as server:
+        by_page = []
+        quietly(scrape_diariocomercial, CUTOFF_DATE, on_page=by_page.append)
+        server.reset_stats()
+        window = quietly(scrape_diariocomercial, CUTOFF_DATE, since=SINCE)
+        requests_made = server.requests
+    check(window == in_window(by_page[0] + by_page[1], SINCE), "mesmas publicações da coleta completa dentro da janela")
+    check(3 <= requests_made <= 3 + WINDOWED_PREFETCH_DEPTH,
+          f"para na página 3, a primeira inteira anterior a --since, mais o prefetch ({requests_made} requisições)")
+
+    since = datetime(2025, 10, 25)
+    with serving(DiarioDoComercioService, pages=PAGES) as server:
+        by_page = []
+        quietly(scrape_diariodocomercio, CUTOFF_DATE, on_page=by_page.append)
+        server.reset_stats()
+        window = quietly(scrape_diariodocomercio, CUTOFF_DATE, since=since)
+        requests_made = server.requests
+    check(window == in_window(by_page[0], since), "com página de detalhe: só as publicações da janela")
+    listed = [listing for listing in DiarioDoComercioService.parse_page_for_publications(
+        read_fixture(fixture_paths("diariodocomercio")[0])) if listing["date"]]
+    details = len(in_window(listed, since))
+    check(2 + details <= requests_made <= 2 + details + WINDOWED_PREFETCH_DEPTH,
+          f"duas páginas de índice (mais o prefetch) e só os {details} detalhes da janela ({requests_made} requisições)")
+
+    print("Janela de datas validada.")
+
+if __name__ == "__main__":
+    main()
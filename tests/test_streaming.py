@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+from api import create_app
+from scraper.base_scraper import DEFAULT_PREFETCH_DEPTH, set_prefetch_depth
+from scraper.sites.agorarn.agorarn_integration import scrape_agorarn
+from scraper.sites.agorarn.agorarn_service import AgoraRNService
+from scraper.writers import FIELDNAMES
+from storage.publication_store import configure_publication_store
+from tests._support import check, offline, quietly, serving
+
+NEWEST = datetime(2025, 10, 31)
+CUTOFF_DATE = datetime(2025, 10, 31)
+COUNT = 3000  # o bastante para a resposta sair em vários pedaços de STREAM_CHUNK_SIZE
+PAGES = 6
+LATENCY = 0.05
+PAGE_SIZE = 700  # COUNT não é múltiplo: a última página sai incompleta e sem cursor
+TRICKY_TITLE = 'Edital "Balanço", 2024\nAssembléia – Convocação'
+
+def publications(count):
+    return [
+        {"date": (NEWEST - timedelta(days=index // 50)).strftime("%d/%m/%Y"),
+         "pdf_url": f"https://agorarn.com.br/{index}.pdf",
+         "title": TRICKY_TITLE if index == 0 else f"Edital {index}",
+         "site": "agorarn.com.br", "original_url": f"https://agorarn.com.br/{index}/"}
+        for index in range(count)
+    ]
+
+def text(chunk):
+    return chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk
+
+def streamed(response):
+    """Pedaços do corpo, na ordem em que a resposta os gera."""
+    return [text(chunk) for chunk in response.response]
+
+def main():
+    """Valida as respostas CSV/NDJSON em streaming: corpo, cabeçalhos, pedaços e coleta ao vivo."""
+    offline()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = configure_publication_store(os.path.join(tmp, "publicacoes.db"))
+        store.upsert_many("agorarn", publications(COUNT))
+        expected = store.query(site="agorarn")
+        client = create_app().test_client()
+
+        response = client.get("/agorarn?date=31/10/2025&format=ndjson")
+        chunks = streamed(response)
+        check(response.is_streamed and len(chunks) > 1, f"NDJSON transmitido em {len(chunks)} pedaços")
+        check(response.mimetype == "application/x-ndjson"
+              and response.headers["Content-Disposition"] == "attachment; filename=agorarn_data.ndjson",
+              "cabeçalhos do NDJSON")
+        lines = "".join(chunks).splitlines()
+        check([json.loads(line) for line in lines] == expected, "uma publicação por linha, na ordem do banco")
+
+        response = client.get("/agorarn?date=31/10/2025&format=csv")
+        chunks = streamed(response)
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+        check(response.mimetype == "text/csv" and len(chunks) > 1, f"CSV transmitido em {len(chunks)} pedaços")
+        check(list(rows[0]) == FIELDNAMES, "cabeçalho fixo do CSV")
+        check(rows == [{field: pub[field] or "" for field in FIELDNAMES} for pub in expected],
+              "linhas do CSV = banco, com aspas, vírgulas e quebras de linha escapadas")
+
+        limited = client.get("/agorarn?date=31/10/2025&format=ndjson&limit=5&since=31/10/2025")
+        check([json.loads(line) for line in "".join(streamed(limited)).splitlines()] == expected[:5],
+              "limit e since valem no streaming")
+        check(client.get("/agorarn?date=01/01/2020&format=csv").status_code == 204, "sem resultados, 204 sem corpo")
+
+        for output_format in ("csv", "ndjson"):
+            walked, cursor, cursors = [], None, []
+            while True:
+                url = f"/agorarn?date=31/10/2025&format={output_format}&limit={PAGE_SIZE}"
+                response = client.get(f"{url}&cursor={cursor}" if cursor else url)
+                body = "".join(streamed(response))
+                if output_format == "csv":
+                    walked.extend({field: row[field] or None for field in FIELDNAMES}
+                                  for row in csv.DictReader(io.StringIO(body)))
+                else:
+                    walked.extend(json.loads(line) for line in body.splitlines())
+                cursor = response.headers.get("X-Next-Cursor")
+                if cursor is None:
+                    break
+                cursors.append(cursor)
+            page_cursors = []
+            _, next_cursor = store.query_page(site="agorarn", limit=PAGE_SIZE)
+            while next_cursor:
+                page_cursors.append(next_cursor)
+                _, next_cursor = store.query_page(site="agorarn", limit=PAGE_SIZE, cursor=next_cursor)
+            check(walked == expected and cursors == page_cursors,
+                  f"{output_format} paginado por X-Next-Cursor, mesmos cursores do JSON ({len(cursors) + 1} páginas)")
+
+        set_prefetch_depth(0)  # uma requisição por página: a contagem do servidor mostra quantas coletas houve
+        with serving(AgoraRNService, pages=PAGES, latency=LATENCY) as server:
+            scraped = quietly(scrape_agorarn, CUTOFF_DATE)
+            server.reset_stats()
+            url = "/agorarn?date=31/10/2025&format=ndjson&live=1"
+            first_body = client.get(url).response
+            first = quietly(next, first_body)
+            requests_at_first = server.requests
+            # outro cliente, na sua thread, pede a mesma coleta enquanto ela ainda está em andamento
+            second = []
+            follower = threading.Thread(target=lambda: second.extend(create_app().test_client().get(url).response))
+            follower.start()
+            live = [quietly(list, first_body)]
+            follower.join()
+            live.append(second)
+            requests_made = server.requests
+        set_prefetch_depth(DEFAULT_PREFETCH_DEPTH)
+        live = [[json.loads(line) for line in "".join(text(chunk) for chunk in chunks).splitlines()]
+                for chunks in ([first, *live[0]], live[1])]
+        check(live == [scraped, scraped], "live=1 transmite a coleta ao vivo")
+        check(requests_at_first < PAGES, f"primeira linha sai antes de a coleta terminar ({requests_at_first} páginas pedidas)")
+        check(requests_made == PAGES + 1,
+              f"pedidos live=1 simultâneos acompanham uma única coleta ({requests_made} requisições)")
+        check({pub["pdf_url"] for pub in scraped} <= {pub["pdf_url"] for pub in store.query(site="agorarn")},
+              "coleta ao vivo gravada no banco")
+        store.close()
+
+    print("Streaming validado.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import random
+import time
+import unicodedata
+from datetime import datetime
+
+from scraper.sites.agorarn.agorarn_integration import scrape_agorarn
+from scraper.engine import should_filter_title
+from scraper.sites.agorarn.agorarn_service import AgoraRNService
+from scraper.title_filter import compile_filter, parse_filter, terms_filter
+from tests._support import check, offline, quietly, serving
+
+CUTOFF_DATE = datetime(2025, 10, 31)
+EXPRESSION = 'balanço AND (assembleia OR edital) NOT errata'
+
+def old_should_filter_title(title, filter_text):
+    """Implementação anterior dos services, para comparar o --filter-text."""
+    if not filter_text:
+        return False
+
+    def normalize(text):
+        nfkd = unicodedata.normalize("NFKD", text)
+        return "".join(c for c in nfkd if not unicodedata.combining(c)).lower()
+
+    return normalize(filter_text) not in normalize(title)
+
+def main():
+    """Valida o filtro de títulos: expressões, acentos, compatibilidade com --filter-text e uso na coleta."""
+    title_filter = parse_filter(EXPRESSION)
+    check(title_filter.matches("Edital de Convocação – Balanço 2024"), "AND com OR entre parênteses")
+    check(not title_filter.matches("BALANCO e ASSEMBLÉIA – Errata"), "NOT exclui, ignorando caixa e acentos")
+    check(not title_filter.matches("Balanço Patrimonial"), "AND exige os dois lados")
+    check(parse_filter('"ata da assembleia" OR convocação').matches("ATA DA ASSEMBLÉIA GERAL"), "frase entre aspas")
+    check(parse_filter("balanço patrimonial").matches("Patrimonial – Balanço"), "termos lado a lado valem AND")
+    accepted = []
+    for invalid in ["", "balanço AND", "(balanço", "balanço)", '"balanço', "OR edital"]:
+        try:
+            parse_filter(invalid)
+            accepted.append(invalid)
+        except ValueError:
+            pass
+    check(not accepted, f"expressões inválidas rejeitadas com ValueError ({accepted})")
+
+    random.seed(0)
+    words = ["balanço", "ata", "edital", "assembléia", "errata", "s.a.", "ltda", "convocação", "ço", "a"]
+    titles = [" ".join(random.choice(words) for _ in range(random.randint(0, 6))).title() for _ in range(500)]
+    same = all(
+        should_filter_title(title, filter_text) == old_should_filter_title(title, filter_text)
+        for title in titles for filter_text in [None, "", *words, "Balanço Ata"]
+    )
+    check(same, "--filter-text continua com o mesmo resultado da implementação anterior")
+    check(compile_filter("balanço") is compile_filter("balanço"), "texto compilado uma única vez")
+
+    companies = [f"Empresa {i:03d} S.A." for i in range(300)]
+    many = terms_filter(companies)
+    sample = titles + companies[::7]
+    naive = [title for title in sample if any(not old_should_filter_title(title, c) for c in companies)]
+    check([title for title in sample if many.matches(title)] == naive,
+          "centenas de termos numa única passada = busca termo a termo")
+
+    start = time.perf_counter()
+    for title in titles:
+        many.matches(title)
+    automaton_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for title in titles:
+        any(not old_should_filter_title(title, company) for company in companies)
+    naive_ms = (time.perf_counter() - start) * 1000
+
+    offline()
+    with serving(AgoraRNService, pages=2):
+        everything = quietly(scrape_agorarn, CUTOFF_DATE)
+        filtered = quietly(scrape_agorarn, CUTOFF_DATE, filter_text=parse_filter("balanço OR ata NOT errata"))
+    expected = [pub for pub in everything if parse_filter("balanço OR ata NOT errata").matches(pub["title"])]
+    check(filtered == expected and 0 < len(filtered) < len(everything), "coleta com expressão aplica o filtro compilado")
+
+    print(f"\n{len(companies)} termos em {len(titles)} títulos: autômato {automaton_ms:.1f} ms, "
+          f"termo a termo {naive_ms:.1f} ms")
+    print("Filtro de títulos validado.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from scraper import tracing
+from scraper.sites.diariodocomercio.diariodocomercio_integration import scrape_diariodocomercio
+from scraper.sites.diariodocomercio.diariodocomercio_service import DiarioDoComercioService
+from tests._support import check, offline, quietly, serving
+
+CUTOFF_DATE = datetime(2025, 10, 31)
+LATENCY = 0.02
+
+def synthetic_tracer():
+    """Trace com tempos conhecidos: dois fetches sobrepostos, um parse, uma pausa e um edital em volta de tudo."""
+    tracer = tracing.Tracer()
+    for name, category, start, end in [
+        ("fetch", tracing.NETWORK, 0.0, 1.0),
+        ("fetch", tracing.NETWORK, 0.5, 1.5),
+        ("parse", tracing.CPU, 2.0, 2.5),
+        ("sleep", tracing.SLEEP, 3.0, 4.0),
+        ("detail", tracing.CRAWL, 0.0, 5.0),
+    ]:
+        tracer.record(name, category, tracer.origin + start, tracer.origin + end, {})
+    tracer.duration = 6.0
+    return tracer
+
+def main():
+    """Valida o trace: resumo por categoria (soma e união dos spans), spans de uma coleta real e pausas canceláveis."""
+    offline()
+    summary = synthetic_tracer().summary()
+    categories = summary["categories"]
+    check(categories[tracing.NETWORK] == {"spans": 2, "seconds": 2.0, "wall_seconds": 1.5},
+          "rede: `seconds` soma os spans, `wall_seconds` conta a sobreposição uma vez só")
+    check(categories[tracing.CPU]["wall_seconds"] == 0.5 and categories[tracing.SLEEP]["wall_seconds"] == 1.0,
+          "cpu e pausas")
+    check(tracing.CRAWL not in categories and summary["wall_seconds"] == 6.0 and summary["other_seconds"] == 3.0,
+          "spans de agrupamento fora do resumo; `outros` = parede menos o tempo coberto")
+    check("1.5" in synthetic_tracer().format_summary().splitlines()[1], "resumo formatado usa o tempo de parede")
+
+    with tracing.span("fetch", tracing.NETWORK) as attrs:
+        attrs["status"] = 200
+    check(tracing.stop_trace() is None, "fora de um trace, span() não registra nada")
+
+    tracer = tracing.start_trace()
+    with serving(DiarioDoComercioService, pages=2, latency=LATENCY) as server:
+        pages = []
+        quietly(scrape_diariodocomercio, CUTOFF_DATE, on_page=pages.append)
+        requests_made = server.requests
+    cancel = threading.Event()
+    threading.Timer(0.05, cancel.set).start()
+    started = time.perf_counter()
+    interrupted = tracing.sleep(5, "teste", cancel)
+    check(interrupted and time.perf_counter() - started < 1, "pausa termina quando `cancel` é disparado")
+    check(tracing.stop_trace() is tracer and tracer.duration is not None, "stop_trace fecha o trace ativo")
+
+    by_name = {}
+    for span in tracer.spans:
+        by_name.setdefault(span["name"], []).append(span)
+    check(len(by_name["fetch"]) == requests_made and all("status" in span["attrs"] for span in by_name["fetch"]),
+          f"um span de rede por requisição, com o status ({requests_made})")
+    detail_fetches = [span["attrs"]["url"] for span in by_name["fetch"] if "/edital-completo/" in span["attrs"]["url"]]
+    check(sorted(span["attrs"]["url"] for span in by_name["detail"]) == sorted(detail_fetches) and detail_fetches,
+          f"um span de edital por página de detalhe baixada ({len(detail_fetches)})")
+    check(len(by_name["sleep"]) == 1 and by_name["sleep"][0]["attrs"]["reason"] == "teste", "pausa registrada")
+    check(len({span["thread"] for span in by_name["fetch"]}) > 1, "spans das threads do pool de editais")
+
+    summary = tracer.summary()
+    network = summary["categories"][tracing.NETWORK]
+    check(network["seconds"] > network["wall_seconds"] >= LATENCY * len(pages),
+          f"fetches em paralelo: soma ({network['seconds']}s) maior que o tempo de parede ({network['wall_seconds']}s)")
+    longest = max(data["wall_seconds"] for data in summary["categories"].values())
+    check(longest <= summary["wall_seconds"] and summary["other_seconds"] <= summary["wall_seconds"] - longest + 0.001,
+          "nenhuma categoria passa do tempo de parede, nem `outros` do tempo descoberto")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.json")
+        tracer.save(path)
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    starts = [span["start"] for span in saved["spans"]]
+    check(saved["summary"] == summary and starts == sorted(starts) and len(starts) == len(tracer.spans),
+          "trace salvo com o resumo e os spans em ordem de início")
+
+    print("Trace validado.")
+
+if __name__ == "__main__":
+    main()